@@ -2,27 +2,110 @@ import concurrent.futures
 import asyncio
 import functools
 import platform
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+
+from fons.math.hist import Histogram
 
 _IS_PY_10 = platform.python_version_tuple() >= ("3", "10", "0")
+# The types whose instances are reported as the origin of a stall (see LoopMonitor)
+_ORIGIN_TYPES = ()
+# {loop: LoopMonitor}
+_MONITORS = weakref.WeakKeyDictionary()
+# The factory of the event loops created by fons (see set_loop_factory)
+_loop_factory = None
+
+
+class _FactoryPolicy(asyncio.DefaultEventLoopPolicy):
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+
+    def new_event_loop(self):
+        return self._factory()
+
+
+def set_loop_factory(factory=None):
+    """
+    Set the factory of the event loops created by fons (EliThread, LoopPool, ...).
+    The asyncio event loop policy is set accordingly, so that the loops created
+    implicitly (get_event_loop() in the main thread) are of the same kind.
+    Call it before any loop is created, as the current loop of the main thread
+    is forgotten.
+    :param factory:
+        ::None     - asyncio.new_event_loop (default policy)
+        ::"uvloop" - uvloop.new_event_loop (ImportError if uvloop isn't installed)
+        ::"auto"   - uvloop if installed, otherwise None
+        ::callable - returns a new event loop
+    :returns: the factory
+    """
+    global _loop_factory
+    policy = None
+    if factory == "auto":
+        try:
+            import uvloop
+        except ImportError:
+            factory = None
+        else:
+            factory = "uvloop"
+    if factory == "uvloop":
+        import uvloop
+
+        factory = uvloop.new_event_loop
+        policy = uvloop.EventLoopPolicy()
+    elif factory is not None:
+        if not callable(factory):
+            raise TypeError("`factory` must be callable; got: {}".format(factory))
+        policy = _FactoryPolicy(factory)
+
+    _loop_factory = factory
+    asyncio.set_event_loop_policy(policy)
+    return factory
+
+
+def new_event_loop():
+    """A new event loop, created by the loop factory (see set_loop_factory)"""
+    if _loop_factory is None:
+        return asyncio.new_event_loop()
+    return _loop_factory()
+
+
+def get_event_loop():
+    """The running loop or the current loop of the thread (see set_loop_factory)"""
+    return asyncio.get_event_loop()
 
 
 class FonsEvent(asyncio.Event):
     def __init__(self, *, loop=None):
         if _IS_PY_10:
             super().__init__()
-            self._loop = loop or asyncio.get_event_loop()
+            self._loop = loop or get_event_loop()
         else:
             super().__init__(loop=loop)
 
 
 class FonsQueue(asyncio.Queue):
+    # called with the queue after an item has been taken out of it
+    # (e.g. fons.event.set_overflow installs one to refill it / signal room)
+    on_get = None
+
     def __init__(self, maxsize=0, *, loop=None):
         if _IS_PY_10:
             super().__init__(maxsize)
-            self._loop = loop or asyncio.get_event_loop()
+            self._loop = loop or get_event_loop()
         else:
             super().__init__(maxsize, loop=loop)
 
+    def _get(self):
+        item = super()._get()
+        if self.on_get is not None:
+            self.on_get(self)
+        return item
+
 
 def _check_is_fons_queue(q):
     if not isinstance(q, FonsQueue):
@@ -35,7 +118,7 @@ def _check_is_fons_event(e):
 
 
 def lrc(future_or_coro):
-    return asyncio.get_event_loop().run_until_complete(future_or_coro)
+    return get_event_loop().run_until_complete(future_or_coro)
 
 
 def _set_cb_loop(future, cb_loop=None):
@@ -139,7 +222,7 @@ def call_via_loop(
         future = concurrent.futures.Future()
 
     if loop is None:
-        loop = asyncio.get_event_loop()
+        loop = get_event_loop()
 
     is_async = asyncio.iscoroutinefunction(func)
 
@@ -161,3 +244,398 @@ def call_via_loop_afut(
     return call_via_loop(
         func, args, kwargs, future=future, module="asyncio", loop=loop, cb_loop=cb_loop
     )
+
+
+# {func: is coroutine function}; weak, not to keep the funcs alive
+_IS_ASYNC = weakref.WeakKeyDictionary()
+_CANCELLED_ERRORS = (asyncio.CancelledError, concurrent.futures.CancelledError)
+
+
+def _is_async_cached(func):
+    # Bound methods are recreated on every attribute access, cache their function
+    func = getattr(func, "__func__", func)
+    try:
+        return _IS_ASYNC[func]
+    except KeyError:
+        is_async = asyncio.iscoroutinefunction(func)
+        _IS_ASYNC[func] = is_async
+        return is_async
+    except TypeError:
+        # not weak referenceable
+        return asyncio.iscoroutinefunction(func)
+
+
+def _set_future(future, result, exc):
+    if future.done():
+        return
+    if exc is None:
+        future.set_result(result)
+    elif isinstance(exc, _CANCELLED_ERRORS):
+        future.cancel()
+    else:
+        future.set_exception(exc)
+
+
+def _set_futures(futures, outcomes):
+    for future, (result, exc) in zip(futures, outcomes):
+        _set_future(future, result, exc)
+
+
+def _get_set_loop(future, cb_loop):
+    """The loop via which the result must be set (None if it can be set directly)"""
+    if cb_loop is None and isinstance(future, asyncio.Future):
+        cb_loop = future._loop
+        if not cb_loop.is_running():
+            cb_loop = None
+    if cb_loop is asyncio._get_running_loop():
+        cb_loop = None
+    return cb_loop
+
+
+def _resolve(future, cb_loop, result, exc):
+    cb_loop = _get_set_loop(future, cb_loop)
+    if cb_loop is None:
+        _set_future(future, result, exc)
+    else:
+        cb_loop.call_soon_threadsafe(_set_future, future, result, exc)
+
+
+def _resolve_many(futures, cb_loop, outcomes):
+    cb_loop = _get_set_loop(futures[0], cb_loop)
+    if cb_loop is None:
+        _set_futures(futures, outcomes)
+    else:
+        cb_loop.call_soon_threadsafe(_set_futures, futures, outcomes)
+
+
+def _run(future, cb_loop, func, args, kwargs):
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        _resolve(future, cb_loop, None, e)
+    except BaseException as e:
+        # CancelledError cancels the future; KeyboardInterrupt etc. are set
+        # to it, and also passed on
+        _resolve(future, cb_loop, None, e)
+        raise
+    else:
+        _resolve(future, cb_loop, result, None)
+
+
+async def _run_async(future, cb_loop, func, args, kwargs):
+    try:
+        result = await func(*args, **kwargs)
+    except Exception as e:
+        _resolve(future, cb_loop, None, e)
+    except BaseException as e:
+        _resolve(future, cb_loop, None, e)
+        raise
+    else:
+        _resolve(future, cb_loop, result, None)
+
+
+def call_via_loop_fast(
+    func,
+    args=(),
+    kwargs=None,
+    *,
+    future=None,
+    module="concurrent.futures",
+    loop=None,
+    cb_loop=None,
+    forget=False
+):
+    """
+    Like `call_via_loop`, but with less overhead per call: the coroutine function
+    check is cached, the func isn't wrapped, the call is scheduled with a single
+    callback (call_soon if `loop` is the running loop) and the result is set
+    directly if the future belongs to the loop that executed the func.
+    :param forget: don't create a future (returns None); the exceptions of func
+                   are passed to the loop's exception handler
+    """
+    if loop is None:
+        loop = get_event_loop()
+    if kwargs is None:
+        kwargs = {}
+    if loop is asyncio._get_running_loop():
+        call_soon = loop.call_soon
+    else:
+        call_soon = loop.call_soon_threadsafe
+    is_async = _is_async_cached(func)
+
+    if forget:
+        if is_async:
+            call_soon(loop.create_task, func(*args, **kwargs))
+        elif kwargs:
+            call_soon(functools.partial(func, *args, **kwargs))
+        else:
+            call_soon(func, *args)
+        return None
+
+    if future is not None:
+        pass
+    elif module == "asyncio":
+        future = asyncio.Future(loop=cb_loop)
+    elif module == "concurrent.futures":
+        future = concurrent.futures.Future()
+    else:
+        raise ValueError(module)
+
+    if is_async:
+        call_soon(loop.create_task, _run_async(future, cb_loop, func, args, kwargs))
+    else:
+        call_soon(_run, future, cb_loop, func, args, kwargs)
+
+    return future
+
+
+def call_via_loop_fast_afut(
+    func, args=(), kwargs=None, *, future=None, loop=None, cb_loop=None, forget=False
+):
+    return call_via_loop_fast(
+        func,
+        args,
+        kwargs,
+        future=future,
+        module="asyncio",
+        loop=loop,
+        cb_loop=cb_loop,
+        forget=forget,
+    )
+
+
+def _aggregate(outcomes):
+    for result, exc in outcomes:
+        if exc is not None:
+            return [(None, exc)]
+    return [([result for result, _ in outcomes], None)]
+
+
+def _call_many(items, futures, cb_loop, aggregate):
+    outcomes = []
+    for func, args, kwargs, _ in items:
+        try:
+            outcomes.append((func(*args, **kwargs), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    _resolve_many(futures, cb_loop, _aggregate(outcomes) if aggregate else outcomes)
+
+
+async def _call_many_async(items, futures, cb_loop, aggregate):
+    outcomes = []
+    try:
+        for func, args, kwargs, is_async in items:
+            try:
+                result = func(*args, **kwargs)
+                if is_async:
+                    result = await result
+                outcomes.append((result, None))
+            except Exception as e:
+                outcomes.append((None, e))
+    except BaseException as e:
+        # e.g. cancelled; so are the calls that are left
+        outcomes += [(None, e)] * (len(items) - len(outcomes))
+        _resolve_many(
+            futures, cb_loop, _aggregate(outcomes) if aggregate else outcomes
+        )
+        raise
+    _resolve_many(futures, cb_loop, _aggregate(outcomes) if aggregate else outcomes)
+
+
+def call_many_via_loop(
+    funcs_args,
+    *,
+    module="concurrent.futures",
+    loop=None,
+    cb_loop=None,
+    aggregate=True
+):
+    """
+    Call many (async)functions via loop with a single call_soon_threadsafe.
+    The calls are made in order, an async func is awaited before the next call.
+    :param funcs_args: iterable of func, (func, args) or (func, args, kwargs)
+    :param aggregate: if True returns one future of the list of results (its
+                      exception is the first exception raised), otherwise
+                      a list of futures (one per call)
+    """
+    if module not in ("concurrent.futures", "asyncio"):
+        raise ValueError(module)
+    if loop is None:
+        loop = get_event_loop()
+
+    items = []
+    has_async = False
+    for x in funcs_args:
+        if callable(x):
+            func, args, kwargs = x, (), None
+        else:
+            func, args, kwargs = (tuple(x) + (None, None))[:3]
+        is_async = _is_async_cached(func)
+        has_async |= is_async
+        items.append((func, args or (), kwargs or {}, is_async))
+
+    if module == "asyncio":
+        new_future = functools.partial(asyncio.Future, loop=cb_loop)
+    else:
+        new_future = concurrent.futures.Future
+    futures = [new_future() for _ in range(1 if aggregate else len(items))]
+
+    if not items:
+        if aggregate:
+            futures[0].set_result([])
+            return futures[0]
+        return futures
+
+    if loop is asyncio._get_running_loop():
+        call_soon = loop.call_soon
+    else:
+        call_soon = loop.call_soon_threadsafe
+    if has_async:
+        coro = _call_many_async(items, futures, cb_loop, aggregate)
+        call_soon(loop.create_task, coro)
+    else:
+        call_soon(_call_many, items, futures, cb_loop, aggregate)
+
+    return futures[0] if aggregate else futures
+
+
+def add_origin_type(*types):
+    """Report the instances of `types` as the origin of loop stalls (LoopMonitor)"""
+    global _ORIGIN_TYPES
+    _ORIGIN_TYPES += tuple(x for x in types if x not in _ORIGIN_TYPES)
+
+
+def get_monitor(loop=None):
+    """The LoopMonitor of the loop, or None"""
+    if loop is None:
+        loop = get_event_loop()
+    return _MONITORS.get(loop)
+
+
+class LoopMonitor:
+    """
+    Opt-in monitor of an event loop that is run forever (e.g. by an EliThread).
+    A heartbeat scheduled every `interval` seconds records the loop lag (how late
+    it was called) to .lag histogram. A watchdog thread samples the stack of the
+    loop's thread whenever the heartbeat is late by more than `threshold`, i.e.
+    a callback or coroutine step has been blocking the loop, and appends the
+    stall to .offenders (the last `maxlen`):
+        {"time": time.time() of detection,
+         "duration": how long the loop was blocked (updated when it is released),
+         "origin": repr of the innermost Node / NodeHandler / ticker on the stack,
+         "stack": ["file:line in func", ...] (innermost last)}
+        monitor = LoopMonitor(loop).start()
+        monitor.get_stats()
+    """
+
+    def __init__(self, loop=None, *, interval=0.05, threshold=0.1, maxlen=100):
+        if loop is None:
+            loop = get_event_loop()
+        self.loop = loop
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = Histogram()
+        self.offenders = deque(maxlen=maxlen)
+        self.stalls = 0
+        self._handle = None
+        self._thread_id = None
+        # loop.time() at which the heartbeat is due (None until the first beat)
+        self._expected = None
+        # the offender of the ongoing stall
+        self._stall = None
+        self._stopped = threading.Event()
+        self._watchdog = None
+
+    def start(self):
+        if self._watchdog is not None:
+            return self
+        other = _MONITORS.get(self.loop)
+        if other is not None and other is not self:
+            raise ValueError("Loop {} is already monitored".format(self.loop))
+        _MONITORS[self.loop] = self
+        self._stopped.clear()
+        self.loop.call_soon_threadsafe(self._beat)
+        self._watchdog = threading.Thread(
+            target=self._watch, name="LoopMonitor-{}".format(id(self.loop)), daemon=True
+        )
+        self._watchdog.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if _MONITORS.get(self.loop) is self:
+            del _MONITORS[self.loop]
+        handle = self._handle
+        if handle is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(handle.cancel)
+        watchdog = self._watchdog
+        if watchdog is not None and watchdog is not threading.current_thread():
+            watchdog.join()
+        self._watchdog = None
+        self._expected = None
+
+    def _beat(self):
+        if self._stopped.is_set():
+            return
+        now = self.loop.time()
+        expected = self._expected
+        if expected is None:
+            self._thread_id = threading.get_ident()
+        else:
+            lag = max(now - expected, 0.0)
+            self.lag.record(lag)
+            stall = self._stall
+            if stall is not None:
+                stall["duration"] = lag
+                self._stall = None
+        self._expected = now + self.interval
+        self._handle = self.loop.call_later(self.interval, self._beat)
+
+    def _watch(self):
+        check = min(self.interval, self.threshold) / 2
+        while not self._stopped.wait(check):
+            if not self.loop.is_running():
+                if self.loop.is_closed():
+                    break
+                # Not a stall; re-baseline when the loop is run again
+                self._expected = None
+                continue
+            expected = self._expected
+            if expected is None or self._stall is not None:
+                continue
+            late = self.loop.time() - expected
+            if late > self.threshold and self._expected == expected:
+                self._record_stall(late)
+
+    def _record_stall(self, late):
+        frame = sys._current_frames().get(self._thread_id)
+        stack = traceback.extract_stack(frame, limit=20) if frame is not None else []
+        origin = None
+        while frame is not None:
+            obj = frame.f_locals.get("self")
+            if _ORIGIN_TYPES and isinstance(obj, _ORIGIN_TYPES):
+                origin = repr(obj)
+                break
+            frame = frame.f_back
+        self._stall = offender = {
+            "time": time.time(),
+            "duration": late,
+            "origin": origin,
+            "stack": [
+                "{}:{} in {}".format(x.filename, x.lineno, x.name) for x in stack
+            ],
+        }
+        self.offenders.append(offender)
+        self.stalls += 1
+
+    def get_stats(self, percentiles=(50, 90, 99, 99.9)):
+        return {
+            "lag": self.lag.summary(percentiles),
+            "stalls": self.stalls,
+            "offenders": list(self.offenders),
+        }
+
+    def reset(self):
+        self.lag.reset()
+        self.offenders.clear()
+        self.stalls = 0
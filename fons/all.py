@@ -34,24 +34,46 @@ from fons.debug import (
 
 import fons.aio as aio
 import fons.event as event
+import fons.eventlog as eventlog
 import fons.host as host
 import fons.processes as processes
 import fons.reg as reg
 import fons.sched as sched
 import fons.threads as threads
-from fons.aio import call_via_loop, call_via_loop_afut, wrap_with_future, lrc
+from fons.aio import (
+    call_via_loop,
+    call_via_loop_afut,
+    call_via_loop_fast,
+    call_via_loop_fast_afut,
+    call_many_via_loop,
+    get_monitor,
+    LoopMonitor,
+    set_loop_factory,
+    wrap_with_future,
+    lrc,
+)
 from fons.event import (
     force_put,
+    set_overflow,
+    SpillBuffer,
     empty_queue,
     Station,
+    LoopBatcher,
     QueueTransmitter,
     EventTransmitter,
     Node,
     NodeHandler,
+    PipeLink,
+    RemoteNode,
     RelayInfo,
+    RelayBatch,
+    Trace,
+    get_graph,
     RelayPackage,
+    FrozenRelayPackage,
     NodeExit,
 )
+from fons.eventlog import EventLog
 from fons.host import Server
 from fons.processes import LogiProcess, TkLogiProcess, pool_processes
 from fons.reg import create_name
@@ -65,7 +87,7 @@ from fons.sched import (
     ScheduleTicker,
     Routine,
 )
-from fons.threads import EliThread, LoopingThread
+from fons.threads import EliThread, LoopingThread, LoopPool
 
 import fons.math as math
 import fons.math.graph as graph
@@ -8,7 +8,7 @@ td = datetime.timedelta
 import fons.log as _log
 import fons.math.series as du
 from fons.processes import LogiProcess
-from fons.reg import create_name
+from fons.reg import create_name, NameRegistry
 from fons.sched import Routine
 from fons.time import dt_round, freq_to_offset
 from fons.verify import init_data, verify_data
@@ -18,7 +18,8 @@ from . import merging
 
 logger, logger2, tlogger, tloggers, tlogger0 = _log.get_standard_5(__name__)
 
-_MERGER_NAMES = set()
+_MERGER_NAMES = NameRegistry()
+_EPOCH = dt(1970, 1, 1)
 
 
 class DType(Routine):
@@ -57,6 +58,7 @@ class DType(Routine):
         conns={},
         name=None,
         reduce=1,
+        checkpoint=None,
         TEST_MODE=False
     ):
         isdict = isinstance(id, dict)
@@ -93,7 +95,7 @@ class DType(Routine):
         if name is None and getattr(self, "_name", None) is None:
             name = "{}_{}".format(self.__class__.__name__, self.id_str)
 
-        super().__init__(tickmgr=tickmgr, name=name)
+        super().__init__(tickmgr=tickmgr, name=name, checkpoint=checkpoint)
 
         # if it is empty dataframe, then the default (empty) RangeIndex does not interfere with concatenating
         # (e.g. (empty) RangeIndex + DatetimeIndex -> DatetimeIndex)
@@ -122,6 +124,7 @@ class DType(Routine):
             "time_initiated": dt.utcnow(),
             "time_started": None,
             "time_loaded": None,
+            "time_restored": None,
             "ts_last": {"save": None, "update": None, "merge": {}},
             "up_to_date_until": None,
             "merger_relay_created": None,
@@ -196,6 +199,9 @@ class DType(Routine):
     async def start(self):
         logger.debug("Starting routine '{}'".format(self.name))
         self._ui["time_started"] = dt.utcnow()
+        state = self.load_checkpoint()
+        if state is not None and not self._ui["time_restored"]:
+            self.set_state(state)
         if not self._ui["time_loaded"] and isinstance(self._dnfo["load"], dict):
             self.load(**self._dnfo["load"])
         self._relay_start_merger()
@@ -211,9 +217,12 @@ class DType(Routine):
         if kw.get("TEST_MODE") is None:
             kw["TEST_MODE"] = self.TEST_MODE
         self.guts = store.read_data(self.id, self.descr, tp, **kw)
-        save_tp = DType.calc_save_tp(self)
-        if save_tp:
-            self._ui["ts_last"]["save"] = save_tp[-1]
+        # the checkpoint already tells up to which period it has been saved
+        restored = self._ui["time_restored"] and self._ui["ts_last"]["save"]
+        if not restored or self._ui["time_loaded"]:
+            save_tp = DType.calc_save_tp(self)
+            if save_tp:
+                self._ui["ts_last"]["save"] = save_tp[-1]
         self._ui["time_loaded"] = dt.utcnow()
         if extend:
             self.extend(tp)
@@ -295,6 +304,32 @@ class DType(Routine):
         self.conns["merge"].send({"method": "stop", "data": self.id_str})
         self._ui["merger_relay_closed"] = dt.utcnow()
 
+    def get_state(self):
+        state = super().get_state()
+        ts = lambda x: (x - _EPOCH).total_seconds() if x is not None else None
+        ts_last = self._ui["ts_last"]
+        state["ts_last"] = {
+            "save": ts(ts_last["save"]),
+            "update": ts(ts_last["update"]),
+            "merge": {f: ts(x) for f, x in ts_last["merge"].items()},
+        }
+        state["up_to_date_until"] = ts(self._ui["up_to_date_until"])
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        if "ts_last" not in state:
+            return
+        to_dt = lambda x: _EPOCH + td(seconds=x) if x is not None else None
+        ts_last = state["ts_last"]
+        self._ui["ts_last"] = {
+            "save": to_dt(ts_last["save"]),
+            "update": to_dt(ts_last["update"]),
+            "merge": {f: to_dt(x) for f, x in ts_last["merge"].items()},
+        }
+        self._ui["up_to_date_until"] = to_dt(state["up_to_date_until"])
+        self._ui["time_restored"] = dt.utcnow()
+
     def calc_save_tp(self):
         ofs = freq_to_offset(self.save_freq)
         ts_last = self._ui["ts_last"]["save"]
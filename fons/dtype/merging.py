@@ -8,7 +8,7 @@ import datetime
 dt = datetime.datetime
 td = datetime.timedelta
 
-from fons.aio import call_via_loop_afut
+from fons.aio import call_via_loop_afut, get_event_loop
 from fons.io import SafeFileLock, wait_filelock
 import fons.log as _log
 from fons.host import Server, ServerError
@@ -104,7 +104,7 @@ def create_merger_sched(merger, freqs):
 
 
 def handle_input(inp):
-    loop = asyncio.get_event_loop()
+    loop = get_event_loop()
     data = inp["data"]
     if inp["method"] == "create":
         id = data["id"]
@@ -178,7 +178,7 @@ def _save_expiry(fpath):
 
 def run(conn, fpath=None):  # sys.argv):
     global to_recycle
-    loop = asyncio.get_event_loop()
+    loop = get_event_loop()
 
     """try: fpath = argv[0]
     except IndexError: fpath = None"""
@@ -48,6 +48,14 @@ class WaitException(Exception):
     def get_time_remaining(self):
         return self.wait_time - (dt.utcnow() - self.time_initiated) / td(seconds=1)
 
+    def __reduce__(self):
+        # __init__ would rebuild the args (and thus the message) from scratch
+        return (
+            self.__class__.__new__,
+            (self.__class__,),
+            dict(self.__dict__, args=self.args),
+        )
+
     _level = 0
     wait_time = 0
     time_initiated = dt.utcfromtimestamp(0)
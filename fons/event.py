@@ -1,13 +1,29 @@
 import asyncio
+import io as _io
+import importlib
 import time
 import functools
+import itertools
+import multiprocessing
+import pickle
 import queue as _queue
-from collections import defaultdict, namedtuple, Counter
-from concurrent.futures import Future
+import struct
+import tempfile
+import threading
+import types
+from collections import defaultdict, deque, namedtuple, Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
 
 from fons.aio import (
+    add_origin_type,
     call_via_loop,
     call_via_loop_afut,
+    call_via_loop_fast,
+    call_via_loop_fast_afut,
+    get_event_loop,
+    new_event_loop,
     FonsEvent,
     FonsQueue,
     _check_is_fons_queue,
@@ -15,16 +31,20 @@ from fons.aio import (
 )
 from fons.func import get_arg_count
 import fons.log as _log
-from fons.reg import create_name
+from fons.math.hist import Histogram
+from fons.processes import LogiProcess
+from fons.reg import create_name, NameRegistry
 
 logger, logger2, tlogger, tloggers, tlogger0 = _log.get_standard_5(__name__)
 
 ROOT = "temporary"
-_STATION_NAMES = set()
-_TRANSMITTER_NAMES = set()
-_NODE_NAMES = set()
+TRACE = False
+_STATION_NAMES = NameRegistry()
+_TRANSMITTER_NAMES = NameRegistry()
+_NODE_NAMES = NameRegistry()
 _empty = object()
 _qeitem = namedtuple("qe", "queue event")
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block", "coalesce", "spill")
 _node_id = -1
 
 
@@ -33,9 +53,101 @@ def set_root(value):
     ROOT = value
 
 
+def set_trace(value):
+    """The default of Node(trace=None)"""
+    global TRACE
+    TRACE = value
+
+
+class LoopBatcher:
+    """Batches the deliveries to each (running) loop, waking the loop up with
+    one call_soon_threadsafe per batch instead of one per fire.
+    A batch is flushed once it reaches `max_items`, or `max_delay` seconds
+    after its first item (max_delay=0: on the next iteration of the loop).
+    The items of a loop are delivered in the order they were added."""
+
+    def __init__(self, max_items=1000, max_delay=0):
+        if max_items < 1:
+            raise ValueError("`max_items` must be >= 1; got: {}".format(max_items))
+        if max_delay < 0:
+            raise ValueError("`max_delay` must be >= 0; got: {}".format(max_delay))
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self._buffers = {}
+
+    def add(self, loop, func, arg):
+        """Call func(arg) in the loop"""
+        if loop is None:
+            return func(arg)
+        buf = self._buffers.get(loop)
+        if buf is None:
+            buf = self._buffers.setdefault(loop, _LoopBuffer())
+        # If loop is not running then thread safety doesn't matter
+        # (but the already buffered items must be delivered first)
+        if not buf.items and not loop.is_running():
+            return func(arg)
+        # deque.append is atomic, the worst a race can cause is a redundant flush
+        buf.items.append((func, arg))
+        if len(buf.items) >= self.max_items:
+            if not buf.urgent:
+                buf.urgent = True
+                loop.call_soon_threadsafe(self._flush, buf)
+        elif not buf.scheduled:
+            buf.scheduled = True
+            if self.max_delay:
+                loop.call_soon_threadsafe(
+                    loop.call_later, self.max_delay, self._flush, buf
+                )
+            else:
+                loop.call_soon_threadsafe(self._flush, buf)
+
+    def _flush(self, buf):
+        buf.scheduled = buf.urgent = False
+        items = buf.items
+        while items:
+            func, arg = items.popleft()
+            try:
+                func(arg)
+            except Exception as e:
+                logger.exception(e)
+
+
+class _LoopBuffer:
+    __slots__ = ("items", "scheduled", "urgent")
+
+    def __init__(self):
+        self.items = deque()
+        self.scheduled = False
+        self.urgent = False
+
+
+def _init_batcher(batch):
+    """:param batch: None, True, LoopBatcher or its kwargs"""
+    if batch is None or batch is False:
+        return None
+    elif batch is True:
+        return LoopBatcher()
+    elif isinstance(batch, dict):
+        return LoopBatcher(**batch)
+    elif isinstance(batch, LoopBatcher):
+        return batch
+    raise TypeError(
+        "`batch` must be of type bool, dict or LoopBatcher; got: {}".format(
+            type(batch)
+        )
+    )
+
+
 class Transmitter:
-    def __init__(self, name=None):
-        self._receptors = []
+    def __init__(self, name=None, batch=None):
+        """:param batch: deliver via LoopBatcher (True, its kwargs or instance)"""
+        # {id(receptor): receptor}
+        self._receptors = {}
+        # {loop: {id(receptor): receptor}} and {loop: pre-bound delivery callable},
+        # both updated (per loop) as receptors are added/removed
+        self._by_loop = {}
+        self._deliver = {}
+        self.batcher = _init_batcher(batch)
         # self._loops = Counter()
         self.name = create_name(name, self.__class__.__name__, _TRANSMITTER_NAMES)
 
@@ -43,90 +155,213 @@ class Transmitter:
     #    return [loop for loop, count in self._loops.items() if count]
 
     def __iadd__(self, receptor):
+        loop = self._get_loop(receptor)
         self.prepare(receptor)
-        self._receptors.append(receptor)
+        self._receptors[id(receptor)] = receptor
+        self._by_loop.setdefault(loop, {})[id(receptor)] = receptor
+        self._bind(loop)
         # loop = getattr(receptor,'_loop',None)
         # if isinstance(loop, asyncio.BaseEventLoop):
         #    self._loops[loop] += 1
         return self
 
     def __isub__(self, receptor):
-        self._receptors.remove(receptor)
+        if id(receptor) not in self._receptors:
+            raise ValueError("Receptor not found: {}".format(receptor))
+        del self._receptors[id(receptor)]
+        loop = self._get_loop(receptor)
+        del self._by_loop[loop][id(receptor)]
+        self._bind(loop)
         # loop = getattr(receptor,'_loop',None)
         # if isinstance(loop, asyncio.BaseEventLoop):
         #    self._loops[loop] -= 1
         return self
 
+    def _bind(self, loop):
+        """Bind the delivery callable of the loop to a snapshot of its receptors
+        (a delivery in progress in other thread is unaffected by the changes)"""
+        receptors = self._by_loop.get(loop)
+        if receptors:
+            self._deliver[loop] = functools.partial(
+                self._deliver_all, tuple(receptors.values())
+            )
+        else:
+            self._by_loop.pop(loop, None)
+            self._deliver.pop(loop, None)
+
+    @staticmethod
+    def _get_loop(receptor):
+        """The loop the receptor is delivered in (resolved once, when added)"""
+        if isinstance(receptor, (asyncio.Queue, asyncio.Event)):
+            if receptor._loop is None:
+                # (asyncio.Queue/Event of Python 3.10+ until first used)
+                raise TypeError(
+                    "{} is not bound to a loop; use FonsQueue/FonsEvent".format(
+                        receptor
+                    )
+                )
+            return receptor._loop
+        return None
+
+    def _deliver_all(self, receptors, *args):
+        raise NotImplementedError
+
     def prepare(self, receptor):
         pass
 
     def fire(self, *args, **kw):
         raise NotImplementedError
 
+    def _fire(self, loop_partials):
+        if self.batcher is None:
+            return self.fire_loop_partials(loop_partials)
+        for loop, partials in loop_partials.items():
+            self.batcher.add(loop, Transmitter._call_all, partials)
+
     @staticmethod
     def fire_loop_partials(loop_partials):
         for loop, partials in loop_partials.items():
             Transmitter._call_loop(loop, partials)
 
     @staticmethod
-    def _call_loop(loop, partials):
-        f = functools.partial(Transmitter._call_all, partials)
+    def _call_loop(loop, partials, call_all=None):
+        if call_all is None:
+            call_all = Transmitter._call_all
         if loop is None:
-            f()
+            call_all(partials)
         elif loop.is_running():
-            loop.call_soon_threadsafe(f)
+            loop.call_soon_threadsafe(call_all, partials)
         # If loop is not running then thread safety doesn't matter, right?
         # (or unless multiple threads are accessing the queue simultaneously?)
         else:
-            f()
+            call_all(partials)
 
     @staticmethod
     def _call_all(partials):
         for f in partials:
             f()
 
+    @staticmethod
+    def _call_pairs(pairs):
+        """:param pairs: [(deliver, arg), ...]"""
+        for deliver, arg in pairs:
+            deliver(arg)
+
+
+def _to_op(op):
+    if not isinstance(op, str):
+        op = "set" if bool(op) else "clear"
+    return op
+
 
 class EventTransmitter(Transmitter):
     """Contains events"""
 
     def fire(self, *, op="set", **kw):
         """set/clear all events"""
-        if not isinstance(op, str):
-            op = "set" if bool(op) else "clear"
-        loop_partials = defaultdict(list)
-
-        for event in self._receptors:
-            loop = event._loop if isinstance(event, asyncio.Event) else None
-            loop_partials[loop].append(getattr(event, op))
+        op = _to_op(op)
+        loop_partials = {
+            loop: [functools.partial(deliver, op)]
+            for loop, deliver in self._deliver.items()
+        }
 
         if kw.get("return_partials"):
             return loop_partials
 
-        self.fire_loop_partials(loop_partials)
+        self._fire(loop_partials)
+
+    def _deliver_all(self, events, op):
+        for event in events:
+            getattr(event, op)()
 
 
 class QueueTransmitter(Transmitter):
     """Contains queues"""
 
+    def __init__(self, name=None, batch=None):
+        super().__init__(name, batch)
+        # queues with overflow policy "block"
+        self._blocking = []
+
+    def __iadd__(self, receptor):
+        super().__iadd__(receptor)
+        if receptor.overflow == "block":
+            self._blocking.append(receptor)
+        return self
+
+    def __isub__(self, receptor):
+        super().__isub__(receptor)
+        if receptor in self._blocking:
+            self._blocking.remove(receptor)
+        return self
+
     def prepare(self, receptor):
+        if not hasattr(receptor, "overflow"):
+            set_overflow(receptor)
         receptor.messages_undelivered = 0
         receptor.messages_behind = 0
+        receptor.messages_coalesced = 0
+        receptor.messages_spilled = 0
+        receptor.max_depth = 0
+        receptor.blocked = 0.0
 
     def fire(self, item, *args, **kw):
         """put an item to all queues"""
-        loop_partials = defaultdict(list)
-        for queue in self._receptors:
-            loop = queue._loop if isinstance(queue, asyncio.Queue) else None
-            p = functools.partial(self._put_to_queue, queue, item)
-            loop_partials[loop].append(p)
+        if self._blocking:
+            self.wait_for_room()
+        loop_partials = {
+            loop: [functools.partial(deliver, item)]
+            for loop, deliver in self._deliver.items()
+        }
 
         if kw.get("return_partials"):
             return loop_partials
 
-        self.fire_loop_partials(loop_partials)
+        self._fire(loop_partials)
+
+    def wait_for_room(self):
+        """Block until the full queues of policy "block" have room (or time out).
+        Only the queues whose loop is running in another thread are waited for,
+        and only if the calling thread isn't running a loop (blocking would stall
+        it; then the new item is discarded as with "drop_newest")."""
+        if asyncio._get_running_loop() is not None:
+            return
+        for q in self._blocking:
+            loop = q._loop
+            if not loop.is_running() or not q.full():
+                continue
+            started = time.monotonic()
+            with q.room:
+                q.room.wait_for(lambda: not q.full(), q.overflow_timeout)
+            q.blocked += time.monotonic() - started
+
+    def _deliver_all(self, queues, item):
+        for q in queues:
+            self._put_to_queue(q, item)
 
     def _put_to_queue(self, q, r):
-        nr_forced = force_put(q, r)
+        policy = q.overflow
+        nr_forced = 0
+        if policy == "drop_oldest":
+            nr_forced = force_put(q, r)
+        elif policy == "coalesce":
+            if _coalesce(q, r):
+                q.messages_coalesced += 1
+            else:
+                nr_forced = force_put(q, r)
+        elif policy == "spill" and (q.spill or q.full()):
+            if q.spill.append(r):
+                q.messages_spilled += 1
+                q._unfinished_tasks += 1
+                q._finished.clear()
+            else:
+                nr_forced = 1
+        else:
+            try:
+                q.put_nowait(r)
+            except (_queue.Full, asyncio.QueueFull):
+                nr_forced = 1
+
         if nr_forced:
             qname = getattr(q, "name", "")
             qnstr = " '{}'".format(qname) if qname else ""
@@ -137,8 +372,166 @@ class QueueTransmitter(Transmitter):
                     )
                 )
             q.messages_undelivered += nr_forced
-        else:
-            q.messages_behind += 1
+        q.messages_behind = depth = queue_depth(q)
+        if depth > q.max_depth:
+            q.max_depth = depth
+
+
+def set_overflow(
+    queue, policy="drop_oldest", *, timeout=1, key=None, spill_size=10000, dir=None
+):
+    """
+    Set the policy of what to do when the queue is full
+    (must be done before adding the queue to a QueueTransmitter/Station)
+    :param policy:
+        ::"drop_oldest" - discard the oldest item(s) of the queue
+        ::"drop_newest" - discard the new item
+        ::"block"       - producer waits up to `timeout` seconds (until the consumer
+                          makes room), then discards the new item. Only for
+                          producers in a thread that isn't running an event loop
+                          (others don't wait). Requires FonsQueue.
+        ::"coalesce"    - the new item replaces the queued item of equal `key(item)`,
+                          if there is none then as "drop_oldest"
+        ::"spill"       - the overflow goes to a SpillBuffer on disk (`spill_size`
+                          items in directory `dir`), and back into the queue as it
+                          is consumed. If that's full too, the new item is discarded.
+                          Requires FonsQueue.
+    """
+    if policy not in OVERFLOW_POLICIES:
+        raise ValueError(
+            "`policy` must be one of {}; got: {}".format(OVERFLOW_POLICIES, policy)
+        )
+    if policy == "coalesce" and not isinstance(queue, asyncio.Queue):
+        raise TypeError("Policy 'coalesce' requires asyncio.Queue")
+    if policy == "coalesce" and key is None:
+        raise ValueError("Policy 'coalesce' requires `key`")
+    if policy in ("block", "spill") and not isinstance(queue, FonsQueue):
+        raise TypeError("Policy '{}' requires FonsQueue".format(policy))
+
+    queue.overflow = policy
+    queue.overflow_timeout = timeout
+    queue.coalesce_key = key
+    if policy == "spill":
+        queue.spill = SpillBuffer(spill_size, dir)
+        queue.on_get = _refill_from_spill
+    elif policy == "block":
+        # the consumer notifies the waiting producers
+        queue.room = threading.Condition()
+        queue.on_get = _notify_room
+    elif isinstance(queue, FonsQueue):
+        queue.on_get = None
+
+
+def _refill_from_spill(queue):
+    if queue.spill:
+        queue._put(queue.spill.popleft())
+
+
+def _notify_room(queue):
+    with queue.room:
+        queue.room.notify_all()
+
+
+def _coalesce(queue, item):
+    """Replace the queued item of the same key, starting from the newest"""
+    key = queue.coalesce_key
+    k = key(item)
+    items = queue._queue
+    for i in range(len(items) - 1, -1, -1):
+        if key(items[i]) == k:
+            items[i] = item
+            return True
+    return False
+
+
+def queue_depth(queue):
+    """Nr of items waiting to be consumed (including the spilled ones)"""
+    try:
+        depth = queue.qsize()
+    except NotImplementedError:
+        return 0
+    spill = getattr(queue, "spill", None)
+    if spill:
+        depth += len(spill)
+    return depth
+
+
+def get_queue_stats(queue):
+    return {
+        "depth": queue_depth(queue),
+        "max_depth": queue.max_depth,
+        "undelivered": queue.messages_undelivered,
+        "coalesced": queue.messages_coalesced,
+        "spilled": queue.messages_spilled,
+        "blocked": queue.blocked,
+    }
+
+
+class SpillBuffer:
+    """Bounded FIFO of (pickled) items in a temporary file.
+    Nodes and handlers referenced by the items (e.g. RelayPackage.source)
+    are kept in memory."""
+
+    _header = struct.Struct("<I")
+
+    def __init__(self, maxsize=10000, dir=None):
+        self.maxsize = maxsize
+        self._file = tempfile.TemporaryFile(dir=dir)
+        self._read_pos = 0
+        self._len = 0
+        self._refs = {}
+
+    def __len__(self):
+        return self._len
+
+    def append(self, item):
+        """:returns: False if full"""
+        if self._len >= self.maxsize:
+            return False
+        buf = _io.BytesIO()
+        pickler = pickle.Pickler(buf, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self._persistent_id
+        pickler.dump(item)
+        data = buf.getvalue()
+        self._file.seek(0, 2)
+        self._file.write(self._header.pack(len(data)) + data)
+        self._len += 1
+        return True
+
+    def popleft(self):
+        if not self._len:
+            raise IndexError("pop from an empty SpillBuffer")
+        f = self._file
+        f.seek(self._read_pos)
+        (size,) = self._header.unpack(f.read(self._header.size))
+        unpickler = pickle.Unpickler(_io.BytesIO(f.read(size)))
+        unpickler.persistent_load = self._persistent_load
+        self._read_pos += self._header.size + size
+        self._len -= 1
+        if not self._len:
+            f.seek(0)
+            f.truncate()
+            self._read_pos = 0
+        return unpickler.load()
+
+    def _persistent_id(self, obj):
+        if isinstance(obj, (Node, NodeHandler)):
+            ref = self._refs.get(id(obj))
+            if ref is None:
+                ref = self._refs[id(obj)] = [obj, 0]
+            ref[1] += 1
+            return id(obj)
+        return None
+
+    def _persistent_load(self, pid):
+        ref = self._refs[pid]
+        ref[1] -= 1
+        if not ref[1]:
+            del self._refs[pid]
+        return ref[0]
+
+    def close(self):
+        self._file.close()
 
 
 class Station:
@@ -150,22 +543,49 @@ class Station:
         default_event_cls=FonsEvent,
         *,
         name=None,
-        loops=[]
+        loops=[],
+        batch=None
     ):
+        """:param batch:
+            deliver to the loops in batches (see LoopBatcher)
+            ::None/False - one call per loop per broadcast
+            ::True       - LoopBatcher()
+            ::dict       - LoopBatcher(**batch)
+            ::LoopBatcher
+        """
         self.storage = {}
+        # {id: {channel: set(loop_ids)}}
+        self._index = {}
         self.qtransmitters = {}
         self.etransmitters = {}
         self.channels = set()
         # maxsize 0 is infinite
         self.default_queue_size = default_queue_size
+        # asyncio queues/events must be bound to their loop
+        if issubclass(default_queue_cls, asyncio.Queue) and not issubclass(
+            default_queue_cls, FonsQueue
+        ):
+            raise TypeError("Expected FonsQueue, got: {}".format(default_queue_cls))
+        if issubclass(default_event_cls, asyncio.Event) and not issubclass(
+            default_event_cls, FonsEvent
+        ):
+            raise TypeError("Expected FonsEvent, got: {}".format(default_event_cls))
         self.default_queue_cls = default_queue_cls
         self.default_event_cls = default_event_cls
         self.channel_default_queue_sizes = {}
         self.name = create_name(name, self.__class__.__name__, _STATION_NAMES)
+        self.batcher = _init_batcher(batch)
         # default loop for adding new queue/event
         # if left to None, add will use .get_event_loop()
         self._current_loop_id = 0
         self.loops = {}
+        # {loop: id} (the first id that the loop was added under)
+        self._loop_ids = {}
+        # {channel: {loop: (queue delivery callable, event delivery callable)}}
+        self._routes = {}
+        # {channel: [sink, ...]}, and the sinks of all channels
+        self._sinks = {}
+        self._all_sinks = []
         if isinstance(loops, dict):
             for loop_id, loop in loops.items():
                 self.add_loop(loop, loop_id)
@@ -185,16 +605,21 @@ class Station:
         if channel in self.channels:
             raise ValueError("Channel {} already added".format(channel))
         self.channels.add(channel)
-        self.qtransmitters[channel] = QueueTransmitter(self.name + "[QT]")
-        self.etransmitters[channel] = EventTransmitter(self.name + "[ET]")
+        self.qtransmitters[channel] = QueueTransmitter(
+            self.name + "[QT]", self.batcher
+        )
+        self.etransmitters[channel] = EventTransmitter(
+            self.name + "[ET]", self.batcher
+        )
         self.storage[channel] = defaultdict(dict)
         self.channel_default_queue_sizes[channel] = default_queue_size
+        self._routes[channel] = {}
 
     def add_loop(self, loop=None, id=None):
         if id is None:
             id = self._current_loop_id
         if loop is None:
-            loop = asyncio.get_event_loop()
+            loop = get_event_loop()
 
         if id in self.loops:
             raise ValueError("Already taken id: {}".format(id))
@@ -202,12 +627,26 @@ class Station:
             raise ValueError('Already existing loop: {}'.format(loop))"""
 
         self.loops[id] = loop
+        self._loop_ids.setdefault(loop, id)
 
         if isinstance(id, int):
             self._current_loop_id = max(self._current_loop_id, id + 1)
         return id
 
-    def add(self, channel, id=None, queue=None, event=None, maxsize=None, loops=None):
+    def add(
+        self,
+        channel,
+        id=None,
+        queue=None,
+        event=None,
+        maxsize=None,
+        loops=None,
+        overflow=None,
+    ):
+        """:param overflow: policy name or {"policy": name, **options}
+                            (see set_overflow)"""
+        if isinstance(overflow, str):
+            overflow = {"policy": overflow}
         if maxsize is None:
             maxsize = self.channel_default_queue_sizes[channel]
         if maxsize is None:
@@ -246,7 +685,11 @@ class Station:
             if queue is False:
                 _queue = None
             elif queue is None:
-                kw = {"loop": loop} if self.default_queue_cls is FonsQueue else {}
+                kw = (
+                    {"loop": loop}
+                    if issubclass(self.default_queue_cls, FonsQueue)
+                    else {}
+                )
                 _queue = self.default_queue_cls(maxsize, **kw)
             elif isinstance(queue, asyncio.Queue) and queue._loop is not loop:
                 raise ValueError(
@@ -256,7 +699,11 @@ class Station:
             if event is False:
                 _event = None
             elif event is None:
-                kw = {"loop": loop} if self.default_event_cls is FonsEvent else {}
+                kw = (
+                    {"loop": loop}
+                    if issubclass(self.default_event_cls, FonsEvent)
+                    else {}
+                )
                 _event = self.default_event_cls(**kw)
             elif isinstance(event, asyncio.Event) and event._loop is not loop:
                 raise ValueError(
@@ -275,52 +722,159 @@ class Station:
 
             if _queue is not None:
                 _queue.id = id
+                if overflow is not None:
+                    set_overflow(_queue, **overflow)
                 self.qtransmitters[channel] += _queue
             if _event is not None:
                 _event.id = id
                 self.etransmitters[channel] += _event
 
             self.storage[channel][loop_id][id] = new
+            self._index.setdefault(id, {}).setdefault(channel, set()).add(loop_id)
             items[loop_id] = new
 
+        self._update_route(channel)
+
         return items
 
-    def add_queue(self, channel, id=None, queue=None, maxsize=None, loops=None):
-        items = self.add(channel, id, queue, False, maxsize, loops=loops)
+    def add_queue(
+        self, channel, id=None, queue=None, maxsize=None, loops=None, overflow=None
+    ):
+        items = self.add(channel, id, queue, False, maxsize, loops, overflow)
         return {loop_id: x.queue for loop_id, x in items.items()}
 
     def add_event(self, channel, id=None, event=None, loops=None):
         items = self.add(channel, id, False, event, loops=loops)
         return {loop_id: x.event for loop_id, x in items.items()}
 
+    def add_many(self, items):
+        """:param items: [{"channel": channel, <other .add params>}, ...]
+        :returns: [<.add output>, ...]"""
+        return [self.add(**kw) for kw in items]
+
     def remove(self, channel, id, loops=None):
         """Does NOT raise error on non-existent"""
-        loop_ids = self.get_loop_ids(loops)
+        self.remove_many([(channel, id, loops)])
+
+    def remove_many(self, items):
+        """Does NOT raise error on non-existent
+        :param items: [(channel, id), ...] or [(channel, id, loops), ...]"""
+        channels = set()
+        for item in items:
+            channel, id = item[:2]
+            loops = item[2] if len(item) > 2 else None
+            if self._remove(channel, id, loops):
+                channels.add(channel)
 
-        for loop_id in loop_ids:
-            try:
-                item = self.storage[loop_id].pop(id)
-            except KeyError:
-                continue
+        for channel in channels:
+            self._update_route(channel)
+
+    def _remove(self, channel, id, loops=None):
+        id_channels = self._index.get(id)
+        loop_ids = id_channels.get(channel) if id_channels else None
+        if not loop_ids:
+            return False
+        if loops is not None:
+            loop_ids = loop_ids.intersection(self.get_loop_ids(loops))
+
+        storage = self.storage[channel]
+        for loop_id in list(loop_ids):
+            item = storage[loop_id].pop(id)
             if item.queue is not None:
                 self.qtransmitters[channel] -= item.queue
             if item.event is not None:
                 self.etransmitters[channel] -= item.event
+            id_channels[channel].discard(loop_id)
+
+        if not id_channels[channel]:
+            del id_channels[channel]
+        if not id_channels:
+            del self._index[id]
+        return True
+
+    def get_channels(self, id):
+        """The channels (and loop ids) of receptor id: {channel: set(loop_ids)}"""
+        return {
+            channel: set(loop_ids)
+            for channel, loop_ids in self._index.get(id, {}).items()
+        }
+
+    def _update_route(self, channel):
+        qdeliver = self.qtransmitters[channel]._deliver
+        edeliver = self.etransmitters[channel]._deliver
+        self._routes[channel] = {
+            loop: (qdeliver.get(loop), edeliver.get(loop))
+            for loop in dict.fromkeys(list(qdeliver) + list(edeliver))
+        }
+
+    def _route(self, loop_pairs, channel, item=_empty, op=None):
+        """Collect the (deliver, arg) pairs of the channel's receptors by loop"""
+        if item is not _empty:
+            if self._sinks or self._all_sinks:
+                self._write_sinks(channel, item)
+            if self.qtransmitters[channel]._blocking:
+                self.qtransmitters[channel].wait_for_room()
+        for loop, (qdeliver, edeliver) in self._routes[channel].items():
+            pairs = loop_pairs.get(loop)
+            if pairs is None:
+                pairs = loop_pairs[loop] = []
+            if item is not _empty and qdeliver is not None:
+                pairs.append((qdeliver, item))
+            if op is not None and edeliver is not None:
+                pairs.append((edeliver, op))
+
+    def add_sink(self, sink, channels=None):
+        """
+        sink.write(channel, item) will be called with every item broadcast
+        to the channels (e.g. fons.eventlog.EventLog)
+        :param channels: None - all channels (also those added later)
+        """
+        if channels is None:
+            self._all_sinks.append(sink)
+            return
+        for channel in channels:
+            if channel not in self.channels:
+                raise ValueError("Channel <{}> hasn't been added yet".format(channel))
+            self._sinks.setdefault(channel, []).append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self._all_sinks:
+            self._all_sinks.remove(sink)
+        for channel, sinks in list(self._sinks.items()):
+            if sink in sinks:
+                sinks.remove(sink)
+            if not sinks:
+                del self._sinks[channel]
+
+    def _write_sinks(self, channel, item):
+        for sink in self._all_sinks:
+            sink.write(channel, item)
+        for sink in self._sinks.get(channel, ()):
+            sink.write(channel, item)
+
+    def _fire_routed(self, loop_pairs):
+        batcher = self.batcher
+        for loop, pairs in loop_pairs.items():
+            if not pairs:
+                continue
+            if batcher is None:
+                Transmitter._call_loop(loop, pairs, Transmitter._call_pairs)
+            else:
+                batcher.add(loop, Transmitter._call_pairs, pairs)
 
     def broadcast(self, channel, *put, op="set"):
         if len(put) > 1:
             raise ValueError(put)
-        if len(put):
-            item = put[0]
-            self.qtransmitters[channel].fire(item)
-        self.etransmitters[channel].fire(op=op)
+        loop_pairs = {}
+        self._route(loop_pairs, channel, *put, op=_to_op(op))
+        self._fire_routed(loop_pairs)
 
     def broadcast_multiple(self, instr):
         """Ensures that multiple channel instructions with a shared loop
          are fired strictly sequentially (no breaks between).
         :param instr: [{'_': channel, 'put': x, 'op': 'set'}, ...]
                       keywords "put" and "op" are optional"""
-        loop_partials = defaultdict(list)
+        loop_pairs = {}
 
         for d in instr:
             if "channel" in d:
@@ -330,29 +884,26 @@ class Station:
             else:
                 raise KeyError('Missing keyword "channel" or "_"; got: {}'.format(d))
 
-            qt_loop_partials = et_loop_partials = {}
+            item = d.get("put", _empty)
+            op = _to_op(d["op"]) if "op" in d else None
+            self._route(loop_pairs, channel, item, op)
 
-            if "put" in d:
-                item = d["put"]
-                qt_loop_partials = self.qtransmitters[channel].fire(
-                    item, return_partials=True
-                )
-
-            if "op" in d:
-                op = d["op"]
-                et_loop_partials = self.etransmitters[channel].fire(
-                    op=op, return_partials=True
-                )
+        self._fire_routed(loop_pairs)
 
-            for x_loop_partials in (qt_loop_partials, et_loop_partials):
-                for loop, partials in x_loop_partials.items():
-                    loop_partials[loop] += partials
+    def broadcast_items(self, items):
+        """Put items into the queues of their channels. Equivalent to
+         broadcast_multiple([{'_': channel, 'put': item}, ...]), without
+         the instruction dicts.
+        :param items: [(channel, item), ...]"""
+        loop_pairs = {}
+        for channel, item in items:
+            self._route(loop_pairs, channel, item)
 
-        Transmitter.fire_loop_partials(loop_partials)
+        self._fire_routed(loop_pairs)
 
     def get(self, channel, loop=None, ids=None):
         if loop is None:
-            loop = asyncio.get_event_loop()
+            loop = get_event_loop()
 
         loop_id = self.get_loop_ids([loop])[0]
         items = self.storage[channel][loop_id]
@@ -364,6 +915,38 @@ class Station:
         else:
             return items[ids]
 
+    def get_stats(self, channels=None):
+        """Queue statistics per channel, for finding the slow consumers.
+        :returns: {channel: {"depth": sum, "max_depth": max, ..., "slowest": key,
+                             "queues": {(loop_id, id): get_queue_stats(queue)}}}"""
+        if channels is None:
+            channels = self.channels
+        stats = {}
+        for channel in channels:
+            queues = {
+                (loop_id, id): get_queue_stats(item.queue)
+                for loop_id, items in self.storage[channel].items()
+                for id, item in items.items()
+                if item.queue is not None
+            }
+            total = {
+                "depth": 0,
+                "max_depth": 0,
+                "undelivered": 0,
+                "coalesced": 0,
+                "spilled": 0,
+                "blocked": 0.0,
+            }
+            for x in queues.values():
+                for k, v in x.items():
+                    total[k] = max(total[k], v) if k == "max_depth" else total[k] + v
+            total["slowest"] = max(
+                queues, key=lambda key: queues[key]["depth"], default=None
+            )
+            total["queues"] = queues
+            stats[channel] = total
+        return stats
+
     def get_queue(self, channel, id, loop=None):
         return self.get(channel, loop, id).queue
 
@@ -377,10 +960,10 @@ class Station:
 
         ids = []
         for x in items:
-            if isinstance(x, asyncio.BaseEventLoop):
+            if isinstance(x, asyncio.AbstractEventLoop):
                 try:
-                    id = next(id for id, loop in self.loops.items() if loop is x)
-                except StopIteration:
+                    id = self._loop_ids[x]
+                except KeyError:
                     if not add:
                         raise ValueError("Not existing loop: {}".format(x))
                     id = self.add_loop(x)
@@ -398,11 +981,11 @@ class Station:
 
         loops = []
         for x in items:
-            if not isinstance(x, asyncio.BaseEventLoop):
+            if not isinstance(x, asyncio.AbstractEventLoop):
                 if x not in self.loops:
                     raise ValueError(x)
                 loop = self.loops[x]
-            elif x in self.loops.values():
+            elif x in self._loop_ids:
                 loop = x
             else:
                 raise ValueError("Not existing loop: {}".format(x))
@@ -443,36 +1026,191 @@ class Event:
 
 
 class RelayPackage:
-    __slots__ = ("data", "source", "handler", "channel", "current_handler")
+    __slots__ = ("data", "source", "handler", "channel", "current_handler", "trace")
 
     def __init__(
-        self, data, source=None, handler=None, channel=None, current_handler=None
+        self,
+        data,
+        source=None,
+        handler=None,
+        channel=None,
+        current_handler=None,
+        trace=None,
     ):
         """
         :type source: Node
         :type handler: Handler
         :type current_handler: Handler
+        :type trace: Trace
         """
         self.data = data
         self.source = source
         self.handler = handler
         self.channel = channel
         self.current_handler = current_handler
+        self.trace = trace
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (
+                self.data,
+                self.source,
+                self.handler,
+                self.channel,
+                self.current_handler,
+                self.trace,
+            ),
+        )
 
     def copy(self, **kw):
-        return self.__class__(
-            **dict(
-                {
-                    "data": self.data,
-                    "source": self.source,
-                    "handler": self.handler,
-                    "channel": self.channel,
-                    "current_handler": self.current_handler,
-                },
-                **kw
+        """The copy is always mutable (also that of a FrozenRelayPackage)"""
+        if kw and not kw.keys() <= _RELAY_FIELDS:
+            raise TypeError(
+                "Unexpected keyword(s): {}".format(list(kw.keys() - _RELAY_FIELDS))
+            )
+        cls = self.__class__
+        if issubclass(cls, FrozenRelayPackage):
+            cls = RelayPackage
+        get = kw.get
+        return cls(
+            get("data", self.data),
+            get("source", self.source),
+            get("handler", self.handler),
+            get("channel", self.channel),
+            get("current_handler", self.current_handler),
+            get("trace", self.trace),
+        )
+
+    def freeze(self):
+        """Read-only version of the package (self if already read-only)"""
+        if isinstance(self, FrozenRelayPackage):
+            return self
+        return FrozenRelayPackage(
+            self.data,
+            self.source,
+            self.handler,
+            self.channel,
+            self.current_handler,
+            self.trace,
+        )
+
+
+class FrozenRelayPackage(RelayPackage):
+    """Read-only RelayPackage, shared between the handlers that opt in (shared=True)"""
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        data,
+        source=None,
+        handler=None,
+        channel=None,
+        current_handler=None,
+        trace=None,
+    ):
+        _set = object.__setattr__
+        _set(self, "data", data)
+        _set(self, "source", source)
+        _set(self, "handler", handler)
+        _set(self, "channel", channel)
+        _set(self, "current_handler", current_handler)
+        _set(self, "trace", trace)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is read-only".format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("{} is read-only".format(self.__class__.__name__))
+
+
+_RELAY_FIELDS = frozenset(RelayPackage.__slots__)
+
+# origin: perf_counter() of the first relay; sent: of the last relay
+# path: ((node id, handler id or None), ...) of the relays
+Trace = namedtuple("Trace", "origin sent path")
+
+
+def _stamp(parent, node, handler=None):
+    """:type parent: Trace"""
+    now = time.perf_counter()
+    hop = (node.id, handler.id if handler is not None else None)
+    if parent is None:
+        return Trace(now, now, (hop,))
+    return Trace(parent.origin, now, parent.path + (hop,))
+
+
+class RelayBatch:
+    """
+    Batch of records relayed as a single package. Handlers with
+    `batch_aware=True` receive the batch as is, others the records one by one.
+    :param data: numpy (structured) array, pd.DataFrame or list of records
+                 (the records of a DataFrame are dicts)
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        if isinstance(data, (list, tuple)):
+            data = list(data)
+        elif not isinstance(data, np.ndarray) and not _is_frame(data):
+            raise TypeError(
+                "`data` must be np.ndarray, pd.DataFrame or list; got: {}".format(
+                    type(data)
+                )
+            )
+        self.data = data
+
+    @classmethod
+    def from_records(cls, records, dtype=None):
+        """:param dtype: numpy (structured) dtype; if None, the batch will be a list"""
+        if dtype is None:
+            return cls(list(records))
+        return cls(
+            np.array(
+                [tuple(r.values()) if isinstance(r, dict) else r for r in records],
+                dtype=dtype,
             )
         )
 
+    @classmethod
+    def concat(cls, batches):
+        datas = [b.data for b in batches]
+        if datas and all(isinstance(x, np.ndarray) for x in datas):
+            return cls(np.concatenate(datas))
+        elif datas and all(_is_frame(x) for x in datas):
+            import pandas as pd
+
+            return cls(pd.concat(datas))
+        return cls(list(itertools.chain.from_iterable(b.records() for b in batches)))
+
+    def records(self):
+        if _is_frame(self.data):
+            return self.data.to_dict("records")
+        return self.data
+
+    def to_frame(self):
+        if _is_frame(self.data):
+            return self.data
+        import pandas as pd
+
+        return pd.DataFrame(self.records())
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def __repr__(self):
+        return "{}({} records)".format(self.__class__.__name__, len(self))
+
+
+def _is_frame(data):
+    # pandas is imported only if needed
+    return type(data).__name__ == "DataFrame" and hasattr(data, "to_dict")
+
 
 class RelayInfo:
     __slots__ = ("items",)
@@ -492,7 +1230,16 @@ class NodeExit:
 
 class Node:
     def __init__(
-        self, clients=[], handlers=[], groups=[], *, loop=None, root=None, name=None
+        self,
+        clients=[],
+        handlers=[],
+        groups=[],
+        *,
+        loop=None,
+        root=None,
+        name=None,
+        batch=None,
+        trace=None
     ):
         """
         Node ids are negative, as are the station channels reserved for them individually.
@@ -509,6 +1256,12 @@ class Node:
                            (including in `handlers` argument)
             ::"temp": == "temporary"
             ::False: root handler will not be added
+        :param batch: relay to the clients in batches (see Station and LoopBatcher)
+        :param trace:
+            stamp the relayed packages with Trace, and record the queue wait
+            ("wait": since the last relay, "total": since the origin) of received
+            packages and execution time of the handlers to .latency histograms
+            ::None: defaults to TRACE (False by default)
         To start serving:
             node.serve()
         """
@@ -525,7 +1278,10 @@ class Node:
         _node_id -= 1
 
         # Initiate with channel 0
-        self.station = Station([{"channel": 0}])
+        self.station = Station([{"channel": 0}], batch=batch)
+        if trace is None:
+            trace = TRACE
+        self.latency = {"wait": Histogram(), "total": Histogram()} if trace else None
         self._queue = FonsQueue(loop=loop)
         # self._user_queue = FonsQueue(maxlen=self.user_maxlen, loop=loop)
         self.loop = self._queue._loop
@@ -544,7 +1300,10 @@ class Node:
         self._root_handler_overriden = False
         # Root handler just forwards the received data to all connected nodes
         # it will be removed as soon as the first handler is added
-        self.root_handler = NodeHandler(self, lambda x: x.data, [0], id="root")
+        # (batches are forwarded as is)
+        self.root_handler = NodeHandler(
+            self, lambda x: x.data, [0], id="root", batch_aware=True
+        )
 
         if root:
             self.handlers.append(self.root_handler)
@@ -574,25 +1333,23 @@ class Node:
         self.clients_by_id[node.id] = node
         self.station.add_queue(node.id, id=0, queue=node._queue)
         self.station.add_queue(0, id=node.id, queue=node._queue)
+        self.client_channels[node.id] = set([node.id])
 
         for channel in channels:
             self.group(channel, node)
 
-        self.client_channels[node.id] = set([node.id])
-
     def disconnect(self, node):
         """Deletes all traces of the node. The channels in handlers' lists remain,
         but the channel itself just doesn't contain the node any more."""
         if not isinstance(node, Node):
             node = self.clients_by_id[node]
         del self.clients_by_id[node.id]
-        # station.remove doesn't raise error on non-existent
-        self.station.remove(node.id, id=0)
-        self.station.remove(0, id=node.id)
-        client_channels = self.client_channels[node.id]
-        for channel in client_channels:
-            self.station.remove(channel, id=node.id)
-        del self.client_channels[node.id]
+        # station.remove_many doesn't raise error on non-existent
+        client_channels = self.client_channels.pop(node.id)
+        self.station.remove_many(
+            [(node.id, 0), (0, node.id)]
+            + [(channel, node.id) for channel in client_channels]
+        )
 
     def group(self, channel, *nodes):
         """Registers the given nodes under the channel"""
@@ -614,17 +1371,21 @@ class Node:
         if isinstance(channel, int) and channel < 0:
             raise ValueError("Channel must be >= 0, got: {}".format(channel))
 
+        nodes = [x if isinstance(x, Node) else self.clients_by_id[x] for x in nodes]
+        self.station.remove_many([(channel, node.id) for node in nodes])
         for node in nodes:
-            if not isinstance(node, Node):
-                node = self.clients_by_id[node]
-            self.station.remove(channel, id=node.id)
             self.client_channels[node.id].remove(channel)
 
-    def add_handler(self, f, *recipients, id=None, loop=None, type=None):
+    def add_handler(
+        self, f, *recipients, id=None, loop=None, type=None, shared=False, **kw
+    ):
+        """:param kw: other NodeHandler params (max_in_flight, batch_aware, ...)"""
         if loop is None:
             loop = self.loop
         if not isinstance(f, NodeHandler):
-            handler = NodeHandler(self, f, id=id, loop=loop, type=type)
+            handler = NodeHandler(
+                self, f, id=id, loop=loop, type=type, shared=shared, **kw
+            )
         else:
             handler = f
             if handler.node != self:
@@ -663,19 +1424,36 @@ class Node:
         self.futures["serve"] = call_via_loop_afut(self._serve, loop=self.loop)
 
     async def _serve(self):
+        latency = self.latency
         try:
             while True:
                 inp = await self._queue.get()
                 if isinstance(inp, NodeExit):
                     break
+                if latency is not None:
+                    self._record_wait(inp)
                 self.handle(inp)
         finally:
             for handler in self.handlers:
                 handler.stop()
 
+    def _record_wait(self, inp):
+        trace = getattr(inp, "trace", None)
+        if trace is not None:
+            now = time.perf_counter()
+            self.latency["wait"].record(now - trace.sent)
+            self.latency["total"].record(now - trace.origin)
+
     def handle(self, inp):
+        # The handlers that opted in (shared=True) share one read-only package
+        frozen = None
         for handler in self.handlers:
-            handler.handle(inp)
+            if handler.shared and isinstance(inp, RelayPackage):
+                if frozen is None:
+                    frozen = inp.freeze()
+                handler.handle(frozen)
+            else:
+                handler.handle(inp)
 
     async def recv(self):
         """Receive directly, skipping the handlers"""
@@ -691,9 +1469,12 @@ class Node:
         """Relays directly, skipping the handlers"""
         if not channels:
             channels = [0]
-        pks = [RelayPackage(data, self, None, channel) for channel in channels]
-        self.station.broadcast_multiple(
-            [{"channel": pk.channel, "put": pk} for pk in pks]
+        trace = _stamp(None, self) if self.latency is not None else None
+        self.station.broadcast_items(
+            [
+                (channel, RelayPackage(data, self, None, channel, None, trace))
+                for channel in channels
+            ]
         )
 
     def put(self, x, ensure_is_packed=True):
@@ -705,7 +1486,9 @@ class Node:
         if ensure_is_packed and not isinstance(x, RelayPackage):
             x = RelayPackage(x, None, None, None)
 
-        return call_via_loop_afut(self._queue.put, (x,), loop=self._queue._loop)
+        return call_via_loop_fast_afut(
+            self._queue.put, (x,), loop=self._queue._loop
+        )
 
     def put_nowait(self, x, ensure_is_packed=True):
         """:rtype: Future"""
@@ -724,7 +1507,7 @@ class Node:
         return self.futures["serve"] is not None and not self.futures["serve"].done()
 
     def stop(self):
-        self.put(NodeExit())
+        self.put(NodeExit(), ensure_is_packed=False)
 
     def __repr__(self):
         return "{}(id={},name={})".format(self.__class__.__name__, self.id, self.name)
@@ -732,7 +1515,19 @@ class Node:
 
 class NodeHandler:
     def __init__(
-        self, node, target=None, recipients=[], *, loop=None, id=None, type=None
+        self,
+        node,
+        target=None,
+        recipients=[],
+        *,
+        loop=None,
+        id=None,
+        type=None,
+        shared=False,
+        max_in_flight=10,
+        ordered=True,
+        executor=None,
+        batch_aware=False
     ):
         """
         :type node: Node
@@ -753,8 +1548,24 @@ class NodeHandler:
                          - receives node input via `yield` keyword
                          - yields the output (which is then relayed by the handler)
                          - exhausts on NodeExit()
+            ::"coro"  - coroutine function that
+                         - is called with every node input* separately, up to
+                           `max_in_flight` calls running concurrently
+                         - returns output (which is then relayed by the handler,
+                           in the order of input if `ordered`, otherwise of completion)
+            ::"executor" - synchronous function (as with None), called in `executor`
+                           (None: loop's default) under the same rules as "coro".
+                           ProcessPoolExecutor receives packages with .data
+                           and .channel only.
             * node input: The data received by node, which is assumed to be wrapped with RelayPackage,
                           or will be (in .handle) if not already done so
+        :param shared:
+            if True, the handler receives a read-only package shared with the other
+            shared handlers of the node, instead of a copy with .current_handler
+            set to self
+        :param batch_aware:
+            if True, RelayBatch is received as is, otherwise each of its records
+            in a package of its own
         """
         self.node = node
         if loop is None:
@@ -764,9 +1575,30 @@ class NodeHandler:
         self.channels = []
 
         self.target = target
-        if type not in ("async", "gen", None):
+        self.shared = shared
+        self.batch_aware = batch_aware
+        if type not in ("async", "gen", "coro", "executor", None):
             raise ValueError(type)
+        if type == "coro" and not asyncio.iscoroutinefunction(target):
+            raise TypeError(
+                "Type 'coro' requires a coroutine function; got: {}".format(target)
+            )
+        if max_in_flight < 1:
+            raise ValueError(
+                "`max_in_flight` must be >= 1; got: {}".format(max_in_flight)
+            )
         self._type = type
+        self.max_in_flight = max_in_flight
+        self.ordered = ordered
+        self.executor = executor
+        # the calls in flight (in the order of input), of "coro" & "executor" types
+        self._pending = deque()
+        self._semaphore = None
+        # execution time histogram, if the node is traced
+        self.latency = {"exec": Histogram()} if node.latency is not None else None
+        # the trace of the package being handled, {future: (trace, started)}
+        self._parent_trace = None
+        self._traces = {}
         # if asyncio.iscoroutinefunction(target):
         #    self._type = 'async'
 
@@ -796,16 +1628,86 @@ class NodeHandler:
         elif self._type == "gen":
             self._gen = self.target(*args)
             self._gen.send(None)
+        elif self._type in ("coro", "executor"):
+            call_via_loop(self._dispatch, loop=self.loop)
         else:
             call_via_loop(self.target, args, loop=self.loop)
         self._started = True
 
+    async def _dispatch(self):
+        self._semaphore = semaphore = asyncio.Semaphore(self.max_in_flight)
+        while True:
+            x = await self._queue.get()
+            if isinstance(x, NodeExit):
+                break
+            await semaphore.acquire()
+            trace = x.trace
+            try:
+                if self._type == "coro":
+                    fut = asyncio.ensure_future(self.target(x))
+                else:
+                    if isinstance(self.executor, ProcessPoolExecutor):
+                        x = RelayPackage(x.data, None, None, x.channel)
+                    fut = self.loop.run_in_executor(self.executor, self.target, x)
+            except Exception as e:
+                semaphore.release()
+                logger.error("Handler {} of {} raised:".format(self.id, self.node))
+                logger.exception(e)
+                continue
+            if self.latency is not None:
+                self._traces[fut] = (trace, time.perf_counter())
+            self._pending.append(fut)
+            fut.add_done_callback(self._on_done)
+        if self._pending:
+            await asyncio.wait(list(self._pending))
+
+    def _on_done(self, fut):
+        if self.latency is not None:
+            started = self._traces[fut][1]
+            self.latency["exec"].record(time.perf_counter() - started)
+        pending = self._pending
+        if not self.ordered:
+            pending.remove(fut)
+            self._finish(fut)
+            return
+        while pending and pending[0].done():
+            self._finish(pending.popleft())
+
+    def _finish(self, fut):
+        # In ordered mode the slot is freed only when the output is relayed
+        self._semaphore.release()
+        trace = self._traces.pop(fut)[0] if self.latency is not None else None
+        if fut.cancelled():
+            return
+        e = fut.exception()
+        if e is not None:
+            logger.error("Handler {} of {} raised:".format(self.id, self.node))
+            logger.exception(e)
+            return
+        self._parent_trace = trace
+        try:
+            self.relay(fut.result())
+        finally:
+            self._parent_trace = None
+
     def handle(self, x):
         if not isinstance(x, RelayPackage):
             x = RelayPackage(x, None, None, None, self)
+        elif self.shared:
+            x = x.freeze()
         else:
             x = x.copy(current_handler=self)
 
+        if isinstance(x.data, RelayBatch) and not self.batch_aware:
+            for record in x.data:
+                self._handle(x.copy(data=record, current_handler=self))
+        else:
+            self._handle(x)
+
+    def _handle(self, x):
+        if self.latency is not None and self._type in (None, "gen"):
+            return self._handle_traced(x)
+
         if self._type is None:
             data = self.target(x)
             self.relay(data)
@@ -814,11 +1716,28 @@ class NodeHandler:
             self._start()
             data = self._gen.send(x)
             self.relay(data)
+        elif self._type in ("coro", "executor"):
+            self._start()
+            self.put_nowait(x)
         else:
             # Asynchronous
             self._start()
             self.put(x)
 
+    def _handle_traced(self, x):
+        self._parent_trace = x.trace
+        try:
+            started = time.perf_counter()
+            if self._type is None:
+                data = self.target(x)
+            else:
+                self._start()
+                data = self._gen.send(x)
+            self.latency["exec"].record(time.perf_counter() - started)
+            self.relay(data)
+        finally:
+            self._parent_trace = None
+
     async def recv(self):
         """This is only meant to be used in *asynchronous* target function of the handler"""
         return await self._queue.get()
@@ -832,25 +1751,31 @@ class NodeHandler:
             return self._relay_by_info(data)
 
         # Also include the source node (self) and the associated channel
-        pks = [
-            RelayPackage(data, self.node, self, channel) for channel in self.channels
-        ]
-        self.node.station.broadcast_multiple(
-            [{"channel": pk.channel, "put": pk} for pk in pks]
+        node = self.node
+        trace = self._stamp()
+        node.station.broadcast_items(
+            [
+                (channel, RelayPackage(data, node, self, channel, None, trace))
+                for channel in self.channels
+            ]
         )
 
     def _relay_by_info(self, info):
         """:type info: RelayInfo"""
-        pks = []
+        items = []
+        trace = self._stamp()
 
         for data, to_channels in info.items:
             for channel in to_channels:
-                pk = RelayPackage(data, self.node, self, channel)
-                pks.append(pk)
+                pk = RelayPackage(data, self.node, self, channel, None, trace)
+                items.append((channel, pk))
 
-        self.node.station.broadcast_multiple(
-            [{"channel": pk.channel, "put": pk} for pk in pks]
-        )
+        self.node.station.broadcast_items(items)
+
+    def _stamp(self):
+        if self.latency is None:
+            return None
+        return _stamp(self._parent_trace, self.node, self)
 
     def add_recipient(self, channel, create=False):
         """:param channel: channel or Node"""
@@ -888,7 +1813,9 @@ class NodeHandler:
         if ensure_is_packed and not isinstance(x, RelayPackage):
             x = RelayPackage(x, None, None, None)
 
-        return call_via_loop_afut(self._queue.put, (x,), loop=self._queue._loop)
+        return call_via_loop_fast_afut(
+            self._queue.put, (x,), loop=self._queue._loop
+        )
 
     def put_nowait(self, x, ensure_is_packed=True):
         """:rtype: Future"""
@@ -917,9 +1844,242 @@ class NodeHandler:
             except StopIteration:
                 pass
         else:
-            self.put(NodeExit())
+            self.put(NodeExit(), ensure_is_packed=False)
         self._started = False
 
+    def __repr__(self):
+        return "{}(id={},node={})".format(
+            self.__class__.__name__, self.id, self.node.name
+        )
+
+
+add_origin_type(Node, NodeHandler)
+
+
+def get_graph(*nodes, percentiles=(50, 90, 99, 99.9)):
+    """
+    Topology of the graph of nodes (and their clients, recursively),
+    with the latency percentiles (in seconds) of the traced nodes and handlers.
+    :returns: {node.name: {"id": node.id,
+                           "clients": [client.name, ...],
+                           "groups": {channel: [client.name, ...]},
+                           "latency": {"wait": summary, "total": summary} or None,
+                           "handlers": {handler.id: {"channels": [...],
+                                                     "latency": {"exec": summary}
+                                                                 or None}}}}
+    """
+
+    def summarize(latency):
+        if latency is None:
+            return None
+        return {k: h.summary(percentiles) for k, h in latency.items()}
+
+    graph = {}
+    todo = list(nodes)
+    while todo:
+        node = todo.pop()
+        if node.name in graph:
+            continue
+        groups = defaultdict(list)
+        for client_id, channels in node.client_channels.items():
+            for channel in channels:
+                if channel != client_id:
+                    groups[channel].append(node.clients_by_id[client_id].name)
+        graph[node.name] = {
+            "id": node.id,
+            "clients": [x.name for x in node.clients_by_id.values()],
+            "groups": dict(groups),
+            "latency": summarize(node.latency),
+            "handlers": {
+                h.id: {"channels": list(h.channels), "latency": summarize(h.latency)}
+                for h in node.handlers
+            },
+        }
+        todo.extend(node.clients_by_id.values())
+    return graph
+
+
+class PipeLink(Node):
+    """
+    Node that forwards all it receives to the other end of a multiprocessing
+    connection (in batches of up to `batch_size` packages), and relays all
+    that arrives from there to its clients (channel 0).
+    The packages are carried as (data, channel) tuples, serialized with
+    `serializer` (any object with .dumps and .loads; default: pickle).
+    Received packages have .source set to the link itself.
+    """
+
+    def __init__(
+        self,
+        conn,
+        *,
+        serializer=None,
+        batch_size=1000,
+        loop=None,
+        name=None,
+        batch=None
+    ):
+        super().__init__(loop=loop, root=False, name=name, batch=batch)
+        self.conn = conn
+        self.serializer = serializer if serializer is not None else pickle
+        self.batch_size = batch_size
+        self._reader = None
+
+    def add_handler(self, *args, **kw):
+        raise NotImplementedError("{} doesn't take handlers".format(self.name))
+
+    def serve(self):
+        if self._reader is None:
+            self._reader = threading.Thread(
+                target=self._read, name=self.name + "[Reader]", daemon=True
+            )
+            self._reader.start()
+        super().serve()
+
+    async def _serve(self):
+        queue = self._queue
+        dumps = self.serializer.dumps
+        exit = False
+        while not exit:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            packed = []
+            for pk in batch:
+                if isinstance(pk, NodeExit):
+                    exit = True
+                    break
+                packed.append((pk.data, pk.channel))
+            if packed:
+                self._send(dumps(packed))
+        # Signal the other end to stop
+        self._send(b"")
+
+    def _send(self, data):
+        try:
+            self.conn.send_bytes(data)
+        except (OSError, EOFError):
+            pass
+
+    def _read(self):
+        loads = self.serializer.loads
+        while True:
+            try:
+                raw = self.conn.recv_bytes()
+            except (OSError, EOFError):
+                break
+            if not raw:
+                break
+            self.station.broadcast_items(
+                [
+                    (0, RelayPackage(data, self, None, channel))
+                    for data, channel in loads(raw)
+                ]
+            )
+        if self.is_running():
+            self.loop.call_soon_threadsafe(self._queue.put_nowait, NodeExit())
+
+
+class RemoteNode(PipeLink):
+    """
+    Node running in another process (LogiProcess), linked via pipe.
+    Relaying to RemoteNode delivers the package to the remote node; what the
+    remote node relays to its clients (channel 0) is relayed by RemoteNode
+    to its own clients:
+        remote = RemoteNode(create_node)
+        node.connect(remote)
+        remote.connect(collector)
+    """
+
+    def __init__(
+        self,
+        factory,
+        *,
+        serializer=None,
+        batch_size=1000,
+        loop=None,
+        name=None,
+        batch=None,
+        start=True
+    ):
+        """
+        :param factory: picklable function that returns the Node, called in
+                        the new process (whose event loop is already set)
+        :param serializer: see PipeLink; as it is passed to the new process, it
+                           must be a module (e.g. pickle) or a picklable object
+        """
+        if isinstance(serializer, types.ModuleType):
+            # (modules can't be pickled, the new process imports it by name)
+            child_serializer = serializer.__name__
+        else:
+            child_serializer = serializer
+            try:
+                pickle.dumps(serializer)
+            except Exception as e:
+                raise TypeError(
+                    "`serializer` must be a module or picklable; got: {!r} ({})".format(
+                        serializer, e
+                    )
+                )
+        conn, child_conn = multiprocessing.Pipe()
+        super().__init__(
+            conn,
+            serializer=serializer,
+            batch_size=batch_size,
+            loop=loop,
+            name=name,
+            batch=batch,
+        )
+        self.process = _NodeProcess(
+            child_conn,
+            factory,
+            child_serializer,
+            batch_size,
+            name="{}[Process]".format(self.name),
+            daemon=True,
+        )
+        if start:
+            self.start()
+
+    def start(self):
+        if self.process.pid is None:
+            self.process.start()
+        self.serve()
+
+    def join(self, timeout=None):
+        self.process.join(timeout)
+
+
+def _run_node(conn, factory, serializer, batch_size):
+    if isinstance(serializer, str):
+        serializer = importlib.import_module(serializer)
+    loop = new_event_loop()
+    asyncio.set_event_loop(loop)
+    node = factory()
+    link = PipeLink(conn, serializer=serializer, batch_size=batch_size, loop=loop)
+    node.connect(link)
+    link.connect(node)
+    node.serve()
+    link.serve()
+    try:
+        loop.run_until_complete(link.futures["serve"])
+        node.stop()
+        loop.run_until_complete(node.futures["serve"])
+    finally:
+        loop.close()
+
+
+class _NodeProcess(LogiProcess):
+    def __init__(self, conn, factory, serializer, batch_size, **kw):
+        super().__init__(**kw)
+        self.conn = conn
+        self.factory = factory
+        self.serializer = serializer
+        self.batch_size = batch_size
+
+    def run(self):
+        _run_node(self.conn, self.factory, self.serializer, self.batch_size)
+
 
 def force_put(queue, item):
     nr_removed = 0
@@ -956,10 +2116,9 @@ def empty_queue(queue, return_items=False):
 
 def put_via_loop(queue, x):
     """Put something into queue"""
-    p = functools.partial(queue.put_nowait, x)
-    if asyncio.get_event_loop() is queue._loop:
+    if get_event_loop() is queue._loop:
         f = Future()
-        f.set_result(p())
+        f.set_result(queue.put_nowait(x))
         return f
     else:
-        return call_via_loop(p, loop=queue._loop)
+        return call_via_loop_fast(queue.put_nowait, (x,), loop=queue._loop)
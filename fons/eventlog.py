@@ -0,0 +1,254 @@
+import asyncio
+import bisect
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+
+from fons.event import RelayPackage
+import fons.log as _log
+
+logger, logger2, tlogger, tloggers, tlogger0 = _log.get_standard_5(__name__)
+
+# ts, channel length, data length
+_FRAME = struct.Struct("<dHI")
+# ts, offset
+_INDEX = struct.Struct("<dQ")
+_SEG_EXT = ".seg"
+_IDX_EXT = ".idx"
+
+
+class EventLog:
+    """
+    Append-only log of broadcast items, to be added to Station as a sink:
+        station.add_sink(EventLog(path), channels)
+    Items are written to segment files "<first ts in ns>.seg" in directory `path`
+    (a new segment is started when the current reaches `segment_size` bytes),
+    framed as <ts, len(channel), len(data)> + channel + data, where channel and
+    data (RelayPackage.data for packages) are serialized with `serializer`
+    (any object with .dumps and .loads; default: pickle).
+    Each segment has a sparse time index "<first ts in ns>.idx" of
+    <ts, offset> pairs, one per `index_interval` seconds.
+    Writes are buffered (up to `buffer_size` bytes); call .flush() / .close().
+    """
+
+    def __init__(
+        self,
+        path,
+        *,
+        segment_size=64 * 2 ** 20,
+        index_interval=1.0,
+        buffer_size=2 ** 20,
+        serializer=None
+    ):
+        self.path = path
+        self.segment_size = segment_size
+        self.index_interval = index_interval
+        self.buffer_size = buffer_size
+        self.serializer = serializer if serializer is not None else pickle
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # {channel: serialized channel}
+        self._channels = {}
+        self._file = None
+        self._segment = None
+        self._size = 0
+        self._buffer = bytearray()
+        # [(ts, offset), ...] of the current segment
+        self._index = []
+        self._last_indexed = None
+        self._last_ts = 0.0
+
+    def write(self, channel, item, ts=None):
+        """:param ts: default time.time(); if lower than the ts of the previous
+                   write, it is raised to that (the log is kept in order of time)"""
+        data = item.data if isinstance(item, RelayPackage) else item
+        ch = self._channels.get(channel)
+        if ch is None:
+            ch = self._channels[channel] = self.serializer.dumps(channel)
+        data = self.serializer.dumps(data)
+        frame_size = _FRAME.size + len(ch) + len(data)
+
+        with self._lock:
+            if ts is None:
+                ts = time.time()
+            if ts < self._last_ts:
+                ts = self._last_ts
+            self._last_ts = ts
+            if self._file is None or (
+                self._size and self._size + frame_size > self.segment_size
+            ):
+                self._roll(ts)
+            last = self._last_indexed
+            if last is None or ts - last >= self.index_interval:
+                self._index.append((ts, self._size))
+                self._last_indexed = ts
+            buffer = self._buffer
+            buffer += _FRAME.pack(ts, len(ch), len(data))
+            buffer += ch
+            buffer += data
+            self._size += frame_size
+            if len(buffer) >= self.buffer_size:
+                self._write_buffer()
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._write_buffer()
+                self._write_index()
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+    def _roll(self, ts):
+        self._close_segment()
+        ns = int(ts * 1e9)
+        while True:
+            segment = os.path.join(self.path, "{:020d}{}".format(ns, _SEG_EXT))
+            try:
+                self._file = open(segment, "xb")
+            except FileExistsError:
+                ns += 1
+            else:
+                break
+        self._segment = segment
+        self._size = 0
+        self._index = []
+        self._last_indexed = None
+
+    def _close_segment(self):
+        if self._file is None:
+            return
+        self._write_buffer()
+        self._write_index()
+        self._file.close()
+        self._file = None
+        self._segment = None
+
+    def _write_buffer(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer = bytearray()
+
+    def _write_index(self):
+        path = self._segment[: -len(_SEG_EXT)] + _IDX_EXT
+        with open(path, "wb") as f:
+            f.write(b"".join(_INDEX.pack(ts, offset) for ts, offset in self._index))
+
+    def segments(self):
+        """Paths of the segments, in order of time"""
+        names = sorted(x for x in os.listdir(self.path) if x.endswith(_SEG_EXT))
+        return [os.path.join(self.path, x) for x in names]
+
+    def read(self, start=None, end=None, channels=None):
+        """
+        Iterate over the logged items
+        :param start: ts (inclusive)
+        :param end: ts (inclusive)
+        :param channels: only the items of these channels
+        :returns: iterator of (ts, channel, data)
+        """
+        self.flush()
+        segments = self.segments()
+        firsts = [_segment_ts(x) for x in segments]
+        i = 0
+        if start is not None:
+            i = max(bisect.bisect_right(firsts, start) - 1, 0)
+        if channels is not None:
+            channels = {self.serializer.dumps(x): x for x in channels}
+
+        for segment, first in zip(segments[i:], firsts[i:]):
+            if end is not None and first > end:
+                break
+            yield from self._read_segment(segment, start, end, channels)
+
+    def _read_segment(self, segment, start, end, channels):
+        loads = self.serializer.loads
+        with open(segment, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = self._seek(segment, start)
+                while pos + _FRAME.size <= size:
+                    ts, ch_len, data_len = _FRAME.unpack_from(mm, pos)
+                    ch_start = pos + _FRAME.size
+                    data_start = ch_start + ch_len
+                    pos = data_start + data_len
+                    if pos > size:
+                        # Torn write
+                        break
+                    if start is not None and ts < start:
+                        continue
+                    if end is not None and ts > end:
+                        break
+                    ch = mm[ch_start:data_start]
+                    if channels is None:
+                        channel = loads(ch)
+                    elif ch in channels:
+                        channel = channels[ch]
+                    else:
+                        continue
+                    yield ts, channel, loads(mm[data_start:pos])
+
+    def _seek(self, segment, start):
+        """The offset of the last indexed frame of ts <= start"""
+        if start is None:
+            return 0
+        with self._lock:
+            # (a copy, as the current segment's index may be appended to)
+            index = list(self._index) if segment == self._segment else None
+        if index is None:
+            index = _load_index(segment)
+        i = bisect.bisect_right([ts for ts, _ in index], start) - 1
+        return index[i][1] if i >= 0 else 0
+
+    async def replay(self, node, start=None, end=None, *, speed=None, channels=None):
+        """
+        Put the logged items into the node (as RelayPackage(data, channel=channel))
+        :param speed: None - as fast as the node receives them, 1 - in real time,
+                      >1 - accelerated
+        :returns: number of items replayed
+        """
+        started = first = None
+        n = 0
+        for ts, channel, data in self.read(start, end, channels):
+            if speed:
+                if started is None:
+                    started, first = time.monotonic(), ts
+                delay = (ts - first) / speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif not n % 1000:
+                await asyncio.sleep(0)
+            await node._queue.put(RelayPackage(data, None, None, channel))
+            n += 1
+        return n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _segment_ts(segment):
+    return int(os.path.basename(segment)[: -len(_SEG_EXT)]) / 1e9
+
+
+def _load_index(segment):
+    path = segment[: -len(_SEG_EXT)] + _IDX_EXT
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    return [
+        _INDEX.unpack_from(data, i)
+        for i in range(0, len(data) - len(data) % _INDEX.size, _INDEX.size)
+    ]
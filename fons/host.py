@@ -2,13 +2,13 @@ import inspect
 
 from fons.errors import ServerError
 import fons.log as _log
-from fons.reg import create_name
+from fons.reg import create_name, NameRegistry
 from fons.threads import EliThread
 from fons.verify import verify_data
 
 logger, logger2, tlogger, tloggers, tlogger0 = _log.get_standard_5(__name__)
 
-_SERVER_NAMES = set()
+_SERVER_NAMES = NameRegistry()
 
 
 class Server(EliThread):
@@ -1,4 +1,5 @@
 import os
+import threading
 from collections import OrderedDict
 import json
 import functools
@@ -260,6 +261,22 @@ def save_params(path, D, *, read_path=None, mode="a", **kw):
         f.write(write_txt)
 
 
+def write_atomic(path, text, encoding="utf-8"):
+    """Writes to a temporary file first, then replaces `path` with it,
+    so that `path` is never left partially written"""
+    # unique per thread, as several threads may write the same path
+    tmp_path = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+    try:
+        with open(tmp_path, "w", encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 class SafeFileLock(filelock.FileLock):
     def __init__(self, filepath, timeout=-1, poll_interval=0.02, log=True):
         """NB! '.lock' will be added to filepath"""
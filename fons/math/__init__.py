@@ -1 +1 @@
-from . import round, graph, series
+from . import round, graph, series, hist
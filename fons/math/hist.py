@@ -0,0 +1,102 @@
+import math
+
+
+class Histogram:
+    """Streaming histogram of bounded memory (HDR-style, log-linear buckets).
+    Values between `lowest` and `highest` are recorded with `digits`
+    significant (decimal) digits of precision; values outside are clamped.
+    Only the non-empty buckets are stored."""
+
+    def __init__(self, lowest=1e-6, highest=60, digits=2):
+        if lowest <= 0 or highest <= lowest:
+            raise ValueError(
+                "Must be 0 < lowest < highest; got: {}, {}".format(lowest, highest)
+            )
+        if digits not in range(1, 6):
+            raise ValueError("`digits` must be in range 1..5; got: {}".format(digits))
+        self.lowest = lowest
+        self.highest = highest
+        self.digits = digits
+
+        self._sub_bits = math.ceil(math.log2(2 * 10 ** digits))
+        self._sub_count = 1 << self._sub_bits
+        self._half = self._sub_count // 2
+        self._max_unit = math.ceil(highest / lowest)
+        # {bucket_index: count}
+        self._counts = {}
+        self.reset()
+
+    def reset(self):
+        self._counts.clear()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, unit):
+        if unit < self._sub_count:
+            return unit
+        b = unit.bit_length() - self._sub_bits
+        return self._sub_count + (b - 1) * self._half + (unit >> b) - self._half
+
+    def _value(self, index):
+        """The midpoint of the bucket"""
+        if index < self._sub_count:
+            return index * self.lowest
+        b, m = divmod(index - self._sub_count, self._half)
+        b += 1
+        return (((m + self._half) << b) + (1 << b) / 2) * self.lowest
+
+    def record(self, value, count=1):
+        value = min(max(value, 0.0), self.highest)
+        unit = min(int(value / self.lowest), self._max_unit)
+        i = self._index(unit)
+        counts = self._counts
+        counts[i] = counts.get(i, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def percentile(self, q):
+        """:param q: 0...100"""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for i in sorted(self._counts):
+            seen += self._counts[i]
+            if seen >= target:
+                return min(max(self._value(i), self.min), self.max)
+        return self.max
+
+    def merge(self, other):
+        if (other.lowest, other.highest, other.digits) != (
+            self.lowest,
+            self.highest,
+            self.digits,
+        ):
+            raise ValueError("Histograms of different precision can't be merged")
+        counts = self._counts
+        for i, c in other._counts.items():
+            counts[i] = counts.get(i, 0) + c
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        d = {"count": self.count, "min": self.min, "max": self.max, "mean": self.mean}
+        for q in percentiles:
+            d["p{}".format(q)] = self.percentile(q)
+        return d
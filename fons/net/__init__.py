@@ -6,12 +6,14 @@ import aiohttp_socks
 import functools
 import requests
 
+from fons.aio import get_event_loop
+
 _sessions = {}
 
 
 def init_session(loop=None, *, proxy=None):
     if loop is None:
-        loop = asyncio.get_event_loop()
+        loop = get_event_loop()
     connector = None
     kw = {"loop": loop}
     if proxy:
@@ -25,7 +27,7 @@ def init_session(loop=None, *, proxy=None):
 
 def get_session(loop=None, *, proxy=None):
     if loop is None:
-        loop = asyncio.get_event_loop()
+        loop = get_event_loop()
     try:
         return _sessions[(loop, proxy)]
     except KeyError:
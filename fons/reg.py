@@ -1,4 +1,59 @@
-DEFAULT_REGISTRY = set()
+class NameRegistry(set):
+    """Set of names that remembers the next int to try for each default, so that
+    the search doesn't have to start from 1 again (forgotten as soon as any name
+    is removed, so that the freed names are reused)"""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        # {default: next int to try}
+        self._next = {}
+
+    def _removed(self):
+        self._next.clear()
+
+    def remove(self, name):
+        super().remove(name)
+        self._removed()
+
+    def discard(self, name):
+        super().discard(name)
+        self._removed()
+
+    def pop(self):
+        name = super().pop()
+        self._removed()
+        return name
+
+    def clear(self):
+        super().clear()
+        self._removed()
+
+    def difference_update(self, *others):
+        super().difference_update(*others)
+        self._removed()
+
+    def intersection_update(self, *others):
+        super().intersection_update(*others)
+        self._removed()
+
+    def symmetric_difference_update(self, other):
+        super().symmetric_difference_update(other)
+        self._removed()
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+
+DEFAULT_REGISTRY = NameRegistry()
 
 
 def create_name(name=None, default=None, registry=None, add_int="always"):
@@ -20,12 +75,16 @@ def create_name(name=None, default=None, registry=None, add_int="always"):
         new_name = default
 
     elif name is None:
-        i = 1
+        # (a plain set is searched from 1 every time)
+        next_int = getattr(registry, "_next", None)
+        i = next_int.get(default, 1) if next_int is not None else 1
         while True:
             new_name = "{}-{}".format(default, i) if default is not None else str(i)
             if new_name not in registry:
                 break
             i += 1
+        if next_int is not None:
+            next_int[default] = i + 1
 
     else:
         raise TypeError(type(name))
@@ -3,24 +3,42 @@ import multiprocessing
 import asyncio
 import functools
 from functools import wraps
+import heapq
 import inspect
+import itertools
+import json
+import os
+import threading
+import zlib
 
 from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
 import math
 import copy
 import platform
+import time as _time
 import warnings
 import datetime
 
 dt = datetime.datetime
 td = datetime.timedelta
 
-from fons.aio import FonsEvent, FonsQueue
+from fons.aio import (
+    FonsEvent,
+    FonsQueue,
+    add_origin_type,
+    call_via_loop,
+    get_event_loop,
+    new_event_loop,
+)
 from fons.debug import wrap_trylog
+from fons.host import Server
+from fons.io import write_atomic
+from fons.math.hist import Histogram
 import fons.log as _log
 from fons.processes import LogiProcess
-from fons.reg import create_name
+from fons.reg import create_name, NameRegistry
 from fons.threads import EliThread
 import fons.time as fontime
 from fons.errors import (
@@ -39,9 +57,32 @@ from fons.errors import (
 logger, logger2, tlogger, tloggers, tlogger0 = _log.get_standard_5(__name__)
 
 LOGGING_LEVEL = 10
+_EPOCH = dt(1970, 1, 1)
+# The tickers keep time by the monotonic clock, anchored to the wall time;
+# re-anchored when the two drift apart by more than _ANCHOR_TOLERANCE seconds
+# (system suspend, NTP step), so that the sync points follow the wall clock
+_MONOTONIC_ANCHOR = _time.time() - _time.monotonic()
+_ANCHOR_TOLERANCE = 0.5
 _PLATFORM = platform.system()
-_TICKER_NAMES = set()
-_ROUTINE_NAMES = set()
+_TICKER_NAMES = NameRegistry()
+_ROUTINE_NAMES = NameRegistry()
+
+# Synchronization primitives of BaseTicker (`backend` param)
+#   'thread' - threading.Event/Lock, no OS semaphores (default)
+#   'process' - multiprocessing.Event/Lock, only needed if the ticker is
+#               closed/updated from another process (e.g. after .start_process())
+#   'async' - FonsEvents of the ticker's loop + threading.Lock (AsyncBaseTicker)
+_SYNC_BACKENDS = {
+    "thread": {"event": threading.Event, "lock": threading.Lock},
+    "process": {"event": multiprocessing.Event, "lock": multiprocessing.Lock},
+    "async": {"event": None, "lock": threading.Lock},
+}
+
+# AsyncTicker(executor=...) pools; each AsyncTickManager creates its own ones,
+# these are shared by the AsyncTickers that are not added to any manager
+_EXECUTOR_TYPES = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+_DEFAULT_EXECUTORS = {}
+_DEFAULT_EXECUTORS_LOCK = threading.Lock()
 
 
 # Automatically assigns class attribute " _name" (= the name of class)
@@ -54,6 +95,66 @@ class _AddName(type):
         return super(_AddName, cls).__new__(cls, name, bases, newattrs)
 
 
+def _clock():
+    """Epoch seconds (UTC) by the anchored monotonic clock"""
+    global _MONOTONIC_ANCHOR
+    mono = _time.monotonic()
+    anchor = _time.time() - mono
+    if abs(anchor - _MONOTONIC_ANCHOR) > _ANCHOR_TOLERANCE:
+        _MONOTONIC_ANCHOR = anchor
+    return mono + _MONOTONIC_ANCHOR
+
+
+def _utcnow():
+    return dt.utcfromtimestamp(_clock())
+
+
+def _ts_to_dt(ts):
+    return dt.utcfromtimestamp(ts)
+
+
+def _dt_to_ts(d):
+    return (d - _EPOCH).total_seconds()
+
+
+def _sync_spec(sync):
+    """JSON serializable form of the `sync` param (to be compared on .set_state())"""
+    if isinstance(sync, dt):
+        return _dt_to_ts(sync)
+    elif isinstance(sync, td):
+        return sync.total_seconds()
+    elif isinstance(sync, fontime.offsets.DateOffset):
+        return sync.freqstr
+    return sync
+
+
+def _fixed_seconds(offset):
+    """Length of a fixed (non-calendar) offset in seconds, None if calendar offset"""
+    if isinstance(offset, td):
+        return offset.total_seconds()
+    elif isinstance(offset, fontime.offsets.Tick):
+        return offset.nanos / 1e9
+    return None
+
+
+def _copy_state(d):
+    """Copies the containers (dict/list/deque) of a class level state dict
+    (`_inf`, `_ui`, `_hidden`). The leaf values (None, numbers, datetimes,
+    offsets, functions) are immutable and thus shared with the class defaults,
+    which is a lot cheaper than deepcopying them."""
+    new = {}
+    for k, v in d.items():
+        cls = v.__class__
+        if cls is dict:
+            v = _copy_state(v)
+        elif cls is deque:
+            v = deque(v, v.maxlen)
+        elif cls is list:
+            v = list(v)
+        new[k] = v
+    return new
+
+
 def _to_td(value):
     if isinstance(value, td):
         return value
@@ -114,6 +215,16 @@ def _accepts_args(f):
     return len(c_args) > 0 or fas.varargs
 
 
+def _callback_payload(ticker, result):
+    return {
+        "result": result,
+        "ticker": ticker,
+        "ts": dt.utcnow(),
+        # entries missed before this tick (see ScheduleTicker `misfire`)
+        "missed": ticker._ui.get("missed", 0),
+    }
+
+
 def callback(f):
     @wraps(f)
     def wrapper(*args, **kw):
@@ -124,7 +235,7 @@ def callback(f):
 
         if callback is not None:
             if accepts_arg:
-                callback({"result": result, "ticker": self, "ts": dt.utcnow()})
+                callback(_callback_payload(self, result))
             else:
                 callback()
 
@@ -145,12 +256,12 @@ def async_callback(f):
             pass
         elif self._inf["callback"]["isCoro"]:
             if accepts_arg:
-                await callback({"result": result, "ticker": self, "ts": dt.utcnow()})
+                await callback(_callback_payload(self, result))
             else:
                 await callback()
         else:
             if accepts_arg:
-                callback({"result": result, "ticker": self, "ts": dt.utcnow()})
+                callback(_callback_payload(self, result))
             else:
                 callback()
 
@@ -159,14 +270,169 @@ def async_callback(f):
     return wrapper
 
 
+class TickerMetrics:
+    """Tick timing statistics of a ticker (or, if shared/merged, of a group of tickers):
+      lag - how late (seconds) the target was started, compared to its scheduled time
+      duration - execution time of the target (seconds)
+      overshoot - how much longer (seconds) a timed .sleep() took than requested
+      skipped - premature ticks that returned .return2() (errors='hide'/'warn')
+    :param sink: function, called with .summary() on .export()
+    :param export_every: if given (int), .export() is called every n ticks
+    :param hist: kwargs of fons.math.hist.Histogram
+    """
+
+    KINDS = ("lag", "duration", "overshoot")
+
+    def __init__(self, name=None, *, sink=None, export_every=None, hist={}):
+        self.name = name
+        self.sink = sink
+        self.export_every = export_every
+        self.hists = {k: Histogram(**hist) for k in self.KINDS}
+        self.ticks = 0
+        self.skipped = 0
+
+    def record(self, kind, value):
+        self.hists[kind].record(value)
+
+    def record_tick(self, lag, duration):
+        if lag is not None:
+            self.hists["lag"].record(lag)
+        self.hists["duration"].record(duration)
+        self.ticks += 1
+        if self.export_every and not self.ticks % self.export_every:
+            self.export()
+
+    def record_skip(self):
+        self.skipped += 1
+
+    def merge(self, other):
+        for k, h in self.hists.items():
+            if k in other.hists:
+                h.merge(other.hists[k])
+        self.ticks += other.ticks
+        self.skipped += other.skipped
+        return self
+
+    def reset(self):
+        for h in self.hists.values():
+            h.reset()
+        self.ticks = 0
+        self.skipped = 0
+
+    def summary(self):
+        d = {"name": self.name, "ticks": self.ticks, "skipped": self.skipped}
+        for k, h in self.hists.items():
+            d[k] = h.summary()
+        return d
+
+    def export(self, sink=None):
+        """Passes .summary() to `sink` (defaults to self.sink)"""
+        if sink is None:
+            sink = self.sink
+        if sink is None:
+            raise ValueError("{} has no sink".format(self.name))
+        sink(self.summary())
+
+
+class _LagMetrics(TickerMetrics):
+    """Only what ShardedTickManager.rebalance() needs: the EWMA of the tick lag
+    and the total duration of the ticks (no histograms)
+    :param alpha: weight of the latest lag"""
+
+    KINDS = ()
+
+    def __init__(self, name=None, alpha=0.2):
+        super().__init__(name)
+        self.alpha = alpha
+        self.reset()
+
+    def record(self, kind, value):
+        pass
+
+    def record_tick(self, lag, duration):
+        if lag is not None:
+            if self.lag is None:
+                self.lag = lag
+            else:
+                self.lag += self.alpha * (lag - self.lag)
+        self.busy += duration
+        self.ticks += 1
+
+    def reset(self):
+        super().reset()
+        self.lag = None
+        self.busy = 0.0
+
+    def summary(self):
+        d = super().summary()
+        d.update(lag=self.lag, busy=self.busy)
+        return d
+
+
+def _verify_executor(executor):
+    if executor is None or isinstance(executor, Executor):
+        pass
+    elif not isinstance(executor, str):
+        raise TypeError(type(executor))
+    elif executor not in _EXECUTOR_TYPES:
+        raise ValueError(
+            "`executor` must be one of {}, or an Executor; got: {}".format(
+                tuple(_EXECUTOR_TYPES), executor
+            )
+        )
+    return executor
+
+
+def _get_default_executor(executor):
+    if isinstance(executor, Executor):
+        return executor
+    with _DEFAULT_EXECUTORS_LOCK:
+        if executor not in _DEFAULT_EXECUTORS:
+            _DEFAULT_EXECUTORS[executor] = _EXECUTOR_TYPES[executor]()
+        return _DEFAULT_EXECUTORS[executor]
+
+
+def _init_metrics(metrics, name):
+    if metrics is None or metrics is False:
+        return None
+    elif metrics is True:
+        return TickerMetrics(name)
+    elif isinstance(metrics, dict):
+        return TickerMetrics(name, **metrics)
+    elif isinstance(metrics, TickerMetrics):
+        return metrics
+    raise TypeError(type(metrics))
+
+
 # ----------------------------------------------------------------------
 
 
 class BaseTicker(metaclass=abc.ABCMeta):
-    def __init__(self, *, callback=None, keepalive=None, name=None, logging_level=None):
-        self._inf = copy.deepcopy(self._inf)
-        self._ui = copy.deepcopy(self._ui)
-        self._hidden = copy.deepcopy(self._hidden)
+    def __init__(
+        self,
+        *,
+        callback=None,
+        keepalive=None,
+        name=None,
+        logging_level=None,
+        backend=None,
+        metrics=None
+    ):
+        """
+        :param backend: the synchronization primitives used by .sleep() and .close()
+                        ::'thread' - threading.Event/Lock (default)
+                        ::'process' - multiprocessing.Event/Lock (allocate OS semaphores;
+                                      only needed if it's closed from another process)
+                        ::'async' - FonsEvent (AsyncBaseTicker default)
+        :param metrics: records tick timing statistics, see TickerMetrics
+                        ::None/False - disabled (default)
+                        ::True - enabled
+                        ::dict - TickerMetrics kwargs
+                        ::TickerMetrics - (may be shared by several tickers)
+        """
+        self._inf = _copy_state(self._inf)
+        self._ui = _copy_state(self._ui)
+        self._hidden = _copy_state(self._hidden)
 
         self._inf["callback"]["target"] = callback
         self._supers = set()
@@ -183,20 +449,62 @@ class BaseTicker(metaclass=abc.ABCMeta):
         if self._inf["keepalive"]:
             self.loop = wrap_trylog(self.loop, **self._inf["keepalive_params"])
 
-        self._hidden["closed"] = multiprocessing.Event()
-        self._hidden["updated"] = multiprocessing.Event()
-        self._hidden["lock"] = multiprocessing.Lock()
+        if backend is None:
+            backend = self._backend
+        if backend not in self._backends:
+            raise ValueError(
+                "{} `backend` must be one of {}; got: {}".format(
+                    self.__class__.__name__, self._backends, backend
+                )
+            )
+        self._inf["backend"] = backend
+        self._init_sync_primitives()
 
         if name is None and hasattr(self.__class__, "_name"):
             name = self.__class__._name
         self._name = create_name(
             name, default=self.__class__.__name__, registry=_TICKER_NAMES
         )
+        self._inf["metrics"] = _init_metrics(metrics, self._name)
 
         self.logging_level = (
             logging_level if logging_level is not None else LOGGING_LEVEL
         )
 
+    def _init_sync_primitives(self):
+        primitives = _SYNC_BACKENDS[self._inf["backend"]]
+        self._hidden["closed"] = primitives["event"]()
+        self._hidden["updated"] = primitives["event"]()
+        self._hidden["lock"] = primitives["lock"]()
+        # the other process may close it too
+        if self._inf["backend"] == "process":
+            self._shared_closed = self._hidden["closed"]
+        else:
+            self._shared_closed = None
+
+    def _set_backend(self, backend):
+        """Switches to the sync primitives of `backend` (keeping their state);
+        ignored if the ticker doesn't support it"""
+        if self._inf["backend"] == backend or backend not in self._backends:
+            return
+        closed = self._hidden["closed"].is_set()
+        updated = self._hidden["updated"].is_set()
+        self._inf["backend"] = backend
+        self._init_sync_primitives()
+        if closed:
+            self._hidden["closed"].set()
+        if updated:
+            self._hidden["updated"].set()
+
+    @property
+    def _closed(self):
+        shared = self._shared_closed
+        return self._closed_here or (shared is not None and shared.is_set())
+
+    @_closed.setter
+    def _closed(self, value):
+        self._closed_here = value
+
     @abc.abstractmethod
     def tick(self, errors="raise", update_supers=True):
         pass
@@ -250,12 +558,15 @@ class BaseTicker(metaclass=abc.ABCMeta):
                         time = max(0, self.get_time_remaining())
                         event.clear()
 
+                started = _clock()
                 if event.wait(time):
                     event.clear()
                     self._verify_is_open()
                     time = t0
                     if time == "remaining":
                         continue
+                elif time is not None and self._inf["metrics"] is not None:
+                    self._inf["metrics"].record("overshoot", _clock() - started - time)
                 break
         finally:
             tlogger0.log(self.logging_level, "Sleep ended: {}".format(self.name))
@@ -272,11 +583,26 @@ class BaseTicker(metaclass=abc.ABCMeta):
             if not self._hidden["updated"].is_set():
                 self._hidden["updated"].set()
 
+        # let the managers drop it without scanning all of their tickers
+        for s in self._supers:
+            s._mark_terminated(self)
+
     def _verify_is_open(self):
         if self._closed:
             raise TerminatedException("{} is closed".format(self._name))
         return True
 
+    @property
+    def metrics(self):
+        """TickerMetrics, or None if not enabled"""
+        return self._inf["metrics"]
+
+    def get_metrics(self):
+        """Summary of the recorded tick metrics, or None if not enabled"""
+        if self._inf["metrics"] is None:
+            return None
+        return self._inf["metrics"].summary()
+
     @property
     def name(self):
         return self._name
@@ -285,25 +611,31 @@ class BaseTicker(metaclass=abc.ABCMeta):
     def name(self, value):
         self._name = value
 
+    def __repr__(self):
+        return "{}(name={})".format(self.__class__.__name__, self._name)
+
     _inf = {
         "callback": {"target": None, "accepts_arg": None},
         "keepalive": False,
         "keepalive_params": {},
+        "metrics": None,
     }
     _ui = {"time_closed": None}
     _hidden = {"closed": None, "updated": None, "lock": None}
-    _closed = False
+    _closed_here = False
+    _shared_closed = None
+    _backend = "thread"
+    _backends = ("thread", "process")
 
 
 class AsyncBaseTicker(BaseTicker):
     def __init__(self, *args, loop=None, **kw):
-        super().__init__(*args, **kw)
         if loop is None:
-            loop = asyncio.get_event_loop()
+            loop = get_event_loop()
+        # ._init_sync_primitives (called by BaseTicker.__init__) needs the loop
+        self._event_loop = loop
+        super().__init__(*args, **kw)
         self._inf["event_loop"] = loop
-        self._hidden["closed"] = FonsEvent(loop=loop)
-        self._hidden["updated"] = FonsEvent(loop=loop)
-        # self._hidden['lock'] = asyncio.Lock()
         self._inf["callback"]["isCoro"] = asyncio.iscoroutinefunction(
             self._inf["callback"]["target"]
         )
@@ -361,6 +693,7 @@ class AsyncBaseTicker(BaseTicker):
                     if is_windows:
                         sleep_time = max(0.016, time)
 
+                started = _clock()
                 try:
                     await asyncio.wait_for(event.wait(), sleep_time)
                     event.clear()
@@ -370,19 +703,34 @@ class AsyncBaseTicker(BaseTicker):
                         break
                 except asyncio.TimeoutError:
                     # We can't break out of the loop yet, as asyncio.sleep isn't completely accurate
-                    pass
+                    if self._inf["metrics"] is not None:
+                        self._inf["metrics"].record(
+                            "overshoot", _clock() - started - sleep_time
+                        )
                 finally:
                     time = t0
         finally:
             tlogger0.log(self.logging_level, "Sleep ended: {}".format(self.name))
 
+    def _init_sync_primitives(self):
+        # the lock is never held across an `await`, a threading.Lock will do
+        self._hidden["closed"] = FonsEvent(loop=self._event_loop)
+        self._hidden["updated"] = FonsEvent(loop=self._event_loop)
+        self._hidden["lock"] = _SYNC_BACKENDS["async"]["lock"]()
+
     async def close(self):
         super().close()
 
+    _backend = "async"
+    _backends = ("async",)
+
 
 #############################################################################
 
 
+add_origin_type(BaseTicker)
+
+
 class ScheduleTicker(BaseTicker):
     """For calling targetfunc in time restricted manner,
     .tick() or simply () attempts to call the target and return its output
@@ -473,7 +821,8 @@ class ScheduleTicker(BaseTicker):
              in that case return2 can be passed as [target2,args2,kwargs2]
           callback (function):
              a single-argument function to be called after each tick;
-              argument to be passed: {"result": result, "ticker": ticker, "ts": timestamp}
+              argument to be passed: {"result": result, "ticker": ticker, "ts": timestamp,
+                                      "missed": n_missed_entries}
           name (str,int):
             name of the Ticker instance, if int then added to the end of cls.__name__
 
@@ -481,12 +830,27 @@ class ScheduleTicker(BaseTicker):
           return2_copy (bool, func):
             if True, the .return2() output will be deepcopied before returned
             if function, this function will be used to copy .return2() before returned
+          backend (str):
+            'thread' (default) / 'process' / 'async' (AsyncTicker), see BaseTicker
+          metrics (bool, dict, TickerMetrics):
+            records tick lag/duration/skips, see BaseTicker
+          misfire (str):
+            what to do with the entries that were missed (e.g. the target overran its
+            interval), given that sync != None; .missed / callback's "missed" = their number
+            'coalesce' - one tick for all of them (default)
+            'catchup' - the missed ticks are run one after another, as soon as possible
+            'skip' - the late tick is skipped too (returns return2()), so that
+                     the next one is run at its scheduled time
+          misfire_budget (int):
+            max number of missed ticks run per catch-up (default: 10), the older ones are dropped
         """
         super().__init__(
             callback=callback,
             keepalive=keepalive,
             name=name,
             logging_level=kw.get("logging_level"),
+            backend=kw.get("backend"),
+            metrics=kw.get("metrics"),
         )
 
         if interval is None:
@@ -495,6 +859,7 @@ class ScheduleTicker(BaseTicker):
             self.interval = interval
 
         interval = self._ui["interval"]
+        self._inf["sync_spec"] = _sync_spec(sync)
 
         if sync is None:
             pass
@@ -533,24 +898,24 @@ class ScheduleTicker(BaseTicker):
                             sync
                         )
                     )
-                t00 = fontime.dt_round(dt.utcnow(), interval)
+                t00 = fontime.dt_round(_utcnow(), interval)
                 interval_td = (t00 + interval) - t00
                 t0 = t00 + fa * interval_td
                 t1 = t00 + fb * interval_td
                 rand_td = (t1 - t0) * np.random.random(1)[0]
                 self._ui["sync"] = t0 + rand_td
             elif repl == "interval":
-                self._ui["sync"] = fontime.dt_round(dt.utcnow(), interval)
+                self._ui["sync"] = fontime.dt_round(_utcnow(), interval)
             elif repl not in ("first", "epoch", "epoch-delay"):
                 self._ui["sync"] = fontime.dt_round(
-                    dt.utcnow(), sync
+                    _utcnow(), sync
                 )  # fontime.freq_to_td(sync, coerce=True)
             else:
                 self._ui["sync"] = repl
         elif isinstance(
             sync, (td, float, int, fontime.offsets.DateOffset)
         ) and not isinstance(sync, bool):
-            self._ui["sync"] = fontime.dt_round(dt.utcnow(), sync)
+            self._ui["sync"] = fontime.dt_round(_utcnow(), sync)
         elif isinstance(sync, dt):
             self._ui["sync"] = sync
         else:
@@ -561,6 +926,7 @@ class ScheduleTicker(BaseTicker):
             if self._ui["sync"] is None and delay_ofs.n:
                 raise ValueError("sync must not be None if delay specified")
             self._ui["delay"] = delay_ofs
+            self._update_fast()
 
         d_target = self._inf["target"]
         _verify_target([target, args, kwargs], add_to=d_target, target_null=True)
@@ -596,6 +962,15 @@ class ScheduleTicker(BaseTicker):
         else:
             raise TypeError(type(r2_copy))
 
+        misfire = self._inf["misfire"]
+        if kw.get("misfire") is not None:
+            if kw["misfire"] not in ("coalesce", "catchup", "skip"):
+                raise ValueError(kw["misfire"])
+            misfire["policy"] = kw["misfire"]
+        if kw.get("misfire_budget") is not None:
+            misfire["budget"] = int(kw["misfire_budget"])
+        self._ui["_catchup_left"] = misfire["budget"]
+
         if lock is not None:
             self.lock = lock
 
@@ -621,10 +996,30 @@ class ScheduleTicker(BaseTicker):
             return False
         return True
 
+    def _update_fast(self):
+        """Enables the float arithmetic path if interval and delay are both fixed
+        (e.g. '5S', 0.5, timedelta), disables for calendar offsets (e.g. 'MS', 'BH')"""
+        interval = _fixed_seconds(self._ui["interval"])
+        delay = _fixed_seconds(self._ui["delay"])
+        if interval is None or delay is None:
+            self._inf["fast"] = None
+        else:
+            self._inf["fast"] = {"interval": interval, "delay": delay}
+
     def get_time_remaining(self, as_float=True):
-        now = dt.utcnow()
         _ui = self._ui
-
+        fast = self._inf["fast"]
+
+        if fast is not None:
+            now = _clock()
+            remaining = 0.0
+            entry = _ui["_entry_ts"]
+            if entry is not None:
+                remaining = entry + fast["interval"] + fast["delay"] - now
+            remaining = max(_ui["_lock_ts"] - now, remaining)
+            return remaining if as_float else td(seconds=remaining)
+
+        now = _utcnow()
         remaining_lock = _ui["lock"] - now
         try:
             remaining = (_ui["entries"][0] + _ui["interval"] + _ui["delay"]) - now
@@ -637,6 +1032,28 @@ class ScheduleTicker(BaseTicker):
 
         return max(remaining_lock, remaining)
 
+    def _synced_ts(self, ts):
+        """Float version of ._synced (requires the fast path and sync datetime)"""
+        fast = self._inf["fast"]
+        interval = fast["interval"]
+        sync = _dt_to_ts(self._ui["sync"])
+        n = math.floor((ts - fast["delay"] - sync) / interval)
+        return sync + n * interval
+
+    def _get_plan(self):
+        """The SchedulePlan of current (interval, sync), or None if it can't be planned"""
+        ui = self._ui
+        interval, sync = ui["interval"], ui["sync"]
+        cached = self._inf["plan"]
+        if cached is not None and cached["interval"] is interval and cached["sync"] == sync:
+            return cached["plan"]
+        try:
+            plan = fontime.SchedulePlan(interval, sync)
+        except (TypeError, ValueError):
+            plan = None
+        self._inf["plan"] = {"interval": interval, "sync": sync, "plan": plan}
+        return plan
+
     def _synced(self, stamps):
         ui = self._ui
         sync, interval, delay = ui["sync"], ui["interval"], ui["delay"]
@@ -645,9 +1062,19 @@ class ScheduleTicker(BaseTicker):
         if single:
             stamps = [stamps]
 
-        timestamps_synced = [
-            fontime.dt_synced(x - delay, interval, sync) for x in stamps
-        ]
+        fast = self._inf["fast"]
+        if fast is not None and fast["interval"] > 0 and isinstance(sync, dt):
+            timestamps_synced = [
+                _ts_to_dt(self._synced_ts(_dt_to_ts(x))) for x in stamps
+            ]
+        else:
+            plan = self._get_plan()
+            if plan is not None:
+                timestamps_synced = [plan.synced(x - delay) for x in stamps]
+            else:
+                timestamps_synced = [
+                    fontime.dt_synced(x - delay, interval, sync) for x in stamps
+                ]
 
         if single:
             return timestamps_synced[0]
@@ -676,30 +1103,86 @@ class ScheduleTicker(BaseTicker):
         i.e only called after _is_tick_time() == True"""
 
         ui = self._ui
-        now = dt.utcnow()
-        ui["ticks"].appendleft(now)
+        now_ts = _clock()
+        ui["ticks"].appendleft(now_ts)
 
         if ui["sync"] is None:
             return
 
         counter = ui["counter"]
         if not counter:
-            self._ticktock_1st(now)
+            self._ticktock_1st(_ts_to_dt(now_ts))
+
+        fast = self._inf["fast"]
+        if fast is not None and fast["interval"] > 0:
+            entry_ts = self._synced_ts(now_ts)
+            entry = _ts_to_dt(entry_ts)
+        else:
+            entry = self._synced(_ts_to_dt(now_ts))
+            entry_ts = _dt_to_ts(entry)
+
+        ui["missed"] = 0
+        if counter and ui["entries"]:
+            entry, entry_ts = self._misfire(ui["entries"][0], entry, entry_ts)
 
-        entry = self._synced(now)
         ui["entries"].appendleft(entry)
+        ui["_entry_ts"] = entry_ts
 
         if not counter:
             ui["first"] = entry
 
+    def _count_missed(self, prev, entry):
+        """The number of entries (sync points) skipped between the two"""
+        fast = self._inf["fast"]
+        if fast is not None and fast["interval"] > 0:
+            n = round((_dt_to_ts(entry) - _dt_to_ts(prev)) / fast["interval"])
+            return max(0, n - 1)
+        plan = self._get_plan()
+        if plan is None:
+            return 0
+        return plan.between(prev, entry)
+
+    def _shift_entry(self, entry, entry_ts, n):
+        fast = self._inf["fast"]
+        if fast is not None and fast["interval"] > 0:
+            entry_ts += n * fast["interval"]
+            return _ts_to_dt(entry_ts), entry_ts
+        entry = self._get_plan().shift(entry, n)
+        return entry, _dt_to_ts(entry)
+
+    def _misfire(self, prev, entry, entry_ts):
+        """Applies the misfire policy if entries between `prev` (the last entry)
+        and `entry` (the current one) were missed; returns the entry to be recorded"""
+        ui = self._ui
+        misfire = self._inf["misfire"]
+        missed = self._count_missed(prev, entry)
+        ui["missed"] = missed
+
+        if misfire["policy"] != "catchup":
+            pass
+        elif not missed:
+            ui["_catchup_left"] = misfire["budget"]
+        else:
+            # the oldest ones that exceed the budget are dropped
+            n = min(missed, ui["_catchup_left"])
+            if n > 0:
+                entry, entry_ts = self._shift_entry(entry, entry_ts, -n)
+                ui["_catchup_left"] = n - 1
+
+        return entry, entry_ts
+
+    def _skip_misfired(self):
+        """With misfire='skip', the late tick is not run if entries were missed"""
+        return self._ui["missed"] and self._inf["misfire"]["policy"] == "skip"
+
     def _ticktock2(self):
         """Updates `last` and `actual_last` in the *end* of every valid tick,
         (i.e if _is_tick_time() == True and after target()/return2() completes),
         ONLY IF sync = None"""
         ui = self._ui
 
-        now = dt.utcnow()
-        self._ui["tick_ends"].appendleft(now)
+        now_ts = _clock()
+        ui["tick_ends"].appendleft(now_ts)
 
         counter = ui["counter"]
         ui["counter"] = counter + 1
@@ -707,7 +1190,9 @@ class ScheduleTicker(BaseTicker):
         if ui["sync"] is not None:
             return
 
-        self._ui["entries"].appendleft(now)
+        now = _ts_to_dt(now_ts)
+        ui["entries"].appendleft(now)
+        ui["_entry_ts"] = now_ts
 
         if not counter:
             ui["epoch"] = now
@@ -754,42 +1239,55 @@ class ScheduleTicker(BaseTicker):
         Note that QuitException raised from .return2 is not caught.
         """
 
-        self._ui["attempts"].appendleft(dt.utcnow())
+        self._ui["attempts"].appendleft(_clock())
 
         self._verify_is_open()
 
         if errors is None:
             errors = self._inf["errors"]
 
+        metrics = self._inf["metrics"]
+        lag = None
+
         if force is not True:
             remaining = self.get_time_remaining()
 
             if remaining <= 0:
                 pass
 
-            elif errors == "hide":
-                return self.return2()
-
-            elif errors == "warn":
-                logger.debug(
-                    "{} skipping tick() - wait of {} needed".format(
-                        self._name, math.ceil(remaining)
+            elif errors in ("hide", "warn"):
+                if metrics is not None:
+                    metrics.record_skip()
+                if errors == "warn":
+                    logger.debug(
+                        "{} skipping tick() - wait of {} needed".format(
+                            self._name, math.ceil(remaining)
+                        )
                     )
-                )
                 return self.return2()
 
             elif errors == "sleep":
                 self.sleep({"remaining": remaining})
+                if metrics is not None:
+                    remaining = self.get_time_remaining()
 
             else:
                 raise WaitException(remaining)
 
+            if metrics is not None:
+                lag = max(0.0, -remaining)
+
         # update timestamps
         self._ticktock()
 
         try:
-            response = self.target()
-            self._interval_updating()
+            if self._skip_misfired():
+                if metrics is not None:
+                    metrics.record_skip()
+                response = self.return2()
+            else:
+                response = self.target()
+                self._interval_updating()
 
         except QuitException as e:
             # if level > 0, then was raised by return2,
@@ -810,6 +1308,9 @@ class ScheduleTicker(BaseTicker):
         finally:
             # update timestamps
             self._ticktock2()
+            if metrics is not None:
+                ui = self._ui
+                metrics.record_tick(lag, ui["tick_ends"][0] - ui["ticks"][0])
             if update_supers:
                 self._update_supers()
 
@@ -856,7 +1357,10 @@ class ScheduleTicker(BaseTicker):
     @property
     def records(self):
         """Previous tick times recorded right before .target() started and at tick end."""
-        return list(zip(self._ui["ticks"], self._ui["tick_ends"]))
+        return [
+            (_ts_to_dt(x), _ts_to_dt(y))
+            for x, y in zip(self._ui["ticks"], self._ui["tick_ends"])
+        ]
 
     @property
     def interval(self):
@@ -904,6 +1408,7 @@ class ScheduleTicker(BaseTicker):
             _ui["_interval_str"] = "?"
 
         self._interval = ofs
+        self._update_fast()
 
         # updating sync
         # (the first wait time will be == interval, but the next one'd be unknown,
@@ -927,30 +1432,83 @@ class ScheduleTicker(BaseTicker):
             value = dt.utcfromtimestamp(0)
 
         elif isinstance(value, (int, float, td, fontime.offsets.DateOffset)):
-            value = dt.utcnow() + fontime.freq_to_offset(value)
+            value = _utcnow() + fontime.freq_to_offset(value)
 
         elif isinstance(value, str):
             if value.lower() not in ("next",):
-                value = dt.utcnow() + fontime.freq_to_offset(value)
+                value = _utcnow() + fontime.freq_to_offset(value)
 
             elif _ui["sync"] is None:
                 try:
                     value = self.entries[0] + _ui["interval"]
                 except IndexError:
-                    value = dt.utcnow() + _ui["interval"]
+                    value = _utcnow() + _ui["interval"]
                 # raise ValueError('For the lock to be synced the sync must not be None')
 
             elif not isinstance(_ui["sync"], dt):
                 raise ValueError("Sync is not initiated yet.")
 
             else:
-                nearest_synced = self._synced(dt.utcnow())
+                nearest_synced = self._synced(_utcnow())
                 value = nearest_synced + _ui["interval"] + _ui["delay"]
 
         elif not isinstance(value, dt):
             raise TypeError(type(value))
 
         _ui["lock"] = value
+        _ui["_lock_ts"] = _dt_to_ts(value)
+
+        self._update_supers()
+        with self._hidden["lock"]:
+            self._hidden["updated"].set()
+
+    def get_state(self):
+        """The schedule state (JSON serializable; datetimes as epoch floats),
+        that can be restored with .set_state() after a restart"""
+        ui = self._ui
+        to_ts = lambda x: _dt_to_ts(x) if isinstance(x, dt) else x
+        return {
+            "counter": ui["counter"],
+            "entries": [_dt_to_ts(x) for x in ui["entries"]],
+            "ticks": list(ui["ticks"]),
+            "tick_ends": list(ui["tick_ends"]),
+            "lock": ui["_lock_ts"],
+            "sync": to_ts(ui["sync"]),
+            "sync_spec": self._inf["sync_spec"],
+            "epoch": to_ts(ui["epoch"]),
+            "first": to_ts(ui["first"]),
+            "missed": ui["missed"],
+            "catchup_left": ui["_catchup_left"],
+        }
+
+    def set_state(self, state):
+        """Resumes the schedule from .get_state() output"""
+        ui = self._ui
+        to_dt = lambda x: _ts_to_dt(x) if isinstance(x, (int, float)) else x
+        keep = ui["entries"].maxlen
+
+        ui["counter"] = state["counter"]
+        ui["entries"] = deque((_ts_to_dt(x) for x in state["entries"]), keep)
+        ui["_entry_ts"] = state["entries"][0] if state["entries"] else None
+        ui["ticks"] = deque(state["ticks"], keep)
+        ui["tick_ends"] = deque(state["tick_ends"], keep)
+        if state.get("sync_spec") != self._inf["sync_spec"]:
+            tlogger.warning(
+                "{} - `sync` has changed since the checkpoint ({} -> {}); "
+                "keeping the configured schedule".format(
+                    self._name, state.get("sync_spec"), self._inf["sync_spec"]
+                )
+            )
+        else:
+            # sync=None (entries counted from tick ends) is not overridden
+            if ui["sync"] is not None and state["sync"] is not None:
+                ui["sync"] = to_dt(state["sync"])
+            ui["epoch"] = to_dt(state["epoch"])
+            ui["first"] = to_dt(state["first"])
+        ui["missed"] = state["missed"]
+        ui["_catchup_left"] = state["catchup_left"]
+        ui["lock"] = _ts_to_dt(state["lock"])
+        ui["_lock_ts"] = state["lock"]
 
         self._update_supers()
         with self._hidden["lock"]:
@@ -958,7 +1516,7 @@ class ScheduleTicker(BaseTicker):
 
     def get_last(self, raw=False):
         if raw:
-            return self._ui["records"][0][1]
+            return _ts_to_dt(self._ui["tick_ends"][0])
         else:
             return self._ui["entries"][0]
 
@@ -970,7 +1528,7 @@ class ScheduleTicker(BaseTicker):
         last = self.get_last()
 
         nxt = last + ui["interval"]
-        now = dt.utcnow()
+        now = _utcnow()
 
         if adjusted:
             nxt_synced = self._synced(now)
@@ -986,6 +1544,11 @@ class ScheduleTicker(BaseTicker):
     def counter(self):
         return self._ui["counter"]
 
+    @property
+    def missed(self):
+        """The number of entries that were missed before the last tick"""
+        return self._ui["missed"]
+
     @property
     def args(self):
         return self._inf["target"]["args"]
@@ -1010,6 +1573,10 @@ class ScheduleTicker(BaseTicker):
         "delay": td(0),
         "_interval_str": "0S",
         "lock": dt.utcfromtimestamp(0),
+        # epoch floats of "lock" and entries[0]
+        "_lock_ts": 0.0,
+        "_entry_ts": None,
+        # epoch floats (by the anchored monotonic clock)
         "attempts": deque(maxlen=5),
         "ticks": deque(maxlen=5),
         "tick_ends": deque(maxlen=5),
@@ -1017,12 +1584,22 @@ class ScheduleTicker(BaseTicker):
         "first": None,
         "epoch": None,
         "counter": 0,
+        # entries missed before the last one, and how many of them may yet be caught up
+        "missed": 0,
+        "_catchup_left": 0,
         "time_closed": None,
     }
 
     _inf = {
         "target": {"target": None, "args": tuple(), "kwargs": {}},
         "errors": "raise",
+        "misfire": {"policy": "coalesce", "budget": 10},
+        # the `sync` param, see _sync_spec()
+        "sync_spec": None,
+        # {"interval": seconds, "delay": seconds} if both are fixed
+        "fast": None,
+        # {"interval": offset, "sync": dt, "plan": SchedulePlan} of calendar intervals
+        "plan": None,
         "return2": {
             "value": None,
             "copy": False,
@@ -1138,6 +1715,15 @@ class TPMethods:
         )
         new_name = create_name(name, default=default, add_int="if_taken")
 
+        if self._inf["backend"] != "process":
+            tlogger.log(
+                self.logging_level,
+                "{} - switching to 'process' backend".format(self._name),
+            )
+        # the child needs to see .close() and updates made by the parent
+        # (also those of the sub-tickers)
+        self._set_backend("process")
+
         t = LogiProcess(group=group, target=self.loop, name=new_name, daemon=daemon)
 
         self._process = t
@@ -1153,11 +1739,22 @@ class Ticker(TPMethods, ScheduleTicker):
 
 
 class AsyncTicker(AsyncBaseTicker, ScheduleTicker):
-    def __init__(self, *args, loop=None, **kw):
+    def __init__(self, *args, loop=None, executor=None, **kw):
+        """
+        :param executor: runs a non-coroutine target in an executor, so that it wouldn't
+                         block the event loop (coroutine targets are unaffected)
+                         ::None - called inline (default)
+                         ::'thread' / 'process' - a thread / process pool, shared
+                                                  by the tickers of its AsyncTickManager
+                         ::Executor - e.g. concurrent.futures.ThreadPoolExecutor
+                         ('process' requires the target and args to be picklable)
+        Other params: see ScheduleTicker
+        """
         super().__init__(*args, loop=loop, **kw)
         self._inf["target"]["isCoro"] = asyncio.iscoroutinefunction(
             self._inf["target"]["target"]
         )
+        self._inf["target"]["executor"] = _verify_executor(executor)
         self._inf["return2"]["isCoro"] = asyncio.iscoroutinefunction(
             self._inf["return2"]["target"]
         )
@@ -1187,42 +1784,55 @@ class AsyncTicker(AsyncBaseTicker, ScheduleTicker):
         Note that QuitException raised from .return2 is not caught.
         """
 
-        self._ui["attempts"].appendleft(dt.utcnow())
+        self._ui["attempts"].appendleft(_clock())
 
         self._verify_is_open()
 
         if errors is None:
             errors = self._inf["errors"]
 
+        metrics = self._inf["metrics"]
+        lag = None
+
         if force is not True:
             remaining = self.get_time_remaining()
 
             if remaining <= 0:
                 pass
 
-            elif errors == "hide":
-                return await self.return2()
-
-            elif errors == "warn":
-                logger.debug(
-                    "{} skipping tick() - wait of {} needed".format(
-                        self._name, math.ceil(remaining)
+            elif errors in ("hide", "warn"):
+                if metrics is not None:
+                    metrics.record_skip()
+                if errors == "warn":
+                    logger.debug(
+                        "{} skipping tick() - wait of {} needed".format(
+                            self._name, math.ceil(remaining)
+                        )
                     )
-                )
                 return await self.return2()
 
             elif errors == "sleep":
                 await self.sleep({"remaining": remaining})
+                if metrics is not None:
+                    remaining = self.get_time_remaining()
 
             else:
                 raise WaitException(remaining)
 
+            if metrics is not None:
+                lag = max(0.0, -remaining)
+
         # update timestamps
         self._ticktock()
 
         try:
-            response = await self.target()
-            self._interval_updating()
+            if self._skip_misfired():
+                if metrics is not None:
+                    metrics.record_skip()
+                response = await self.return2()
+            else:
+                response = await self.target()
+                self._interval_updating()
 
         except QuitException as e:
             # if level > 0, then was raised by return2,
@@ -1243,6 +1853,9 @@ class AsyncTicker(AsyncBaseTicker, ScheduleTicker):
         finally:
             # update timestamps
             self._ticktock2()
+            if metrics is not None:
+                ui = self._ui
+                metrics.record_tick(lag, ui["tick_ends"][0] - ui["ticks"][0])
             if update_supers:
                 self._update_supers()
 
@@ -1258,6 +1871,8 @@ class AsyncTicker(AsyncBaseTicker, ScheduleTicker):
             pass
         elif d["isCoro"]:
             return await target(*d["args"], **d["kwargs"])
+        elif d["executor"] is not None:
+            return await self._run_in_executor(target, *d["args"], **d["kwargs"])
         else:
             return target(*d["args"], **d["kwargs"])
 
@@ -1267,6 +1882,16 @@ class AsyncTicker(AsyncBaseTicker, ScheduleTicker):
             e._level += 1
             raise e
 
+    async def _run_in_executor(self, func, *args, **kwargs):
+        executor = self._inf["target"]["executor"]
+        for s in self._supers:
+            if isinstance(s, AsyncTickManager):
+                return await s.run_in_executor(executor, func, *args, **kwargs)
+
+        loop = self._inf["event_loop"]
+        f = functools.partial(func, *args, **kwargs)
+        return await loop.run_in_executor(_get_default_executor(executor), f)
+
     async def return2(self):
         """Called from tick() if it determines _is_tick_time() == False, with `errors`
         set to 'warn' or 'hide'; or from target() if target has not been set.
@@ -1302,21 +1927,46 @@ class BaseTickManager(BaseTicker):
         name=None,
         close_subs=False,
         logging_level=None,
-        gc_closed=True
+        gc_closed=True,
+        backend=None,
+        coalesce=None,
+        metrics=None
     ):
-        """Its tick method ticks the next of its tickers"""
+        """Its tick method ticks the next of its tickers
+        :param coalesce: if given (seconds or timedelta), all tickers that are due
+                         within that tolerance window are fired in one pass
+                         (instead of one ticker per .tick())
+        :param metrics: the manager's own (sleep) metrics, see BaseTicker;
+                        the metrics of its tickers are merged by .collect_metrics()
+        """
         super().__init__(
             callback=callback,
             keepalive=keepalive,
             name=name,
             logging_level=logging_level,
+            backend=backend,
+            metrics=metrics,
         )
 
         if tickers is None:
             tickers = []
 
-        self._tickers = {"open": [], "closed": []}
+        self._inf["coalesce"] = _to_td(coalesce) if coalesce is not None else None
+
+        # "open": {ticker: None} (ordered set)
+        self._tickers = {"open": {}, "closed": []}
+        # {ticker: next_due}; the heap holds [next_due, seq, ticker] entries,
+        # of which only the latest one of each ticker is valid (the rest have
+        # their ticker set to None and are discarded once they reach the top)
         self._timer = {}
+        self._heap = []
+        self._heap_entries = {}
+        self._heap_seq = itertools.count()
+        self._heap_lock = threading.Lock()
+        self._terminated = set()
+        # tickers of the batch being fired; their heap entries are pushed
+        # only after they have finished
+        self._in_flight = set()
 
         for ticker in tickers:
             self.add_ticker(ticker)
@@ -1343,7 +1993,7 @@ class BaseTickManager(BaseTicker):
                     type(ticker)
                 )
             )
-        elif ticker in self._tickers["open"] or ticker in self._tickers["closed"]:
+        elif self in ticker._supers:
             raise TickerAlreadyAdded(
                 "Ticker {} has already been added to {}".format(
                     ticker._name, self._name
@@ -1354,7 +2004,7 @@ class BaseTickManager(BaseTicker):
                 "{} is closed. Cannot add to {}".format(ticker._name, self._name)
             )
 
-        self._tickers["open"].append(ticker)
+        self._tickers["open"][ticker] = None
         ticker._supers.add(self)
 
         # this will also set self._hidden['updated'],
@@ -1370,19 +2020,12 @@ class BaseTickManager(BaseTicker):
         while self._verify_is_open():
             self._remove_terminated()
 
-            valid = (x for x in self._timer.items() if x[1] is not None)
-
             # AllTerminated will be raised only in the nth (highest) level manager's .tick
             # assuming that is the only one which's .tick is called
             # (the sub tickers' .tick called by nth's .tick are all guaranteed to be "valid")
-            try:
-                ticker, earliest = min(valid, key=lambda x: x[1])
-            except ValueError:
-                raise AllTerminated(
-                    "{} - all tickers are terminated.".format(self._name)
-                )
+            ticker, earliest = self._peek_timer()
 
-            time_remaining = earliest - dt.utcnow()
+            time_remaining = earliest - _utcnow()
             secs = time_remaining.total_seconds()
 
             if secs > 0:
@@ -1392,6 +2035,11 @@ class BaseTickManager(BaseTicker):
                 else:
                     raise WaitException(secs)
 
+            if self._inf["coalesce"] is not None:
+                batch = self._pop_due(_utcnow() + self._inf["coalesce"])
+                self._tick_batch(batch, update_supers)
+                break
+
             try:
                 ticker.tick(update_supers=update_supers)
                 # self._update_timer(ticker, update_supers)
@@ -1407,6 +2055,25 @@ class BaseTickManager(BaseTicker):
                 e._level += 1
                 raise e
 
+    def _tick_batch(self, batch, update_supers=True):
+        """Ticks the tickers popped by ._pop_due, in the order of their due times"""
+        try:
+            for ticker in batch:
+                try:
+                    # those that are not yet due sleep the (tolerated) remainder
+                    ticker.tick(errors="sleep", update_supers=update_supers)
+                except AllTerminated as e:
+                    e._level += 1
+                    raise e
+                except TerminatedException as e:
+                    if not e._level:
+                        continue
+                    e._level += 1
+                    raise e
+        finally:
+            for ticker in batch:
+                self._release(ticker)
+
     def loop(self, update_supers=True):
         self._verify_is_open()
         tlogger.log(self.logging_level, "Starting ticker loop: {}".format(self.name))
@@ -1429,15 +2096,28 @@ class BaseTickManager(BaseTicker):
         finally:
             tlogger.log(self.logging_level, "Ticker loop ended: {}".format(self.name))
 
+    def _set_backend(self, backend):
+        super()._set_backend(backend)
+        for ticker in list(self._tickers["open"]) + self._tickers["closed"]:
+            ticker._set_backend(backend)
+
+    def _mark_terminated(self, ticker):
+        """Called by the (sub)ticker when it closes"""
+        self._terminated.add(ticker)
+
     def _remove_terminated(self):
+        if not self._terminated:
+            return
+        terminated, self._terminated = self._terminated, set()
         open = self._tickers["open"]
-        len_tickers = len(open)
-        for i, ticker in enumerate(reversed(open)):
-            if ticker._closed:
-                del open[len_tickers - (i + 1)]
-                del self._timer[ticker]
-                if not self._inf["gc_closed"]:
-                    self._tickers["closed"].append(ticker)
+        for ticker in terminated:
+            if ticker not in open:
+                continue
+            del open[ticker]
+            self._timer.pop(ticker, None)
+            self._push_timer(ticker, None)
+            if not self._inf["gc_closed"]:
+                self._tickers["closed"].append(ticker)
 
     def _handle_all_terminated(self):
         at = self._inf["allterminated"]
@@ -1450,11 +2130,13 @@ class BaseTickManager(BaseTicker):
 
     def _update_timer(self, ticker, update_supers=True):
         try:
-            _next = ticker.get_time_remaining(as_float=False) + dt.utcnow()
+            _next = ticker.get_time_remaining(as_float=False) + _utcnow()
         except AllTerminated:
-            self._timer[ticker] = None
-        else:
-            self._timer[ticker] = _next
+            _next = None
+
+        self._timer[ticker] = _next
+        if ticker not in self._in_flight:
+            self._push_timer(ticker, _next)
 
         with self._hidden["lock"]:
             self._hidden["updated"].set()
@@ -1462,15 +2144,88 @@ class BaseTickManager(BaseTicker):
         if update_supers:
             self._update_supers()
 
+    def _push_timer(self, ticker, due):
+        """Reschedules the ticker in O(log n), invalidating its previous heap entry"""
+        heap = self._heap
+        with self._heap_lock:
+            entry = self._heap_entries.pop(ticker, None)
+            if entry is not None:
+                entry[-1] = None
+            if due is not None:
+                entry = [due, next(self._heap_seq), ticker]
+                self._heap_entries[ticker] = entry
+                heapq.heappush(heap, entry)
+            # The invalidated entries are only discarded when they reach the top,
+            # which never happens if the heap isn't popped (coalesce not set)
+            if len(heap) > 2 * len(self._heap_entries) + 16:
+                heap[:] = [x for x in heap if x[-1] is not None]
+                heapq.heapify(heap)
+
+    def _peek_timer(self):
+        """Returns (ticker, due) of the earliest valid entry"""
+        heap = self._heap
+        with self._heap_lock:
+            while heap:
+                due, _, ticker = heap[0]
+                if ticker is None:
+                    heapq.heappop(heap)
+                elif ticker._closed:
+                    heapq.heappop(heap)
+                    del self._heap_entries[ticker]
+                    self._terminated.add(ticker)
+                else:
+                    return ticker, due
+        raise AllTerminated("{} - all tickers are terminated.".format(self._name))
+
+    def _pop_due(self, until):
+        """Pops all the tickers due by `until` off the heap, marking them in flight"""
+        heap = self._heap
+        batch = []
+        with self._heap_lock:
+            while heap and heap[0][0] <= until:
+                ticker = heapq.heappop(heap)[-1]
+                if ticker is None:
+                    continue
+                del self._heap_entries[ticker]
+                if ticker._closed:
+                    self._terminated.add(ticker)
+                    continue
+                self._in_flight.add(ticker)
+                batch.append(ticker)
+        return batch
+
+    def _release(self, ticker):
+        self._in_flight.discard(ticker)
+        if not ticker._closed:
+            self._update_timer(ticker, False)
+
+    def collect_metrics(self):
+        """Merges the TickerMetrics of all of its tickers (and their sub-tickers)"""
+        total = TickerMetrics(self._name)
+        seen = set()
+        for ticker in list(self._tickers["open"]) + self._tickers["closed"]:
+            if isinstance(ticker, BaseTickManager):
+                m = ticker.collect_metrics()
+            else:
+                m = ticker._inf["metrics"]
+            # a TickerMetrics may be shared by several tickers
+            if m is not None and id(m) not in seen:
+                seen.add(id(m))
+                total.merge(m)
+        return total
+
+    def get_metrics(self, aggregate=False):
+        """:param aggregate: if True, returns the summary of .collect_metrics(),
+                             otherwise of the manager's own metrics"""
+        if aggregate:
+            return self.collect_metrics().summary()
+        return super().get_metrics()
+
     def get_earliest(self):
-        vals = (x for x in self._timer.values() if x is not None)
-        try:
-            return min(vals)
-        except ValueError:
-            raise AllTerminated("{} - all tickers are terminated".format(self._name))
+        return self._peek_timer()[1]
 
     def get_time_remaining(self, as_float=True):
-        delta = self.get_earliest() - dt.utcnow()
+        delta = self.get_earliest() - _utcnow()
 
         if as_float:
             return delta.total_seconds()
@@ -1481,17 +2236,51 @@ class TickManager(TPMethods, BaseTickManager):
     def close(self):
         super().close()
         if self._inf["close_subs"]:
-            for t in self._tickers["open"]:
+            for t in list(self._tickers["open"]):
                 t.close()
         self._remove_terminated()
 
 
 class AsyncTickManager(AsyncBaseTicker, BaseTickManager):
-    def __init__(self, tickers, *, loop=None, allterminated="sleep", **kw):
-        """Asynchronous version of TickManager."""
+    def __init__(
+        self,
+        tickers,
+        *,
+        loop=None,
+        allterminated="sleep",
+        max_concurrent=None,
+        executors=None,
+        executor_limits=None,
+        **kw
+    ):
+        """Asynchronous version of TickManager.
+        :param max_concurrent: max number of tickers of a batch that are ticked
+                               concurrently (only applies if `coalesce` is given)
+        :param executors: the pools of its AsyncTicker(executor='thread'/'process'),
+                          {'thread': max_workers or Executor, 'process': ...};
+                          created on first use (and shut down on .close())
+        :param executor_limits: max number of targets running concurrently in an executor,
+                                {'thread'/'process'/Executor: int}
+        """
         super().__init__(None, loop=loop, allterminated=allterminated, **kw)
 
         self._hidden["queue"] = FonsQueue(loop=self._inf["event_loop"])
+        self._inf["max_concurrent"] = max_concurrent
+
+        executors = dict(executors) if executors is not None else {}
+        for kind, value in executors.items():
+            _verify_executor(kind)
+            if not isinstance(value, (int, Executor)) or isinstance(value, bool):
+                raise TypeError(type(value))
+        self._inf["executors"] = executors
+        self._inf["executor_limits"] = (
+            dict(executor_limits) if executor_limits is not None else {}
+        )
+        # {kind: Executor} - the pools in use; {id(Executor): asyncio.Semaphore}
+        self._hidden["executors"] = {}
+        self._hidden["executor_semaphores"] = {}
+        # the ticks in flight (a reference is kept until they are done)
+        self._hidden["tasks"] = set()
 
         if tickers is None:
             tickers = []
@@ -1509,6 +2298,10 @@ class AsyncTickManager(AsyncBaseTicker, BaseTickManager):
         TickManager.add_ticker(self, ticker)
         loop = self._inf["event_loop"]  # ticker._inf['event_loop']
 
+        if self._inf["coalesce"] is not None:
+            # the tickers are dispatched from the heap instead of the queue
+            return
+
         async def put():
             await self._hidden["queue"].put(ticker)
             with self._hidden["lock"]:
@@ -1538,18 +2331,102 @@ class AsyncTickManager(AsyncBaseTicker, BaseTickManager):
             return
         else:
             callback = self._inf["callback"]["target"]
+            args = ()
+            if self._inf["callback"]["accepts_arg"]:
+                args = (_callback_payload(self, None),)
             if callback is None:
                 pass
             elif self._inf["callback"]["isCoro"]:
-                await callback({"result": None, "ticker": self, "ts": dt.utcnow()})
+                await callback(*args)
             else:
-                callback({"result": None, "ticker": self, "ts": dt.utcnow()})
+                callback(*args)
 
             # self._update_timer(ticker, False)
         finally:
-            await self._hidden["queue"].put(ticker)
+            if self._inf["coalesce"] is None:
+                await self._hidden["queue"].put(ticker)
+            else:
+                self._release(ticker)
+
+    async def _tick_batch(self, batch, update_supers=True):
+        """Ticks the batch concurrently, at most `max_concurrent` at a time"""
+        semaphore = self._hidden["semaphore"]
+        if semaphore is None and self._inf["max_concurrent"]:
+            # (created here to be bound to the running loop)
+            semaphore = asyncio.Semaphore(self._inf["max_concurrent"])
+            self._hidden["semaphore"] = semaphore
+
+        async def tick_one(ticker):
+            if semaphore is None:
+                return await self._tick_and_release(
+                    ticker, errors="sleep", update_supers=update_supers
+                )
+            async with semaphore:
+                await self._tick_and_release(
+                    ticker, errors="sleep", update_supers=update_supers
+                )
+
+        results = await asyncio.gather(
+            *[tick_one(t) for t in batch], return_exceptions=True
+        )
+        for ticker, e in zip(batch, results):
+            if isinstance(e, Exception) and not isinstance(e, TerminatedException):
+                logger.error("{} - {} raised:".format(self._name, ticker.name))
+                logger.exception(e)
+
+    def _spawn(self, coro):
+        """Schedules `coro` as a task of the event loop, referenced until done"""
+        loop = self._inf["event_loop"]
+        tasks = self._hidden["tasks"]
+
+        def on_done(task):
+            tasks.discard(task)
+            if task.cancelled():
+                return
+            e = task.exception()
+            if e is not None and not isinstance(e, TerminatedException):
+                logger.error("{} - tick raised:".format(self._name))
+                logger.exception(e)
+
+        def create_task():
+            task = asyncio.ensure_future(coro, loop=loop)
+            tasks.add(task)
+            task.add_done_callback(on_done)
+
+        loop.call_soon(create_task)
+
+    async def _tick_coalesced(self, update_supers=True):
+        while self._verify_is_open():
+            self._remove_terminated()
+
+            if not len(self._tickers["open"]):
+                await self._handle_all_terminated()
+                continue
+
+            try:
+                ticker, earliest = self._peek_timer()
+            except AllTerminated:
+                # all of them are in flight
+                await self.sleep("updated")
+                continue
+
+            now = _utcnow()
+            secs = (earliest - now).total_seconds()
+            if secs > 0:
+                try:
+                    await self.sleep({"remaining": secs})
+                except AllTerminated:
+                    pass
+                continue
+
+            batch = self._pop_due(now + self._inf["coalesce"])
+            self._spawn(self._tick_batch(batch, update_supers=update_supers))
+            break
 
     async def tick(self, errors=NotImplemented, update_supers=True):
+        if self._inf["coalesce"] is not None:
+            return await self._tick_coalesced(update_supers)
+
         while self._verify_is_open():
             self._remove_terminated()
 
@@ -1558,14 +2435,13 @@ class AsyncTickManager(AsyncBaseTicker, BaseTickManager):
 
             ticker = await self._get_free_ticker()
             if ticker._closed:
+                self._mark_terminated(ticker)
                 continue
 
-            loop = self._inf["event_loop"]  # ticker._inf['event_loop']
             coro = self._tick_and_release(
                 ticker, errors="sleep", update_supers=update_supers
             )
-            f = functools.partial(asyncio.ensure_future, coro, loop=loop)
-            loop.call_soon(f)
+            self._spawn(coro)
             break
 
     async def loop(self, update_supers=True):
@@ -1602,6 +2478,37 @@ class AsyncTickManager(AsyncBaseTicker, BaseTickManager):
         as calling get_time_remaining() will fail if no tickers are left"""
         await super().sleep(time)
 
+    def get_executor(self, executor):
+        """The Executor of 'thread'/'process' (created on first call)"""
+        _verify_executor(executor)
+        if isinstance(executor, Executor):
+            return executor
+        pools = self._hidden["executors"]
+        if executor not in pools:
+            value = self._inf["executors"].get(executor)
+            if not isinstance(value, Executor):
+                value = _EXECUTOR_TYPES[executor](max_workers=value)
+            pools[executor] = value
+        return pools[executor]
+
+    async def run_in_executor(self, executor, func, *args, **kwargs):
+        """Runs func(*args, **kwargs) in `executor` ('thread'/'process'/Executor),
+        at most `executor_limits[executor]` at a time"""
+        pool = self.get_executor(executor)
+        limit = self._inf["executor_limits"].get(executor)
+        semaphores = self._hidden["executor_semaphores"]
+        semaphore = semaphores.get(id(pool))
+        if semaphore is None and limit:
+            # (created here to be bound to the running loop)
+            semaphore = semaphores[id(pool)] = asyncio.Semaphore(limit)
+
+        loop = self._inf["event_loop"]
+        f = functools.partial(func, *args, **kwargs)
+        if semaphore is None:
+            return await loop.run_in_executor(pool, f)
+        async with semaphore:
+            return await loop.run_in_executor(pool, f)
+
     async def close(self):
         event = self._hidden["closed"]
 
@@ -1610,8 +2517,14 @@ class AsyncTickManager(AsyncBaseTicker, BaseTickManager):
 
         await super().close()
 
+        # only shut down the pools that were created here
+        for kind, pool in list(self._hidden["executors"].items()):
+            if pool is not self._inf["executors"].get(kind):
+                pool.shutdown(wait=False)
+            del self._hidden["executors"][kind]
+
         if self._inf["close_subs"]:
-            for t in self._tickers["open"]:
+            for t in list(self._tickers["open"]):
                 if isinstance(t, AsyncBaseTicker):
                     await t.close()
                 else:
@@ -1619,11 +2532,26 @@ class AsyncTickManager(AsyncBaseTicker, BaseTickManager):
 
         self._remove_terminated()
 
-    _hidden = {"closed": None, "updated": None, "lock": None, "queue": None}
+    _hidden = {
+        "closed": None,
+        "updated": None,
+        "lock": None,
+        "queue": None,
+        "semaphore": None,
+        "executors": None,
+        "executor_semaphores": None,
+        "tasks": None,
+    }
 
 
 class Routine:
-    def __init__(self, sched={}, tickmgr={}, *, name=None):
+    def __init__(self, sched={}, tickmgr={}, *, name=None, checkpoint=None):
+        """
+        :param checkpoint: path of a JSON file (or {'path': path, 'interval': seconds}),
+                           to which the schedule state (of the tickers) is saved at most
+                           every `interval` (default: 60) seconds and on .close();
+                           the tickers created by .create_schedule resume from it
+        """
         self._locks = {-1: asyncio.Lock()}
         self._events = {}
 
@@ -1637,6 +2565,7 @@ class Routine:
         # args:target_args,
         # kwargs:target_kwargs,
         # lock_id:None/<int>/<asyncio.Lock>
+        # executor:None/'thread'/'process'/<Executor> - where a non-coroutine target is run (see AsyncTicker)
         # no_set_event_on: if target returns this value, event will not be set
         #  -- (NB! the comparison operator is `is` ("value is no_set_event_on"), therefore strings/ints/floats.. will not do)
         #  --defaults to False
@@ -1664,6 +2593,24 @@ class Routine:
         self._tickmgr = AsyncTickManager(**tcm)
         self._tickers = {}
 
+        if isinstance(checkpoint, str):
+            checkpoint = {"path": checkpoint}
+        elif checkpoint is not None and not isinstance(checkpoint, dict):
+            raise TypeError(type(checkpoint))
+        if checkpoint is not None:
+            checkpoint = {
+                "path": checkpoint["path"],
+                "interval": checkpoint.get("interval", 60),
+                # the state that was loaded (None if no file), and the text last written
+                "read": False,
+                "loaded": None,
+                "saved": None,
+                "time_saved": 0.0,
+                # the future of the write in progress (save_checkpoint_async)
+                "writing": None,
+            }
+        self._checkpoint = checkpoint
+
     def create_schedule(self):
         """Creates tickers out of .sched attribute.
         May also be called while Routine is already running (.start has been called)"""
@@ -1688,10 +2635,12 @@ class Routine:
                 )
 
             async def set_event(*args):
-                # ticker @callback passes {'result': , 'ticker': ,'ts': }
+                # ticker @callback passes {'result': , 'ticker': ,'ts': , 'missed': }
                 # print(cb_is_set,set_event_on,args[0]['result'],set_event_on(args[0]['result']))
                 if no_set_event_on is None or not no_set_event_on(args[0]["result"]):
                     event.set()
+                if self._checkpoint is not None:
+                    await self.save_checkpoint_async()
                 if not cb_is_set:
                     pass
                 elif accepts_args:
@@ -1708,6 +2657,7 @@ class Routine:
             return set_event
 
         logger.debug("{} - creating schedule".format(self.name))
+        state = self.load_checkpoint()
         max_lock_id = max(self._locks)
         for n, params in self.sched.items():
             # Only new schedule items will be added
@@ -1732,11 +2682,22 @@ class Routine:
                 self._locks[lock_id] = asyncio.Lock()
 
             targkw = [params.get(p) for p in ("target", "args", "kwargs")]
-            rout_kw = {"lock_id": lock_id}
+            rout_kw = {
+                "lock_id": lock_id,
+                "executor": _verify_executor(params.get("executor")),
+            }
             tickConfig = {
                 x: y
                 for x, y in params.items()
-                if x not in ("target", "args", "kwargs", "lock_id", "no_set_event_on")
+                if x
+                not in (
+                    "target",
+                    "args",
+                    "kwargs",
+                    "lock_id",
+                    "executor",
+                    "no_set_event_on",
+                )
             }
 
             self._events[n] = event = FonsEvent()
@@ -1750,6 +2711,8 @@ class Routine:
             ticker = AsyncTicker(
                 self._routine, args=targkw, kwargs=rout_kw, **tickConfig
             )
+            if state is not None and n in state["tickers"]:
+                ticker.set_state(state["tickers"][n])
             self._tickmgr.add_ticker(ticker)
             self._tickers[n] = ticker
 
@@ -1762,7 +2725,7 @@ class Routine:
         finally:
             tlogger.debug("Routine ended: {}".format(self.name))
 
-    async def _routine(self, target, args, kwargs, lock_id):
+    async def _routine(self, target, args, kwargs, lock_id, executor=None):
         if args is None:
             args = tuple()
         if kwargs is None:
@@ -1774,6 +2737,10 @@ class Routine:
         async with lock:
             if asyncio.iscoroutinefunction(method):
                 return await method(*args, **kwargs)
+            elif executor is not None:
+                return await self._tickmgr.run_in_executor(
+                    executor, method, *args, **kwargs
+                )
             else:
                 return method(*args, **kwargs)
 
@@ -1793,10 +2760,106 @@ class Routine:
 
     async def close(self):
         await self._tickmgr.close()
+        if self._checkpoint is not None:
+            await self.save_checkpoint_async(force=True)
+
+    def get_state(self):
+        """The schedule state of its tickers, JSON serializable"""
+        return {"tickers": {n: t.get_state() for n, t in self._tickers.items()}}
+
+    def set_state(self, state):
+        """Resumes (the existing) tickers from .get_state() output"""
+        for n, t in self._tickers.items():
+            if n in state["tickers"]:
+                t.set_state(state["tickers"][n])
+
+    def load_checkpoint(self):
+        """The state saved in the checkpoint file (read only once), or None
+        if there is no (readable) checkpoint file"""
+        cp = self._checkpoint
+        if cp is None:
+            return None
+        if not cp["read"]:
+            cp["read"] = True
+            try:
+                with open(cp["path"], encoding="utf-8") as f:
+                    cp["loaded"] = json.load(f)
+                cp["saved"] = json.dumps(cp["loaded"], sort_keys=True)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.error(
+                    "{} - could not read checkpoint {}: {}".format(
+                        self.name, cp["path"], e
+                    )
+                )
+        return cp["loaded"]
+
+    def save_checkpoint(self, force=False):
+        """Saves .get_state() to the checkpoint file, unless it was saved less than
+        `interval` seconds ago (and not `force`) or it hasn't changed since.
+        Returns True if the file was written."""
+        text = self._get_checkpoint_text(force)
+        if text is None:
+            return False
+        write_atomic(self._checkpoint["path"], text)
+        self._checkpoint["saved"] = text
+        return True
+
+    async def save_checkpoint_async(self, force=False):
+        """Like .save_checkpoint, but the file is written in a thread pool (so that
+        the fsync doesn't block the loop); skipped if a write is in progress,
+        unless `force`"""
+        cp = self._checkpoint
+        while cp is not None and cp["writing"] is not None:
+            if not force:
+                return False
+            await asyncio.shield(cp["writing"])
+        text = self._get_checkpoint_text(force)
+        if text is None:
+            return False
+        loop = get_event_loop()
+        pool = _get_default_executor("thread")
+        cp["writing"] = fut = loop.run_in_executor(pool, write_atomic, cp["path"], text)
+        try:
+            await fut
+        finally:
+            cp["writing"] = None
+        cp["saved"] = text
+        return True
+
+    def _get_checkpoint_text(self, force):
+        """The state to be saved (None if it mustn't / needn't be)"""
+        cp = self._checkpoint
+        if cp is None:
+            raise ValueError("{} has no checkpoint".format(self.name))
+        now = _clock()
+        if not force and now - cp["time_saved"] < cp["interval"]:
+            return None
+        cp["time_saved"] = now
+        text = json.dumps(self.get_state(), sort_keys=True)
+        if text == cp["saved"]:
+            return None
+        return text
 
     def get_ticker(self, name):
         return self._tickers[name]
 
+    def get_metrics(self, aggregate=False):
+        """Tick metrics summaries of its tickers that have `metrics` enabled
+        (pass e.g. sched={'x': {..., 'metrics': True}})
+        :param aggregate: if True, returns them merged into one"""
+        enabled = {
+            n: t.metrics for n, t in self._tickers.items() if t.metrics is not None
+        }
+        if not aggregate:
+            return {n: m.summary() for n, m in enabled.items()}
+        total = TickerMetrics(self._name)
+        # a TickerMetrics may be shared by several tickers
+        for m in {id(m): m for m in enabled.values()}.values():
+            total.merge(m)
+        return total.summary()
+
     def get_event(self, name):
         return self._events[name]
 
@@ -1817,3 +2880,310 @@ class Routine:
     @name.setter
     def name(self, value):
         self._name = value
+
+
+################################################################
+
+
+def _shard_of(key, n):
+    """Hash assignment that is stable across processes (unlike hash())"""
+    return zlib.crc32(str(key).encode("utf-8")) % n
+
+
+class _Shard:
+    """The tickers of a ShardedTickManager worker, ticked by its AsyncTickManager"""
+
+    def __init__(self, index, loop, tickmgr={}):
+        self.index = index
+        self.loop = loop
+        params = {"allterminated": "sleep", "name": "Shard-{}".format(index)}
+        params.update(tickmgr)
+        self.tickmgr = AsyncTickManager([], loop=loop, **params)
+        self.tickers = {}
+
+    def add(self, key, spec, state=None):
+        spec = dict(spec)
+        cls = spec.pop("cls", AsyncTicker)
+        if spec.get("metrics") is None:
+            # the lag is needed for rebalancing
+            spec["metrics"] = _LagMetrics()
+        if spec.get("name") is None:
+            spec["name"] = "{}[{}]".format(key, self.index)
+        ticker = cls(loop=self.loop, **spec)
+        if state is not None:
+            ticker.set_state(state)
+        self.tickmgr.add_ticker(ticker)
+        self.tickers[key] = ticker
+
+    async def remove(self, key):
+        ticker = self.tickers.pop(key)
+        state = ticker.get_state()
+        await ticker.close()
+        return state
+
+    def stats(self, reset=False):
+        tickers = {}
+        total = TickerMetrics(self.tickmgr.name)
+        for key, ticker in self.tickers.items():
+            m = ticker.metrics
+            d = tickers[key] = {
+                "closed": ticker._closed,
+                "ticks": 0,
+                "lag": None,
+                "busy": 0.0,
+                "metrics": None,
+            }
+            if m is None:
+                continue
+            d["ticks"] = m.ticks
+            if isinstance(m, _LagMetrics):
+                d["lag"], d["busy"] = m.lag, m.busy
+            else:
+                d["lag"] = m.hists["lag"].percentile(90)
+                d["busy"] = m.hists["duration"].total
+                d["metrics"] = m.summary()
+                total.merge(m)
+            if reset:
+                m.reset()
+        lags = [d["lag"] for d in tickers.values() if d["lag"] is not None]
+        return {
+            "pid": os.getpid(),
+            "tickers": tickers,
+            "ticks": sum(d["ticks"] for d in tickers.values()),
+            "lag": max(lags, default=None),
+            "total": total.summary(),
+        }
+
+
+def _run_shard(conn, index, tickmgr):
+    loop = new_event_loop()
+    asyncio.set_event_loop(loop)
+    shard = _Shard(index, loop, tickmgr)
+
+    def handle(inp):
+        method = getattr(shard, inp["method"])
+        future = call_via_loop(method, inp["args"], inp["kwargs"], loop=loop)
+        server.send(future.result())
+
+    def terminate():
+        call_via_loop(shard.tickmgr.close, loop=loop)
+
+    server = Server(
+        conn,
+        handle,
+        on_exit=terminate,
+        exit_cmd=lambda x: x is None,
+        name="Shard-{}[Server]".format(index),
+        daemon=True,
+    )
+    server.start()
+    try:
+        loop.run_until_complete(shard.tickmgr.loop())
+    finally:
+        server.close()
+        loop.close()
+
+
+class _ShardProcess(LogiProcess):
+    def __init__(self, conn, index, tickmgr, **kw):
+        super().__init__(**kw)
+        self.conn = conn
+        self.index = index
+        self.tickmgr = tickmgr
+
+    def run(self):
+        _run_shard(self.conn, self.index, self.tickmgr)
+
+
+class ShardedTickManager:
+    """Partitions tickers across worker processes, each ticking its share with
+    an AsyncTickManager in its own event loop (and logging via fons.log queue).
+    As the tickers are created in the workers, they are given as specs:
+      {"cls": AsyncTicker (default), <AsyncTicker.__init__ params>}
+    with a picklable target (e.g. a module level function)."""
+
+    def __init__(
+        self,
+        shards=None,
+        *,
+        tickmgr={},
+        lag_threshold=0.05,
+        rebalance_interval=None,
+        name=None,
+        start=True
+    ):
+        """
+        :param shards: number of worker processes (default: cpu_count - 1)
+        :param tickmgr: AsyncTickManager params of the workers
+        :param lag_threshold: .rebalance() moves a ticker away from the shard whose
+                              tick lag (seconds, see .get_stats()) exceeds it
+                              the most
+        :param rebalance_interval: if given (seconds), calls .rebalance() periodically
+        """
+        if shards is None:
+            shards = max(1, multiprocessing.cpu_count() - 1)
+        if shards < 1:
+            raise ValueError(shards)
+        self._name = create_name(
+            name, default=self.__class__.__name__, registry=_TICKER_NAMES
+        )
+        self._inf = {
+            "tickmgr": dict(tickmgr),
+            "lag_threshold": lag_threshold,
+            "rebalance_interval": rebalance_interval,
+        }
+        self._shards = []
+        for i in range(shards):
+            conn, child_conn = multiprocessing.Pipe()
+            process = _ShardProcess(
+                child_conn,
+                i,
+                self._inf["tickmgr"],
+                name="{}-{}".format(self._name, i),
+                daemon=True,
+            )
+            self._shards.append(
+                {"process": process, "conn": conn, "lock": threading.Lock()}
+            )
+        # {key: spec}, {key: shard index}
+        self._specs = {}
+        self._assignments = {}
+        self._hidden = {"closed": threading.Event(), "rebalancer": None}
+        self._started = False
+
+        if start:
+            self.start()
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        for shard in self._shards:
+            shard["process"].start()
+        if self._inf["rebalance_interval"]:
+            rebalancer = threading.Thread(
+                target=self._rebalance_loop,
+                name=self._name + "-Rebalancer",
+                daemon=True,
+            )
+            self._hidden["rebalancer"] = rebalancer
+            rebalancer.start()
+
+    def _request(self, index, method, *args, **kwargs):
+        if self._hidden["closed"].is_set():
+            raise TerminatedException("{} is closed".format(self._name))
+        shard = self._shards[index]
+        with shard["lock"]:
+            shard["conn"].send({"method": method, "args": args, "kwargs": kwargs})
+            r = shard["conn"].recv()
+        if r is None:
+            raise TerminatedException("{}-{} has exited".format(self._name, index))
+        if not r["ok"]:
+            raise TickerException(r["msg"])
+        return r["data"]
+
+    def add_ticker(self, key, spec, shard=None):
+        """:param shard: index of the worker; by default assigned by hash of `key`"""
+        if key in self._specs:
+            raise TickerAlreadyAdded(
+                "Ticker {} has already been added to {}".format(key, self._name)
+            )
+        if shard is None:
+            shard = _shard_of(key, len(self._shards))
+        self._request(shard, "add", key, spec)
+        self._specs[key] = spec
+        self._assignments[key] = shard
+
+    def remove_ticker(self, key):
+        """Closes the ticker, returns its final state (see ScheduleTicker.get_state)"""
+        state = self._request(self._assignments[key], "remove", key)
+        del self._specs[key]
+        del self._assignments[key]
+        return state
+
+    def move_ticker(self, key, shard):
+        """Moves the ticker to another worker, where it resumes its schedule"""
+        old = self._assignments[key]
+        if shard == old:
+            return
+        state = self._request(old, "remove", key)
+        self._request(shard, "add", key, self._specs[key], state)
+        self._assignments[key] = shard
+
+    def get_shard(self, key):
+        return self._assignments[key]
+
+    def get_stats(self, reset=False):
+        """{shard_index: {"pid", "tickers", "ticks", "lag", "total"}}, where
+          tickers - {key: {"closed", "ticks", "lag", "busy", "metrics"}}
+          lag - tick lag (seconds): the EWMA, or p90 if the ticker has `metrics`
+                enabled; of a shard the max of its tickers
+          busy - total duration (seconds) of the ticks
+          metrics, total - TickerMetrics summaries of the tickers that have
+                           `metrics` enabled, and of the shard (merged)
+        :param reset: resets the metrics (after they have been read)"""
+        return {
+            i: self._request(i, "stats", reset=reset) for i in range(len(self._shards))
+        }
+
+    def rebalance(self):
+        """Moves the busiest ticker of the most lagging shard (if its lag exceeds
+        `lag_threshold`) to the least lagging one. Returns (key, from, to) or None.
+        The metrics are reset, so that the next call measures the new layout."""
+        stats = self.get_stats(reset=True)
+        lag = {i: s["lag"] or 0.0 for i, s in stats.items()}
+        worst = max(lag, key=lag.get)
+        best = min(lag, key=lag.get)
+        if worst == best or lag[worst] <= self._inf["lag_threshold"]:
+            return None
+
+        candidates = [
+            x for x in stats[worst]["tickers"].items() if not x[1]["closed"]
+        ]
+        if len(candidates) < 2:
+            return None
+        key = max(candidates, key=lambda x: x[1]["busy"])[0]
+        logger.debug(
+            "{} - moving {} from shard {} to {} (lags: {:.3f}, {:.3f})".format(
+                self._name, key, worst, best, lag[worst], lag[best]
+            )
+        )
+        self.move_ticker(key, best)
+        return (key, worst, best)
+
+    def _rebalance_loop(self):
+        closed = self._hidden["closed"]
+        while not closed.wait(self._inf["rebalance_interval"]):
+            try:
+                self.rebalance()
+            except TerminatedException:
+                break
+            except Exception as e:
+                logger.exception(e)
+
+    def close(self, timeout=5):
+        if self._hidden["closed"].is_set():
+            return
+        self._hidden["closed"].set()
+        for shard in self._shards:
+            with shard["lock"]:
+                try:
+                    shard["conn"].send(None)
+                except (OSError, ValueError):
+                    pass
+        for shard in self._shards:
+            if self._started:
+                shard["process"].join(timeout)
+            shard["conn"].close()
+
+    @property
+    def closed(self):
+        return self._hidden["closed"].is_set()
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
@@ -2,16 +2,19 @@ import datetime
 
 dt = datetime.datetime
 td = datetime.timedelta
+import functools
 import time
+import os
 import threading
 import asyncio
 
 import fons.debug as debug
+from fons.aio import LoopMonitor, call_via_loop_fast, new_event_loop
 from fons.errors import ThreadEndException
+from fons.reg import create_name, NameRegistry
 
-# from fons.reg import create_name
-
-_THREAD_NAMES = set()
+_THREAD_NAMES = NameRegistry()
+_POOL_NAMES = NameRegistry()
 
 
 class Eli(type):
@@ -20,7 +23,7 @@ class Eli(type):
             def set_event_loop(self):
                 loop = getattr(self, "_loop", None)
                 if loop is None:
-                    self._loop = loop = asyncio.new_event_loop()
+                    self._loop = loop = new_event_loop()
                 asyncio.set_event_loop(loop)
                 return f(self)
 
@@ -53,13 +56,15 @@ class EliThread(threading.Thread, metaclass=Eli):
         loop=None,
         trylog=True,
         keepalive=False,
-        daemon=None
+        daemon=None,
+        monitor=None
     ):
+        """:param monitor: True or kwargs of fons.aio.LoopMonitor (of its loop)"""
         if args is None:
             args = ()
         if kwargs is None:
             kwargs = {}
-        self._loop = loop if loop is not None else asyncio.new_event_loop()
+        self._loop = loop if loop is not None else new_event_loop()
         self._keepalive = bool(isinstance(keepalive, dict) or keepalive)
         self._trylog = bool(isinstance(trylog, dict) or trylog)
         if not isinstance(trylog, dict):
@@ -76,6 +81,10 @@ class EliThread(threading.Thread, metaclass=Eli):
             target = debug.trylog
         # print('group: {}, target:{}, daemon: {}'.format(group,target,daemon))
         super().__init__(group, target, name, args, kwargs, daemon=daemon)
+        self.monitor = None
+        if monitor:
+            kw = monitor if isinstance(monitor, dict) else {}
+            self.monitor = LoopMonitor(self._loop, **kw).start()
 
 
 # -------------------------------
@@ -162,6 +171,229 @@ class LoopingThread(EliThread):
     _shutdown = False
 
 
+# -------------------------------
+
+
+class _SelectTimer:
+    """Wraps the selector of a loop, measuring the time spent waiting in it"""
+
+    def __init__(self, selector):
+        self._selector = selector
+        self._idle = 0.0
+        # start of the ongoing select
+        self._since = None
+
+    @property
+    def idle(self):
+        since = self._since
+        idle = self._idle
+        if since is not None:
+            idle += time.perf_counter() - since
+        return idle
+
+    def select(self, timeout=None):
+        self._since = t0 = time.perf_counter()
+        try:
+            return self._selector.select(timeout)
+        finally:
+            self._since = None
+            self._idle += time.perf_counter() - t0
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class _LoopThread(EliThread):
+    def run(self):
+        loop = self._loop
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(
+                    asyncio.gather(*tasks, return_exceptions=True)
+                )
+            loop.close()
+
+
+class LoopPool:
+    """
+    A fixed set of event loops, each run forever by its own EliThread.
+    Instead of a thread (and loop) per Node / AsyncTickManager, place them
+    on the pool's loops:
+        pool = LoopPool(4)
+        node = pool.add_node()
+        tickmgr = pool.add_tickmanager()
+        pool.add_receptor(station, channel)
+        pool.submit(coro, affinity="feed")
+    New objects are placed on the least utilized loop (utilization being the
+    fraction of time the loop wasn't waiting for events, measured over
+    `interval` seconds; among loops within 10% the one with the fewest placed
+    objects is picked; loops without a selector, e.g. uvloop's, are balanced by
+    the number of placed objects only), unless `affinity` is given:
+        ::int           - the loop of that index (modulo size)
+        ::loop          - that loop (must be one of the pool's)
+        ::other key     - the loop that the key was first placed on
+    """
+
+    def __init__(self, size=None, *, name=None, interval=1.0, monitor=None):
+        """:param monitor: True or kwargs of fons.aio.LoopMonitor (of each loop)"""
+        if size is None:
+            size = os.cpu_count() or 1
+        if size < 1:
+            raise ValueError("`size` must be >= 1; got: {}".format(size))
+        self.name = create_name(name, self.__class__.__name__, _POOL_NAMES)
+        self.interval = interval
+        self.loops = []
+        self.threads = []
+        self._timers = []
+        # objects placed on each loop
+        self._placed = [0] * size
+        # [(perf_counter, idle), utilization] of each loop
+        self._samples = []
+        # {key: loop index}
+        self._affinity = {}
+        # {tick manager name: future of its .loop()}
+        self.futures = {}
+        self._lock = threading.Lock()
+
+        for i in range(size):
+            loop = new_event_loop()
+            timer = getattr(loop, "_selector", None)
+            if timer is not None:
+                timer = loop._selector = _SelectTimer(timer)
+            thread = _LoopThread(
+                name="{}-{}".format(self.name, i),
+                loop=loop,
+                trylog=False,
+                daemon=True,
+                monitor=monitor,
+            )
+            self.loops.append(loop)
+            self.threads.append(thread)
+            self._timers.append(timer)
+            self._samples.append([(time.perf_counter(), 0.0), 0.0])
+            thread.start()
+
+    def utilization(self):
+        """:returns: list of utilizations (0...1) of the loops"""
+        now = time.perf_counter()
+        utilizations = []
+        for timer, sample in zip(self._timers, self._samples):
+            (t, idle), u = sample
+            if timer is not None and now - t >= self.interval:
+                idle2 = timer.idle
+                u = min(max(1 - (idle2 - idle) / (now - t), 0.0), 1.0)
+                sample[:] = [(now, idle2), u]
+            utilizations.append(u)
+        return utilizations
+
+    def get_index(self, affinity=None):
+        """The index of the loop to place an object on (see LoopPool)"""
+        if isinstance(affinity, int) and not isinstance(affinity, bool):
+            return affinity % len(self.loops)
+        if isinstance(affinity, asyncio.AbstractEventLoop):
+            try:
+                return self.loops.index(affinity)
+            except ValueError:
+                raise ValueError("Loop {} is not in the pool".format(affinity))
+        with self._lock:
+            if affinity is not None and affinity in self._affinity:
+                return self._affinity[affinity]
+            utilizations = self.utilization()
+            i = min(
+                range(len(self.loops)),
+                key=lambda i: (round(utilizations[i], 1), self._placed[i]),
+            )
+            if affinity is not None:
+                self._affinity[affinity] = i
+            return i
+
+    def get_loop(self, affinity=None):
+        return self.loops[self.get_index(affinity)]
+
+    def _place(self, affinity):
+        i = self.get_index(affinity)
+        self._placed[i] += 1
+        return self.loops[i]
+
+    def submit(self, coro, affinity=None):
+        """
+        :param coro: coroutine or (async)function (called without arguments)
+        :rtype: concurrent.futures.Future
+        """
+        loop = self.get_loop(affinity)
+        if asyncio.iscoroutine(coro):
+            return asyncio.run_coroutine_threadsafe(coro, loop)
+        return call_via_loop_fast(coro, loop=loop)
+
+    def add_node(self, *args, affinity=None, serve=True, **kw):
+        """Node(*args, **kw) running on one of the loops"""
+        from fons.event import Node
+
+        node = Node(*args, loop=self._place(affinity), **kw)
+        if serve:
+            node.serve()
+        return node
+
+    def add_tickmanager(self, tickers=(), *, affinity=None, **kw):
+        """
+        AsyncTickManager(tickers, **kw) with its .loop() running on one of the loops.
+        The tickers must have been created with loop=pool.get_loop(affinity);
+        add more via pool.submit(functools.partial(tickmgr.add_ticker, ticker), loop)
+        """
+        from fons.sched import AsyncTickManager
+
+        loop = self._place(affinity)
+        create = functools.partial(AsyncTickManager, list(tickers), loop=loop, **kw)
+        # .add_ticker isn't thread safe, create it within the loop's thread
+        if loop is asyncio._get_running_loop():
+            tickmgr = create()
+        else:
+            tickmgr = call_via_loop_fast(create, loop=loop).result()
+        self.futures[tickmgr.name] = self.submit(tickmgr.loop(), loop)
+        return tickmgr
+
+    def add_receptor(self, station, channel, id=None, *, affinity=None, **kw):
+        """station.add(channel, id, **kw) with the receptor bound to one of the loops"""
+        return station.add(channel, id, loops=[self._place(affinity)], **kw)
+
+    def get_stats(self):
+        stats = []
+        for i, u in enumerate(self.utilization()):
+            d = {"loop": i, "utilization": u, "placed": self._placed[i]}
+            monitor = self.threads[i].monitor
+            if monitor is not None:
+                d["lag"] = monitor.lag.summary()
+                d["stalls"] = monitor.stalls
+            stats.append(d)
+        return stats
+
+    def close(self, timeout=None):
+        """Stop the loops (cancelling their tasks) and join the threads"""
+        for thread in self.threads:
+            if thread.monitor is not None:
+                thread.monitor.stop()
+        for loop in self.loops:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(loop.stop)
+        for thread in self.threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.loops)
+
+
 if __name__ == "__main__":
 
     class A(threading.Thread, metaclass=Eli):
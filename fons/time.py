@@ -11,6 +11,7 @@ offsets = pd.tseries.offsets
 frequencies = pd.tseries.frequencies
 
 from collections import namedtuple
+import bisect
 import math
 import logging
 
@@ -416,6 +417,74 @@ def dt_synced(dto, freq, base=None, shift=0):
     return synced
 
 
+class SchedulePlan:
+    """Precomputed `dt_synced(dto, freq, base)` points for a fixed (freq, base).
+    The points are generated with pd.date_range `size` at a time and refilled
+    lazily whenever a lookup falls outside of them.
+    Only positive frequencies and datetime bases are supported."""
+
+    def __init__(self, freq, base, size=64):
+        offset = freq_to_offset(freq)
+        if not isinstance(base, dt):
+            raise TypeError(type(base))
+        if offset.n <= 0 or base + offset <= base:
+            raise ValueError("Frequency must be positive, got: {}".format(freq))
+        try:
+            freq_to_td(offset, coerce=False)
+            is_end = False
+        except ValueError:
+            name = offset.__class__.__name__
+            is_end = name.endswith("End") or offset.__class__ is offsets.Week
+
+        self.freq = offset
+        self.base = base
+        self.size = max(2, size)
+        # "End" offsets are synced to the next point (dt_synced rounds dto to day first),
+        # the rest to the previous one
+        self.is_end = is_end
+        self.points = []
+        self.refills = 0
+
+    def _fill(self, dto):
+        # starting one point earlier, so that the previous tick is still covered
+        anchor = dt_synced(dto, self.freq, self.base, shift=-1)
+        dtrange = pd.date_range(anchor, periods=self.size, freq=self.freq)
+        self.points = list(dtrange.to_pydatetime())
+        self.refills += 1
+
+    def synced(self, dto):
+        """Equivalent to `dt_synced(dto, self.freq, self.base)`"""
+        points = self.points
+        if self.is_end:
+            dto = dt_round_to_digit(dto, _TD_DAY)
+            if not points or not points[0] <= dto <= points[-1]:
+                self._fill(dto)
+                points = self.points
+            return points[bisect.bisect_left(points, dto)]
+
+        if not points or not points[0] <= dto < points[-1]:
+            self._fill(dto)
+            points = self.points
+        return points[bisect.bisect_right(points, dto) - 1]
+
+    def between(self, start, end):
+        """The number of points strictly between (synced) `start` and `end`"""
+        if end <= start:
+            return 0
+        points = self.points
+        if not points or not points[0] <= start or not end <= points[-1]:
+            points = list(pd.date_range(start, end, freq=self.freq).to_pydatetime())
+        return bisect.bisect_left(points, end) - bisect.bisect_right(points, start)
+
+    def shift(self, dto, n):
+        """The point `n` points away from (synced) `dto`"""
+        points = self.points
+        i = bisect.bisect_left(points, dto) + n
+        if points and points[0] <= dto <= points[-1] and 0 <= i < len(points):
+            return points[i]
+        return dt_synced(dto, self.freq, self.base, shift=n)
+
+
 def _dt_round_bh(dto, polarity=1, shift=0, **kw):
     normalize = kw.get("normalize", False)
     bh = offsets.BusinessHour(polarity)
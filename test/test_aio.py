@@ -1,7 +1,20 @@
 import pytest
 import asyncio
+import functools
+import threading
 
-from fons.aio import call_via_loop
+from fons.aio import (
+    call_via_loop,
+    call_via_loop_fast,
+    call_via_loop_fast_afut,
+    call_many_via_loop,
+    get_monitor,
+    lrc,
+    new_event_loop,
+    set_loop_factory,
+)
+from fons.event import Node
+from fons.threads import EliThread
 
 
 async def asyncfunc(arg, *, kw=1):
@@ -24,5 +37,199 @@ def test_call_via_loop():
         assert f.result(0.1)
 
 
+def test_call_via_loop_fast():
+    loop = asyncio.get_event_loop()
+    f = call_via_loop_fast(asyncfunc, (4,), {"kw": 2})
+    loop.run_until_complete(_afunc())
+    assert f.result(0.1) == 2
+
+    f = call_via_loop_fast(asyncfunc, (4,), {"kw": 0})
+    loop.run_until_complete(_afunc())
+    with pytest.raises(ZeroDivisionError):
+        assert f.result(0.1)
+
+    items = []
+    assert call_via_loop_fast(items.append, (1,), forget=True) is None
+    f = call_via_loop_fast_afut(items.append, (2,))
+    assert loop.run_until_complete(f) is None
+    assert items == [1, 2]
+
+    # Executed by a loop of another thread, result set in this loop
+    loop2 = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop2.run_forever, daemon=True)
+    thread.start()
+    f = call_via_loop_fast_afut(asyncfunc, (6,), {"kw": 3}, loop=loop2)
+    assert loop.run_until_complete(asyncio.wait_for(f, 1)) == 2
+    f = call_via_loop_fast_afut(divmod, (1, 0), loop=loop2)
+    with pytest.raises(ZeroDivisionError):
+        loop.run_until_complete(asyncio.wait_for(f, 1))
+    loop2.call_soon_threadsafe(loop2.stop)
+    thread.join()
+    loop2.close()
+
+
+def test_call_via_loop_fast_cancelled():
+    import concurrent.futures
+    import gc
+    import weakref
+
+    loop = asyncio.get_event_loop()
+
+    async def cancelled():
+        raise asyncio.CancelledError
+
+    f = call_via_loop_fast(cancelled)
+    f2 = call_via_loop_fast_afut(cancelled)
+    loop.run_until_complete(_afunc())
+    assert f.cancelled()
+    with pytest.raises(concurrent.futures.CancelledError):
+        f.result(0.1)
+    with pytest.raises(asyncio.CancelledError):
+        loop.run_until_complete(f2)
+
+    # the targets are not kept alive by the coroutine function cache
+    async def target():
+        return 1
+
+    assert loop.run_until_complete(call_via_loop_fast_afut(target)) == 1
+    ref = weakref.ref(target)
+    del target
+    gc.collect()
+    assert ref() is None
+
+
+def test_call_many_via_loop():
+    loop = asyncio.get_event_loop()
+    calls = []
+
+    def func(x):
+        calls.append(x)
+        return x
+
+    async def afunc(x, *, kw=1):
+        await asyncio.sleep(0)
+        return func(x / kw)
+
+    funcs_args = [
+        (func, (1,)),
+        (afunc, (4,), {"kw": 2}),
+        (func, (3,)),
+        functools.partial(func, 4),
+    ]
+    f = call_many_via_loop(funcs_args, module="asyncio")
+    assert loop.run_until_complete(f) == [1, 2, 3, 4]
+    assert calls == [1, 2, 3, 4]
+
+    futures = call_many_via_loop(
+        [(func, (5,)), (afunc, (1,), {"kw": 0}), (func, (6,))], aggregate=False
+    )
+    loop.run_until_complete(_afunc())
+    assert futures[0].result(0) == 5
+    with pytest.raises(ZeroDivisionError):
+        futures[1].result(0)
+    assert futures[2].result(0) == 6
+
+    f = call_many_via_loop([(func, (7,)), (divmod, (1, 0))])
+    loop.run_until_complete(_afunc())
+    with pytest.raises(ZeroDivisionError):
+        f.result(0)
+    assert calls[-1] == 7
+    assert call_many_via_loop([]).result(0) == []
+
+    # Executed by a loop of another thread, results set in this loop
+    loop2 = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop2.run_forever, daemon=True)
+    thread.start()
+    futures = call_many_via_loop(
+        [(func, (i,)) for i in range(100)],
+        module="asyncio",
+        loop=loop2,
+        aggregate=False,
+    )
+    results = loop.run_until_complete(asyncio.wait_for(asyncio.gather(*futures), 1))
+    assert results == list(range(100))
+    loop2.call_soon_threadsafe(loop2.stop)
+    thread.join()
+    loop2.close()
+
+
+def test_LoopMonitor():
+    import time
+
+    thread = EliThread(
+        target=lambda: asyncio.get_event_loop().run_forever(),
+        daemon=True,
+        monitor={"interval": 0.01, "threshold": 0.05},
+    )
+    loop = thread._loop
+    monitor = thread.monitor
+    assert get_monitor(loop) is monitor
+    thread.start()
+
+    def blocking_target(pk):
+        time.sleep(0.2)
+
+    node = Node(loop=loop)
+    node.add_handler(blocking_target)
+    node.serve()
+    time.sleep(0.05)
+    node.put("x")
+    time.sleep(0.35)
+
+    stats = monitor.get_stats()
+    assert stats["stalls"] == 1
+    assert stats["lag"]["max"] > 0.15
+    assert stats["lag"]["p50"] < 0.05
+    offender = stats["offenders"][0]
+    assert offender["duration"] > 0.15
+    assert offender["origin"].startswith("NodeHandler(id=0,")
+    assert "blocking_target" in offender["stack"][-1]
+
+    monitor.stop()
+    assert get_monitor(loop) is None
+    node.stop()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(1)
+
+
+def test_set_loop_factory():
+    created = []
+
+    class Loop(asyncio.SelectorEventLoop):
+        def __init__(self):
+            super().__init__()
+            created.append(self)
+
+    main_loop = asyncio.get_event_loop()
+    try:
+        assert set_loop_factory(Loop) is Loop
+        assert isinstance(new_event_loop(), Loop)
+        thread = EliThread(target=lambda: lrc(asyncio.sleep(0)))
+        thread.start()
+        thread.join(1)
+        assert isinstance(thread._loop, Loop)
+        assert isinstance(asyncio.new_event_loop(), Loop)
+        assert len(created) == 3
+        for loop in created:
+            loop.close()
+
+        try:
+            import uvloop
+        except ImportError:
+            uvloop = None
+        if uvloop is not None:
+            loop = set_loop_factory("auto")()
+            assert isinstance(loop, uvloop.Loop)
+            loop.close()
+    finally:
+        set_loop_factory(None)
+        asyncio.set_event_loop(main_loop)
+    assert type(new_event_loop()) is type(main_loop)
+
+
 if __name__ == "__main__":
     test_call_via_loop()
+    test_call_via_loop_fast()
+    test_call_many_via_loop()
+    test_LoopMonitor()
+    test_set_loop_factory()
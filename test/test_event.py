@@ -1,6 +1,23 @@
 import asyncio
+import threading
+import time
 
-from fons.event import Node
+import numpy as np
+import pandas as pd
+import pytest
+
+from fons.event import (
+    Node,
+    RelayPackage,
+    FrozenRelayPackage,
+    Station,
+    LoopBatcher,
+    SpillBuffer,
+    RemoteNode,
+    RelayBatch,
+    get_graph,
+    set_overflow,
+)
 
 loop = asyncio.get_event_loop()
 lrc = loop.run_until_complete
@@ -21,3 +38,449 @@ def test_node():
 
     pk3 = lrc(n3.recv())
     assert pk3.data == message
+
+
+def test_relay_package_copy():
+    pk = RelayPackage(1, channel=2)
+    pk2 = pk.copy(data=3)
+    assert (pk2.data, pk2.channel) == (3, 2)
+    with pytest.raises(TypeError):
+        pk.copy(unknown=1)
+
+    frozen = FrozenRelayPackage(1, channel=2)
+    with pytest.raises(AttributeError):
+        frozen.data = 3
+    copy = frozen.copy(current_handler=None)
+    assert type(copy) is RelayPackage
+    copy.data = 3
+
+
+def test_shared_handler():
+    n = Node()
+    n2 = Node()
+    n3 = Node()
+    n.connect(n2)
+    n.connect(n3)
+    received = []
+    n2.add_handler(lambda pk: received.append(pk), shared=True)
+    n2.add_handler(lambda pk: received.append(pk))
+    n2.add_handler(lambda pk: received.append(pk), shared=True)
+
+    n.relay("shared")
+    n2.handle(lrc(n2.recv()))
+    # The clients receive mutable packages
+    pk3 = n3.recv_nowait()
+    assert type(pk3) is RelayPackage
+    pk3.data = "changed"
+
+    shared, copy, shared2 = received
+    # The handlers that opted in share the same read-only package ...
+    assert shared is shared2
+    assert isinstance(shared, FrozenRelayPackage)
+    assert shared.data == "shared"
+    # ... the others get a copy of their own
+    assert type(copy) is RelayPackage
+    assert copy.data == "shared"
+    assert copy.current_handler is n2.handlers[1]
+
+
+def test_broadcast_items():
+    station = Station([{"channel": 0}, {"channel": 1}], loops=[loop])
+    q0 = station.add_queue(0, "a")[0]
+    q1 = station.add_queue(1, "a")[0]
+    q1b = station.add_queue(1, "b")[0]
+    e1 = station.add_event(1, "e")[0]
+
+    station.broadcast_items([(0, "x"), (1, "y"), (0, "z")])
+    assert [q0.get_nowait(), q0.get_nowait()] == ["x", "z"]
+    assert q1.get_nowait() == q1b.get_nowait() == "y"
+    assert not e1.is_set()
+
+    station.broadcast(1, "w")
+    assert q1.get_nowait() == "w"
+    assert e1.is_set()
+
+
+def test_station_routes():
+    loop2 = asyncio.new_event_loop()
+    station = Station([{"channel": 0}], loops=[loop, loop2])
+    assert station.get_loop_ids([loop2, loop]) == [1, 0]
+    assert station.get_loops([loop2, 0]) == [loop2, loop]
+
+    items = station.add(0, "a")
+    q2 = station.add_queue(0, "b", loops=[loop2])[1]
+    assert list(station._routes[0]) == [loop, loop2]
+
+    station.broadcast_multiple([{"_": 0, "put": 1}, {"_": 0, "put": 2, "op": "set"}])
+    for q in (items[0].queue, items[1].queue, q2):
+        assert [q.get_nowait(), q.get_nowait()] == [1, 2]
+    assert items[0].event.is_set() and items[1].event.is_set()
+
+    station.broadcast(0, op=False)
+    assert not items[0].event.is_set()
+    assert items[0].queue.empty() and q2.empty()
+    loop2.close()
+
+
+def test_station_unbound_receptor():
+    from fons.event import QueueTransmitter
+
+    # an asyncio.Queue has no loop until used, it would be fed from any thread
+    with pytest.raises(TypeError):
+        Station([{"channel": 0}], default_queue_cls=asyncio.Queue)
+    qt = QueueTransmitter()
+    with pytest.raises(TypeError):
+        qt += asyncio.Queue()
+    assert not qt._receptors
+
+
+@pytest.mark.parametrize("batch", [{"max_items": 10, "max_delay": 5}, {"max_delay": 0.01}])
+def test_station_batch(batch):
+    loop2 = asyncio.new_event_loop()
+    calls = []
+    call_soon_threadsafe = loop2.call_soon_threadsafe
+
+    def counting(*args):
+        calls.append(args)
+        return call_soon_threadsafe(*args)
+
+    loop2.call_soon_threadsafe = counting
+    thread = threading.Thread(target=loop2.run_forever, daemon=True)
+    thread.start()
+    try:
+        station = Station([{"channel": 0}, {"channel": 1}], loops=[loop2], batch=batch)
+        assert isinstance(station.batcher, LoopBatcher)
+        q0 = station.add_queue(0, "a")[0]
+        q1 = station.add_queue(1, "a")[0]
+        for i in range(100):
+            station.broadcast(i % 2, i)
+        deadline = time.time() + 5
+        while q0.qsize() + q1.qsize() < 100 and time.time() < deadline:
+            time.sleep(0.01)
+        assert [q0.get_nowait() for _ in range(50)] == list(range(0, 100, 2))
+        assert [q1.get_nowait() for _ in range(50)] == list(range(1, 100, 2))
+        assert len(calls) < 50
+    finally:
+        loop2.call_soon_threadsafe = call_soon_threadsafe
+        loop2.call_soon_threadsafe(loop2.stop)
+        thread.join()
+        loop2.close()
+
+
+@pytest.mark.parametrize(
+    "overflow, expected, undelivered",
+    [
+        ("drop_oldest", [2, 3], 2),
+        ("drop_newest", [0, 1], 2),
+        ({"policy": "coalesce", "key": lambda x: x % 2}, [2, 3], 0),
+        ({"policy": "spill", "spill_size": 1}, [0, 1, 2], 1),
+    ],
+)
+def test_overflow(overflow, expected, undelivered):
+    station = Station([{"channel": 0}], loops=[loop])
+    q = station.add_queue(0, "a", maxsize=2, overflow=overflow)[0]
+    for i in range(4):
+        station.broadcast(0, i)
+    stats = station.get_stats()[0]
+    assert stats["undelivered"] == undelivered
+    assert stats["depth"] == stats["max_depth"] == len(expected)
+    assert stats["slowest"] == (0, "a")
+    assert [lrc(q.get()) for _ in expected] == expected
+    assert station.get_stats()[0]["depth"] == 0
+
+
+async def _async_broadcast(station, channel, item):
+    station.broadcast(channel, item)
+
+
+def test_overflow_block():
+    loop2 = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop2.run_forever, daemon=True)
+    thread.start()
+    try:
+        station = Station([{"channel": 0}], loops=[loop2])
+        overflow = {"policy": "block", "timeout": 0.2}
+        q = station.add_queue(0, "a", maxsize=1, overflow=overflow)[0]
+        # the consumer signals the room
+        assert q.on_get is not None
+        with pytest.raises(TypeError):
+            set_overflow(asyncio.Queue(), "block")
+        station.broadcast(0, 1)
+        time.sleep(0.05)
+        loop2.call_soon_threadsafe(loop2.call_later, 0.05, q.get_nowait)
+        t0 = time.time()
+        station.broadcast(0, 2)
+        assert 0.04 < time.time() - t0 < 0.2
+        time.sleep(0.05)
+        station.broadcast(0, 3)
+        time.sleep(0.05)
+        stats = station.get_stats()[0]
+        assert stats["undelivered"] == 1
+        assert 0.2 < stats["blocked"] < 0.5
+        assert q.get_nowait() == 2
+
+        # a producer running a loop doesn't wait
+        station.broadcast(0, 4)
+        time.sleep(0.05)
+        t0 = time.time()
+        lrc(_async_broadcast(station, 0, 5))
+        assert time.time() - t0 < 0.1
+        time.sleep(0.05)
+        assert station.get_stats()[0]["undelivered"] == 2
+    finally:
+        loop2.call_soon_threadsafe(loop2.stop)
+        thread.join()
+        loop2.close()
+
+
+def test_spill_buffer():
+    node = Node()
+    buf = SpillBuffer(3)
+    pks = [FrozenRelayPackage({"x": i}, node, None, 0) for i in range(3)]
+    assert all(buf.append(pk) for pk in pks)
+    assert not buf.append(pks[0])
+    for i in range(3):
+        pk = buf.popleft()
+        assert isinstance(pk, FrozenRelayPackage)
+        assert pk.data == {"x": i} and pk.source is node
+    assert not len(buf) and not buf._refs
+    buf.close()
+
+
+def _create_doubler():
+    n = Node()
+    n.add_handler(lambda pk: pk.data * 2, 0)
+    return n
+
+
+def test_remote_node_serializer():
+    import pickle
+
+    class Unpicklable:
+        dumps = staticmethod(lambda x: pickle.dumps(x))
+        loads = staticmethod(lambda x: pickle.loads(x))
+
+    with pytest.raises(TypeError):
+        RemoteNode(_create_doubler, serializer=Unpicklable(), start=False)
+    # a module is imported by name in the new process
+    remote = RemoteNode(_create_doubler, serializer=pickle, start=False)
+    assert remote.process.serializer == "pickle"
+
+
+def test_remote_node():
+    n = Node()
+    collector = Node()
+    remote = RemoteNode(_create_doubler, batch_size=10)
+    n.connect(remote)
+    remote.connect(collector)
+
+    for i in range(25):
+        n.relay(i)
+    received = [lrc(asyncio.wait_for(collector.recv(), 10)) for _ in range(25)]
+    assert [pk.data for pk in received] == [i * 2 for i in range(25)]
+    assert all(pk.source is remote for pk in received)
+
+    remote.stop()
+    lrc(asyncio.wait_for(remote.futures["serve"], 5))
+    remote.join(5)
+    assert remote.process.exitcode == 0
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_coro_handler(ordered):
+    n = Node()
+    collector = Node()
+    n.connect(collector)
+    state = {"running": 0, "max_running": 0}
+
+    async def target(pk):
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        await asyncio.sleep(0.01 * (5 - pk.data))
+        state["running"] -= 1
+        return pk.data
+
+    n.add_handler(target, 0, type="coro", max_in_flight=3, ordered=ordered)
+    n.serve()
+    for i in range(5):
+        n.put_nowait(i)
+    received = [lrc(asyncio.wait_for(collector.recv(), 5)).data for _ in range(5)]
+    assert state["max_running"] == 3
+    if ordered:
+        assert received == [0, 1, 2, 3, 4]
+    else:
+        assert received[0] == 2 and sorted(received) == [0, 1, 2, 3, 4]
+    n.stop()
+    lrc(asyncio.wait_for(n.futures["serve"], 5))
+
+
+def test_executor_handler():
+    n = Node()
+    collector = Node()
+    n.connect(collector)
+    threads = set()
+
+    def target(pk):
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return pk.data * 2
+
+    n.add_handler(target, 0, type="executor", max_in_flight=4)
+    n.serve()
+    for i in range(8):
+        n.put_nowait(i)
+    received = [lrc(asyncio.wait_for(collector.recv(), 5)).data for _ in range(8)]
+    assert received == [i * 2 for i in range(8)]
+    assert threading.get_ident() not in threads and len(threads) > 1
+    n.stop()
+    lrc(asyncio.wait_for(n.futures["serve"], 5))
+
+
+def test_dispatch_error():
+    from concurrent.futures import ThreadPoolExecutor
+
+    n = Node()
+    collector = Node()
+    n.connect(collector)
+    with pytest.raises(TypeError):
+        n.add_handler(lambda pk: pk.data, 0, type="coro")
+
+    # the calls fail to start, the dispatcher survives and frees their slots
+    executor = ThreadPoolExecutor(1)
+    executor.shutdown()
+    handler = n.add_handler(
+        lambda pk: pk.data, 0, type="executor", executor=executor, max_in_flight=1
+    )
+    n.serve()
+    n.put_nowait(1)
+    n.put_nowait(2)
+    lrc(asyncio.sleep(0.05))
+    handler.executor = None
+    n.put_nowait(3)
+    assert lrc(asyncio.wait_for(collector.recv(), 5)).data == 3
+    n.stop()
+    lrc(asyncio.wait_for(n.futures["serve"], 5))
+
+
+@pytest.mark.parametrize("kind", ["array", "frame", "list"])
+def test_relay_batch(kind):
+    records = [{"price": 1.0, "size": 2}, {"price": 2.0, "size": 3}]
+    if kind == "array":
+        batch = RelayBatch.from_records(records, [("price", "f8"), ("size", "i8")])
+    elif kind == "frame":
+        batch = RelayBatch(pd.DataFrame(records))
+    else:
+        batch = RelayBatch.from_records(records)
+    assert len(batch) == 2
+    assert isinstance(RelayBatch.concat([batch, batch]).data, type(batch.data))
+    assert list(RelayBatch.concat([batch, batch]).to_frame()["size"]) == [2, 3, 2, 3]
+
+    n = Node()
+    n2 = Node()
+    n.connect(n2)
+    received = {"batch": [], "record": []}
+    n2.add_handler(lambda pk: received["batch"].append(pk.data), batch_aware=True)
+    n2.add_handler(lambda pk: received["record"].append(pk.data))
+    n.relay(batch)
+    n2.handle(lrc(n2.recv()))
+
+    assert received["batch"] == [batch]
+    assert [r["price"] * r["size"] for r in received["record"]] == [2.0, 6.0]
+    assert (batch.to_frame()["price"] * batch.to_frame()["size"]).sum() == 8.0
+
+
+def test_relay_batch_forwarded():
+    # n2 has no handlers, its root handler forwards the batch to n3 as is
+    n = Node()
+    n2 = Node()
+    n3 = Node()
+    n.connect(n2)
+    n2.connect(n3)
+    batch = RelayBatch.from_records([{"x": 1}, {"x": 2}])
+    n.relay(batch)
+    n2.handle(lrc(n2.recv()))
+
+    pk = lrc(n3.recv())
+    assert pk.data is batch
+    assert n3._queue.empty()
+
+
+def test_station_remove():
+    loop2 = asyncio.new_event_loop()
+    station = Station([{"channel": 0}, {"channel": 1}], loops=[loop, loop2])
+    station.add_many([{"channel": 0, "id": "a"}, {"channel": 1, "id": "a"}])
+    station.add(0, "b")
+    assert station.get_channels("a") == {0: {0, 1}, 1: {0, 1}}
+
+    station.remove(0, "a", loops=[loop2])
+    assert station.get_channels("a") == {0: {0}, 1: {0, 1}}
+    station.remove_many([(0, "a"), (1, "a"), (1, "missing")])
+    assert station.get_channels("a") == {}
+    assert list(station.get(0, loop)) == ["b"]
+    assert len(station.qtransmitters[0]._receptors) == 2
+    assert not station._routes[1]
+
+    station.broadcast(0, 1)
+    assert station.get_queue(0, "b", loop).get_nowait() == 1
+    loop2.close()
+
+
+def test_node_disconnect():
+    n = Node()
+    clients = [Node() for _ in range(3)]
+    for client in clients:
+        n.connect(client, 1)
+    n.ungroup(1, clients[0])
+    n.disconnect(clients[1])
+    assert not n.has_client(clients[1])
+    assert not n.station.get_channels(clients[1].id)
+
+    n.relay("x", 1)
+    assert clients[0].empty() and clients[1].empty()
+    assert lrc(clients[2].recv()).data == "x"
+
+
+def test_trace():
+    source = Node(trace=True, name="source")
+    middle = Node(trace=True, name="middle")
+    sink = Node(trace=True, name="sink")
+    untraced = Node(name="untraced")
+    source.connect(middle)
+    middle.connect(sink)
+    middle.connect(untraced)
+    middle.group(1, sink)
+
+    def work(pk):
+        time.sleep(0.002)
+        return pk.data + 1
+
+    handler = middle.add_handler(work, 0, id="work")
+    middle.serve()
+    for i in range(10):
+        source.relay(i)
+    pks = [lrc(asyncio.wait_for(sink.recv(), 5)) for _ in range(10)]
+    assert [pk.data for pk in pks] == list(range(1, 11))
+    trace = pks[0].trace
+    assert trace.path == ((source.id, None), (middle.id, "work"))
+    assert trace.origin < trace.sent
+
+    graph = get_graph(source)
+    assert set(graph) == {"source", "middle", "sink", "untraced"}
+    assert graph["source"]["clients"] == ["middle"]
+    assert graph["middle"]["groups"] == {1: ["sink"]}
+    assert graph["middle"]["latency"]["wait"]["count"] == 10
+    exec_time = graph["middle"]["handlers"]["work"]["latency"]["exec"]
+    assert exec_time["count"] == 10 and exec_time["p50"] >= 0.002
+    assert graph["untraced"]["latency"] is None
+    assert handler.latency is not None and untraced.latency is None
+
+    middle.stop()
+    lrc(asyncio.wait_for(middle.futures["serve"], 5))
+
+
+def test_trace_disabled():
+    n = Node()
+    n2 = Node()
+    n.connect(n2)
+    n.relay(1)
+    assert lrc(n2.recv()).trace is None
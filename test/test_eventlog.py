@@ -0,0 +1,77 @@
+import asyncio
+import os
+import threading
+
+from fons.event import Node, Station
+from fons.eventlog import EventLog
+
+loop = asyncio.get_event_loop()
+lrc = loop.run_until_complete
+
+
+def test_eventlog(tmpdir):
+    path = str(tmpdir.join("log"))
+    log = EventLog(path, segment_size=300, index_interval=0)
+    station = Station([{"channel": 0}, {"channel": "x"}], loops=[loop])
+    station.add_sink(log)
+    for i in range(50):
+        station.broadcast_items([(0, {"i": i}), ("x", i)])
+    log.close()
+    assert len(log.segments()) > 5
+    assert all(os.path.exists(x[:-4] + ".idx") for x in log.segments())
+
+    log = EventLog(path)
+    items = list(log.read())
+    assert len(items) == 100
+    assert [ts for ts, _, _ in items] == sorted(ts for ts, _, _ in items)
+    assert [data for _, channel, data in items if channel == "x"] == list(range(50))
+
+    start, end = items[40][0], items[59][0]
+    ranged = list(log.read(start, end, channels=[0]))
+    expected = [x for x in items if start <= x[0] <= end and x[1] == 0]
+    assert ranged == expected and ranged
+
+
+def test_eventlog_replay(tmpdir):
+    log = EventLog(str(tmpdir.join("log")))
+    for i in range(10):
+        log.write(0, i, ts=100 + i * 0.01)
+        if i == 4:
+            log.write(1, "other", ts=100.045)
+
+    node = Node()
+    assert lrc(log.replay(node, channels=[0])) == 10
+    pks = [node.recv_nowait() for _ in range(10)]
+    assert [pk.data for pk in pks] == list(range(10))
+    assert node.empty()
+
+    t0 = loop.time()
+    assert lrc(log.replay(node, 100.015, 100.065, speed=2)) == 6
+    assert 0.015 < loop.time() - t0 < 0.2
+    log.close()
+
+
+def test_eventlog_concurrent_writes(tmpdir):
+    log = EventLog(str(tmpdir.join("log")), index_interval=0)
+
+    def write(k):
+        for i in range(500):
+            log.write(k, i)
+
+    threads = [threading.Thread(target=write, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # the frames are in order of time, thus no frame is skipped by the index
+    items = list(log.read())
+    assert len(items) == 2000
+    assert [ts for ts, _, _ in items] == sorted(ts for ts, _, _ in items)
+    start, end = items[700][0], items[1300][0]
+    expected = [x for x in items if start <= x[0] <= end]
+    assert list(log.read(start, end)) == expected
+
+    # a decreasing ts is raised to the previous one
+    log.write(0, "late", ts=items[0][0])
+    assert list(log.read())[-1] == (items[-1][0], 0, "late")
+    log.close()
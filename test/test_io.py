@@ -214,3 +214,28 @@ def test_update_settings_modified_time():
 
     _verify(d, SETTINGS_PATH)
     _verify(d, SETTINGS_TEST3_PATH)
+
+
+def test_write_atomic_threads(tmp_path):
+    import threading
+
+    path = str(tmp_path / "atomic.txt")
+    errors = []
+
+    def write(i):
+        try:
+            for _ in range(50):
+                io.write_atomic(path, str(i) * 100)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    with open(path) as f:
+        text = f.read()
+    assert len(set(text)) == 1 and len(text) == 100
+    assert os.listdir(str(tmp_path)) == ["atomic.txt"]
@@ -7,6 +7,9 @@ import datetime
 dt = datetime.datetime
 td = datetime.timedelta
 import time
+import threading
+import json
+import os
 import logging
 
 from fons.log import quick_logging
@@ -24,6 +27,9 @@ from fons.sched import (
     QuitException,
     TerminatedException,
     AllTerminated,
+    TickerMetrics,
+    ShardedTickManager,
+    TickerException,
 )
 import fons.time as fontime
 
@@ -150,6 +156,53 @@ def test_ticker_thread():
         t.tick()
 
 
+def test_ticker_backend():
+    t = Ticker(lambda: 2, interval=0, name="ThreadBackendTicker")
+    assert t._inf["backend"] == "thread"
+    assert isinstance(t._hidden["updated"], threading.Event)
+
+    t2 = Ticker(lambda: 2, interval=0, backend="process")
+    assert t2._hidden["updated"].__class__.__module__.startswith("multiprocessing")
+
+    with pytest.raises(ValueError):
+        Ticker(lambda: 2, interval=0, backend="async")
+
+    # state dicts are not shared between instances
+    t.kwargs["x"] = 1
+    assert t2.kwargs == {}
+    assert t._ui["entries"] is not t2._ui["entries"]
+
+
+def _increment(counter):
+    with counter.get_lock():
+        counter.value += 1
+
+
+def test_tick_manager_process_close_sub():
+    import multiprocessing as mp
+
+    c1, c2 = mp.Value("i", 0), mp.Value("i", 0)
+    t1 = Ticker(_increment, interval=0.02, args=(c1,), name="ProcessSub1")
+    t2 = Ticker(_increment, interval=0.02, args=(c2,), name="ProcessSub2")
+    tm = TickManager([t1, t2])
+    p = tm.start_process()
+    assert t1._inf["backend"] == t2._inf["backend"] == "process"
+    try:
+        time.sleep(0.5)
+        assert c1.value > 0 and c2.value > 0
+        # closed in the parent, seen by the child
+        t1.close()
+        time.sleep(0.2)
+        v1, v2 = c1.value, c2.value
+        time.sleep(0.4)
+        assert c1.value == v1
+        assert c2.value > v2
+    finally:
+        tm.close()
+        p.join(5)
+    assert not p.is_alive()
+
+
 def test_synced():
     at = Ticker(interval="1T", sync="1T")
     synced = at._synced(dt(2018, 8, 4, 2, 5, 15, 1))
@@ -160,6 +213,61 @@ def test_synced():
     assert int(at.get_time_remaining()) == 60 - dt.utcnow().second - 1
 
 
+@pytest.mark.parametrize(
+    "interval,sync,delay",
+    [
+        ("1T", dt(2018, 8, 4, 2, 5, 15, 1), None),
+        (7.5, dt(2020, 1, 1, 0, 0, 0, 123456), 2),
+        ("3H", dt(2021, 5, 5, 1), "5T"),
+    ],
+)
+def test_synced_fast_path(interval, sync, delay):
+    t = Ticker(interval=interval, sync=sync, delay=delay)
+    assert t._inf["fast"] is not None
+    ofs_interval = fontime.freq_to_offset(interval)
+    ofs_delay = t._ui["delay"]
+    for x in (dt(2018, 8, 4, 2, 5, 15, 1), dt(2022, 2, 2, 22, 22, 22, 222222)):
+        assert t._synced(x) == fontime.dt_synced(x - ofs_delay, ofs_interval, sync)
+
+    t.tick()
+    assert isinstance(t._ui["ticks"][0], float)
+    assert isinstance(t.records[0][0], dt)
+    assert t.entries[0] == fontime.dt_synced(
+        t.records[0][0] - ofs_delay, ofs_interval, sync
+    )
+
+
+def test_clock_follows_wall_clock_step(monkeypatch):
+    import fons.sched
+
+    assert abs(fons.sched._clock() - time.time()) < 0.1
+    # e.g. an NTP step or a resume from suspend
+    stepped = time.time() + 3600
+    monkeypatch.setattr(fons.sched._time, "time", lambda: stepped)
+    assert abs(fons.sched._clock() - stepped) < 0.1
+    assert abs(fons.sched._dt_to_ts(fons.sched._utcnow()) - stepped) < 0.1
+
+
+def test_calendar_interval_uses_offsets():
+    t = Ticker(interval="MS", sync="1D")
+    assert t._inf["fast"] is None
+    t.interval = 60
+    assert t._inf["fast"] == {"interval": 60.0, "delay": 0.0}
+
+
+def test_calendar_interval_plan():
+    t = Ticker(interval="B", sync=dt(2020, 1, 1), delay=td(hours=2))
+    now = dt(2022, 1, 5, 1)
+    expected = fontime.dt_synced(now - td(hours=2), "B", dt(2020, 1, 1))
+    assert t._synced(now) == expected
+    plan = t._inf["plan"]["plan"]
+    assert plan is not None and t._synced(now) == expected
+    assert t._inf["plan"]["plan"] is plan
+    t.interval = "MS"
+    assert t._synced(now) == dt(2022, 1, 1)
+    assert t._inf["plan"]["plan"] is not plan
+
+
 # ------------------------------------------
 
 
@@ -262,6 +370,260 @@ def test_tick_manager():
         tm.tick()
 
 
+def test_tick_manager_timer_heap():
+    tickers = [
+        Ticker(lambda: None, interval=10, lock=10 - i, name="HeapTicker-{}".format(i))
+        for i in range(5)
+    ]
+    tm = TickManager(tickers)
+    assert tm._peek_timer()[0] is tickers[-1]
+
+    # rescheduling lazily invalidates the previous heap entry
+    tickers[2].lock = 0.5
+    assert tm._peek_timer()[0] is tickers[2]
+    assert len(tm._heap) == 6
+
+    tickers[2].close()
+    assert tm._peek_timer()[0] is tickers[-1]
+    tm._remove_terminated()
+    assert tickers[2] not in tm._tickers["open"]
+    assert tickers[2] not in tm._timer
+
+    for t in tickers:
+        t.close()
+    tm._remove_terminated()
+    with pytest.raises(AllTerminated):
+        tm.get_earliest()
+
+
+async def async_tick_manager_heap_bounded():
+    tickers = [AsyncTicker(lambda: None, interval=0.001) for i in range(20)]
+    tm = AsyncTickManager(tickers, loop=loop)
+    fut = asyncio.ensure_future(tm.loop())
+    await asyncio.sleep(0.3)
+    await tm.close()
+    await fut
+
+    assert sum(t.counter for t in tickers) > 200
+    assert len(tm._heap_entries) <= 20
+    assert len(tm._heap) <= 2 * len(tm._heap_entries) + 16
+
+
+def test_tick_manager_heap_bounded():
+    loop.run_until_complete(async_tick_manager_heap_bounded())
+
+
+def test_tick_manager_coalesce():
+    calls = []
+    tickers = [
+        Ticker(calls.append, interval=0.05, sync="1T", args=(i,)) for i in range(10)
+    ]
+    tm = TickManager(tickers, coalesce=0.01)
+    tm.tick(errors="sleep")
+    assert sorted(calls) == list(range(10))
+    tm.tick(errors="sleep")
+    assert len(calls) == 20
+    assert not tm._in_flight
+    assert len(tm._heap_entries) == 10
+
+
+def test_ticker_metrics():
+    exported = []
+    shared = TickerMetrics("shared", sink=exported.append, export_every=2)
+    t = Ticker(lambda: time.sleep(0.02), interval=0.05, sync="1T", metrics=True)
+    t2 = Ticker(interval=0.05, sync="1T", metrics=shared)
+    t3 = Ticker(interval=0.05, sync="1T", metrics=shared)
+    assert Ticker(interval=1).metrics is None
+
+    t.tick()
+    assert t.tick(errors="hide") is None
+    t.tick(errors="sleep")
+    m = t.get_metrics()
+    assert m["ticks"] == 2 and m["skipped"] == 1
+    assert m["duration"]["count"] == 2
+    assert 0.015 < m["duration"]["p50"] < 0.05
+    assert m["lag"]["count"] == 2 and m["lag"]["max"] < 0.05
+    assert m["overshoot"]["count"] >= 1
+
+    t2.tick()
+    t3.tick()
+    assert len(exported) == 1 and exported[0]["ticks"] == 2
+
+    tm = TickManager([t, t2, t3])
+    total = tm.get_metrics(aggregate=True)
+    assert total["ticks"] == 4 and total["skipped"] == 1
+    assert total["duration"]["count"] == 4
+    assert tm.get_metrics() is None
+
+
+@pytest.mark.parametrize("misfire", ["coalesce", "catchup", "skip"])
+def test_misfire(misfire):
+    calls = []
+    payloads = []
+    t = Ticker(
+        calls.append,
+        interval=0.1,
+        sync="1T",
+        args=(1,),
+        callback=payloads.append,
+        misfire=misfire,
+        misfire_budget=2,
+    )
+    t.tick(errors="sleep")
+    assert payloads[-1]["missed"] == 0
+    time.sleep(0.45)
+
+    t.tick()
+    assert 3 <= t.missed <= 4
+    assert payloads[-1]["missed"] == t.missed
+    if misfire == "catchup":
+        # 2 more (the budget), then caught up
+        t.tick()
+        assert t.missed == 1
+        t.tick()
+        assert t.missed == 0
+        assert len(calls) == 4
+    elif misfire == "skip":
+        assert len(calls) == 1
+    else:
+        assert len(calls) == 2
+    with pytest.raises(WaitException):
+        t.tick()
+
+
+async def async_tick_manager_coalesce():
+    running = {"now": 0, "max": 0}
+
+    async def f():
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+
+    tickers = [AsyncTicker(f, interval=0.05, sync="1T") for i in range(12)]
+    tm = AsyncTickManager(tickers, loop=loop, coalesce=0.01, max_concurrent=3)
+    fut = asyncio.ensure_future(tm.loop())
+    await asyncio.sleep(0.2)
+    await tm.close()
+    await asyncio.sleep(0.02)
+
+    assert running["max"] == 3
+    assert all(t.counter >= 1 for t in tickers)
+    assert fut.done()
+
+
+def test_async_tick_manager_coalesce():
+    loop.run_until_complete(async_tick_manager_coalesce())
+
+
+async def async_tick_manager_errors(coalesce):
+    def callback(x):
+        raise ValueError("callback failed")
+
+    tickers = [AsyncTicker(lambda: 1, interval=0.02) for i in range(3)]
+    tm = AsyncTickManager(tickers, loop=loop, coalesce=coalesce, callback=callback)
+    fut = asyncio.ensure_future(tm.loop())
+    await asyncio.sleep(0.15)
+    await tm.close()
+    await asyncio.sleep(0.05)
+
+    # the errors are logged, and the ticking goes on
+    assert all(t.counter >= 2 for t in tickers)
+    assert not tm._hidden["tasks"]
+    assert fut.done()
+
+
+def test_async_tick_manager_callback_payload():
+    payloads = []
+    ticker = AsyncTicker(lambda: 1, interval=0.02, callback=payloads.append)
+    tm = AsyncTickManager([ticker], loop=loop, callback=payloads.append)
+
+    async def run():
+        fut = asyncio.ensure_future(tm.loop())
+        await asyncio.sleep(0.05)
+        await tm.close()
+        await asyncio.sleep(0.02)
+
+    loop.run_until_complete(run())
+    # the same keys from the ticker and the manager
+    assert {p["ticker"] for p in payloads} == {ticker, tm}
+    assert len({tuple(sorted(p)) for p in payloads}) == 1
+    assert "missed" in payloads[0]
+
+
+@pytest.mark.parametrize("coalesce", [None, 0.01])
+def test_async_tick_manager_errors(coalesce, caplog):
+    loop.run_until_complete(async_tick_manager_errors(coalesce))
+    assert "callback failed" in caplog.text
+
+
+def blocking_target(x):
+    time.sleep(0.05)
+    return x
+
+
+def quitting_target(x):
+    raise QuitException(x)
+
+
+def waiting_target():
+    raise WaitException(7)
+
+
+async def async_ticker_executor():
+    running = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def target():
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+
+    heartbeats = []
+
+    async def heartbeat():
+        heartbeats.append(time.time())
+
+    tickers = [AsyncTicker(target, interval=0.1, executor="thread") for i in range(4)]
+    hb = AsyncTicker(heartbeat, interval=0.01)
+    tm = AsyncTickManager(
+        tickers + [hb],
+        loop=loop,
+        executors={"thread": 4},
+        executor_limits={"thread": 2},
+    )
+    fut = asyncio.ensure_future(tm.loop())
+    await asyncio.sleep(0.25)
+    await tm.close()
+    await asyncio.sleep(0.02)
+
+    assert running["max"] == 2
+    assert all(t.counter >= 1 for t in tickers)
+    # the blocking targets did not stall the loop
+    assert len(heartbeats) >= 10
+    assert not tm._hidden["executors"]
+
+    # not added to a manager
+    t = AsyncTicker(blocking_target, args=(3,), executor="process")
+    assert await t.tick() == 3
+    t = AsyncTicker(quitting_target, args=(4,), executor="process")
+    assert await t.tick() == 4
+    assert t._closed
+    t = AsyncTicker(waiting_target, executor="process")
+    with pytest.raises(WaitException) as e:
+        await t.tick()
+    assert e.value.wait_time == 7
+
+
+def test_async_ticker_executor():
+    loop.run_until_complete(async_ticker_executor())
+    with pytest.raises(ValueError):
+        AsyncTicker(blocking_target, executor="fork")
+
+
 # ------------------------------------------
 
 
@@ -421,6 +783,130 @@ def test_routine():
     assert rout.get_event("r2").is_set()
 
 
+def test_ticker_state():
+    t = Ticker(interval=0.05, sync="1T", lock=0.01)
+    t.tick(errors="sleep")
+    t.tick(errors="sleep")
+    state = json.loads(json.dumps(t.get_state()))
+
+    t2 = Ticker(interval=0.05, sync="1T")
+    t2.set_state(state)
+    assert t2.counter == 2
+    assert list(t2.entries) == list(t.entries)
+    assert t2.lock == t.lock
+    assert t2.get_state() == t.get_state()
+    assert abs(t2.get_time_remaining() - t.get_time_remaining()) < 0.01
+    with pytest.raises(WaitException):
+        t2.tick()
+
+
+def test_routine_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    calls = []
+
+    def make():
+        sched = {"r1": {"target": calls.append, "args": (1,), "interval": 0.05}}
+        return Routine(sched, checkpoint={"path": path, "interval": 0})
+
+    async def run(rout, secs):
+        fut = asyncio.ensure_future(rout.start())
+        await asyncio.sleep(secs)
+        await rout.close()
+        await asyncio.sleep(0.02)
+
+    rout = make()
+    # a cold start
+    assert rout.load_checkpoint() is None
+    loop.run_until_complete(run(rout, 0.12))
+    counter = rout.get_ticker("r1").counter
+    assert counter == len(calls) >= 2
+    with open(path) as f:
+        assert json.load(f) == rout.get_state()
+    # nothing has changed
+    assert not rout.save_checkpoint(force=True)
+
+    rout2 = make()
+    rout2.create_schedule()
+    t2 = rout2.get_ticker("r1")
+    assert t2.counter == counter
+    assert t2.get_state() == rout.get_ticker("r1").get_state()
+    loop.run_until_complete(run(rout2, 0.03))
+    # resumed mid-interval, instead of ticking right away
+    assert len(calls) <= counter + 1
+
+
+def test_set_state_sync_changed():
+    t = Ticker(lambda: 1, interval="1T", sync="1T")
+    t.tick()
+    state = t.get_state()
+
+    # a sync derived from the same param is restored
+    t2 = Ticker(lambda: 1, interval="1T", sync="1T")
+    t2.set_state(state)
+    assert t2._ui["sync"] == t._ui["sync"] and t2.counter == t.counter
+
+    # a changed one is not
+    sync = dt(2020, 1, 1, 0, 0, 30)
+    t3 = Ticker(lambda: 1, interval="1T", sync=sync)
+    t3.set_state(state)
+    assert t3._ui["sync"] == sync and t3.counter == t.counter
+
+
+def shard_target():
+    return os.getpid()
+
+
+def test_sharded_tick_manager():
+    stm = ShardedTickManager(2, tickmgr={"coalesce": 0.005})
+    try:
+        for i in range(6):
+            stm.add_ticker(i, {"target": shard_target, "interval": 0.02})
+        stm.add_ticker("x", {"target": shard_target, "interval": 0.02}, shard=1)
+        assert stm.get_shard("x") == 1
+        with pytest.raises(TickerException):
+            stm.add_ticker("y", {"target": None, "interval": "nonsense"})
+        time.sleep(0.3)
+
+        stats = stm.get_stats()
+        pids = {s["pid"] for s in stats.values()}
+        assert len(pids) == 2 and os.getpid() not in pids
+        assert sum(len(s["tickers"]) for s in stats.values()) == 7
+        assert all(s["ticks"] > 0 and s["lag"] is not None for s in stats.values())
+        # full metrics only if enabled
+        assert stats[1]["tickers"]["x"]["metrics"] is None
+
+        counter = stats[1]["tickers"]["x"]["ticks"]
+        stm.move_ticker("x", 0)
+        assert stm.get_shard("x") == 0
+        stats = stm.get_stats()
+        assert "x" in stats[0]["tickers"] and "x" not in stats[1]["tickers"]
+
+        state = stm.remove_ticker("x")
+        assert state["counter"] >= counter
+        assert stm.rebalance() is None
+    finally:
+        stm.close()
+    assert all(not s["process"].is_alive() for s in stm._shards)
+
+
+def blocking_shard_target():
+    time.sleep(0.03)
+
+
+def test_sharded_tick_manager_rebalance():
+    stm = ShardedTickManager(2, lag_threshold=0.01)
+    try:
+        for i in range(3):
+            spec = {"target": blocking_shard_target, "interval": 0.02}
+            stm.add_ticker(i, spec, shard=0)
+        stm.add_ticker("light", {"target": shard_target, "interval": 0.02}, shard=1)
+        time.sleep(0.4)
+        key, src, dst = stm.rebalance()
+        assert (src, dst) == (0, 1) and stm.get_shard(key) == 1
+    finally:
+        stm.close()
+
+
 # def test_asynctickmgr_with_nonasynctickers():
 
 
@@ -26,3 +26,57 @@ def test_EliThread_keepalive():
     assert counter["i"] == 4
     assert dt.utcnow() - started > td(seconds=0.04)
     assert not t.is_alive()
+
+
+def test_LoopPool():
+    import asyncio
+    import time
+    from fons.event import Station
+    from fons.sched import AsyncTicker
+    from fons.threads import LoopPool
+
+    with LoopPool(2, interval=0.05) as pool:
+        assert len(pool) == 2
+        nodes = [pool.add_node() for _ in range(4)]
+        assert [node.loop for node in nodes] == pool.loops * 2
+        assert all(node.is_running() for node in nodes)
+
+        received = []
+        nodes[0].connect(nodes[1])
+        nodes[1].add_handler(lambda pk: received.append(pk.data))
+        nodes[0].put("x")
+        time.sleep(0.05)
+        assert received == ["x"]
+
+        async def get_loop():
+            return asyncio.get_event_loop()
+
+        assert pool.submit(get_loop(), 1).result(1) is pool.loops[1]
+        assert pool.submit(get_loop, pool.loops[0]).result(1) is pool.loops[0]
+        loop = pool.get_loop("feed")
+        assert pool.submit(get_loop(), "feed").result(1) is loop
+
+        station = Station([{"channel": 0}])
+        items = pool.add_receptor(station, 0, "r", affinity="feed")
+        queue = list(items.values())[0].queue
+        assert queue._loop is loop
+        station.broadcast(0, "y")
+        assert pool.submit(queue.get(), loop).result(1) == "y"
+
+        ticks = []
+        ticker = AsyncTicker(lambda: ticks.append(1), interval=0.01, loop=loop)
+        tickmgr = pool.add_tickmanager([ticker], affinity="feed")
+        time.sleep(0.1)
+        assert ticks
+        pool.submit(tickmgr.close(), loop).result(1)
+        pool.futures[tickmgr.name].result(1)
+
+        # A busy loop is avoided
+        pool.submit(lambda: time.sleep(0.1), 0)
+        time.sleep(0.1)
+        stats = pool.get_stats()
+        assert stats[0]["utilization"] > stats[1]["utilization"]
+        assert pool.add_node().loop is pool.loops[1]
+
+    assert not any(thread.is_alive() for thread in pool.threads)
+    assert all(loop.is_closed() for loop in pool.loops)
@@ -113,3 +113,31 @@ negative += negative2 + negative3 + negative4
 @pytest.mark.parametrize("date,freq,base,expected", negative)
 def test_dt_round_negative(date, freq, base, expected):
     assert time.dt_round(date, freq, base) == expected
+
+
+@pytest.mark.parametrize("freq", ["MS", "2MS", "QS", "M", "BM", "W", "W-MON", "B", "BH", "3BH"])
+@pytest.mark.parametrize("base", [dt(2019, 3, 5, 10, 30), dt(2021, 6, 7, 13, 15, 2)])
+def test_schedule_plan(freq, base):
+    plan = time.SchedulePlan(freq, base, size=16)
+    start = dt(2022, 1, 3, 11)
+    for i in range(200):
+        date = start + td(hours=7 * i, minutes=13 * i)
+        assert plan.synced(date) == time.dt_synced(date, freq, base)
+    assert plan.refills < 200
+
+
+@pytest.mark.parametrize("freq", ["MS", "M", "B", "BH"])
+def test_schedule_plan_between(freq):
+    base = dt(2019, 3, 5, 10, 30)
+    plan = time.SchedulePlan(freq, base, size=8)
+    start = plan.synced(dt(2022, 1, 3, 11))
+    for n in (0, 1, 5, 20):
+        end = plan.shift(start, n + 1)
+        assert end == time.dt_synced(start, freq, base, shift=n + 1)
+        assert plan.between(start, end) == n
+        assert plan.shift(end, -(n + 1)) == start
+
+
+def test_schedule_plan_negative():
+    with pytest.raises(ValueError):
+        time.SchedulePlan("-1MS", dt(2020, 1, 1))
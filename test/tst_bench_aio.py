@@ -0,0 +1,111 @@
+"""Benchmarks of fons.aio (not collected by pytest, run it directly)
+    python test/tst_bench_aio.py
+"""
+import asyncio
+import threading
+import time
+import warnings
+
+from fons.aio import (
+    call_via_loop,
+    call_via_loop_afut,
+    call_via_loop_fast,
+    call_many_via_loop,
+)
+
+N = 20000
+
+loop = asyncio.new_event_loop()
+asyncio.set_event_loop(loop)
+
+
+def func(x):
+    return x
+
+
+async def afunc(x):
+    return x
+
+
+def _bench(call, f, target=loop, n=N):
+    """us per call, including the execution"""
+    t0 = time.perf_counter()
+    for i in range(n):
+        call(f, i)
+    # Executed after all the previous calls (and their tasks) are done
+    sentinel = call_via_loop_fast(afunc, (0,), loop=target)
+    if target is loop:
+        while not sentinel.done():
+            loop.run_until_complete(asyncio.sleep(0))
+    sentinel.result(10)
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def bench_same_loop():
+    print("call_via_loop into the current loop (us per call)")
+    calls = {
+        "call_via_loop": lambda f, x: call_via_loop(f, (x,)),
+        "fast": lambda f, x: call_via_loop_fast(f, (x,)),
+        "fast (forget)": lambda f, x: call_via_loop_fast(f, (x,), forget=True),
+    }
+    for f in (func, afunc):
+        for name, call in calls.items():
+            us = _bench(call, f)
+            print("  {:<6} {:<14} {:8.2f}".format(f.__name__, name, us))
+
+
+def bench_cross_thread():
+    print("call_via_loop_afut into a loop of another thread (us per call)")
+    loop2 = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop2.run_forever, daemon=True)
+    thread.start()
+    calls = {
+        "call_via_loop_afut": lambda f, x: call_via_loop_afut(f, (x,), loop=loop2),
+        "fast": lambda f, x: call_via_loop_fast(
+            f, (x,), module="asyncio", loop=loop2
+        ),
+        "fast (forget)": lambda f, x: call_via_loop_fast(
+            f, (x,), loop=loop2, forget=True
+        ),
+    }
+    for f in (func, afunc):
+        for name, call in calls.items():
+            us = _bench(call, f, loop2)
+            print("  {:<6} {:<18} {:8.2f}".format(f.__name__, name, us))
+    loop2.call_soon_threadsafe(loop2.stop)
+    thread.join()
+    loop2.close()
+
+
+def bench_call_many():
+    print("n calls into a loop of another thread (us per call)")
+    loop2 = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop2.run_forever, daemon=True)
+    thread.start()
+    for n in (10, 100, 1000):
+        funcs_args = [(func, (i,)) for i in range(n)]
+
+        def single():
+            futs = [call_via_loop_fast(f, args, loop=loop2) for f, args in funcs_args]
+            futs[-1].result(10)
+
+        def many():
+            call_many_via_loop(funcs_args, loop=loop2).result(10)
+
+        reps = N // n
+        for name, f in (("call_via_loop_fast", single), ("call_many", many)):
+            t0 = time.perf_counter()
+            for _ in range(reps):
+                f()
+            us = (time.perf_counter() - t0) / (reps * n) * 1e6
+            print("  n={:<5} {:<18} {:8.2f}".format(n, name, us))
+    loop2.call_soon_threadsafe(loop2.stop)
+    thread.join()
+    loop2.close()
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    bench_same_loop()
+    bench_cross_thread()
+    bench_call_many()
@@ -0,0 +1,141 @@
+"""Benchmarks of fons.event (not collected by pytest, run it directly)
+    python test/tst_bench_event.py
+"""
+import asyncio
+import threading
+import time
+import warnings
+
+from fons.event import Node, RelayPackage, Station
+
+N = 10000
+
+loop = asyncio.new_event_loop()
+asyncio.set_event_loop(loop)
+
+
+def timeit(f, n=N):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        f()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def _drain(nodes):
+    for node in nodes:
+        while not node.empty():
+            node.recv_nowait()
+
+
+def bench_relay():
+    print("Node.relay to n clients (us per relay)")
+    for n_clients in (1, 10, 100):
+        node = Node(loop=loop)
+        clients = [Node(loop=loop) for _ in range(n_clients)]
+        for client in clients:
+            node.connect(client)
+
+        def broadcast_multiple():
+            pk = RelayPackage("x", node, None, 0)
+            node.station.broadcast_multiple([{"channel": 0, "put": pk}])
+
+        old = timeit(broadcast_multiple, N // n_clients)
+        _drain(clients)
+        new = timeit(lambda: node.relay("x"), N // n_clients)
+        _drain(clients)
+        print(
+            "  clients={:<4} broadcast_multiple: {:8.2f}  relay: {:8.2f}".format(
+                n_clients, old, new
+            )
+        )
+
+
+def bench_handle():
+    print("Node.handle with 10 handlers (us per package)")
+    for shared in (False, True):
+        node = Node(loop=loop)
+        for _ in range(10):
+            node.add_handler(lambda pk: None, shared=shared)
+        pk = RelayPackage("x")
+        us = timeit(lambda: node.handle(pk))
+        print("  shared={!r:<6} {:8.2f}".format(shared, us))
+
+
+def bench_broadcast_items():
+    print("Station broadcast of 10 channels x 10 queues (us per broadcast)")
+    station = Station([{"channel": c} for c in range(10)], loops=[loop])
+    for c in range(10):
+        for i in range(10):
+            station.add_queue(c, i)
+    items = [(c, "x") for c in range(10)]
+    instr = [{"channel": c, "put": "x"} for c in range(10)]
+    old = timeit(lambda: station.broadcast_multiple(instr), N // 10)
+    new = timeit(lambda: station.broadcast_items(items), N // 10)
+    print("  broadcast_multiple: {:8.2f}".format(old))
+    print("  broadcast_items:    {:8.2f}".format(new))
+
+
+def bench_broadcast_routing():
+    print("Station.broadcast by receptors x loops (1000s of broadcasts per second)")
+    for n_loops in (1, 4):
+        loops = [loop] + [asyncio.new_event_loop() for _ in range(n_loops - 1)]
+        for n_receptors in (1, 10, 100):
+            station = Station([{"channel": 0}], loops=loops)
+            for i in range(n_receptors):
+                station.add(0, i)
+            n = N // n_receptors
+            us = timeit(lambda: station.broadcast(0, "x"), n)
+            print(
+                "  loops={:<2} receptors={:<4} {:8.1f}".format(
+                    n_loops, n_receptors, 1e3 / us
+                )
+            )
+        for _loop in loops[1:]:
+            _loop.close()
+
+
+def bench_cross_thread():
+    print("Station.broadcast into a loop of another thread (us per item)")
+    loop2 = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop2.run_forever, daemon=True)
+    thread.start()
+    for batch in (None, True, {"max_delay": 0.001}):
+        station = Station([{"channel": 0}], loops=[loop2], batch=batch)
+        q = station.add_queue(0, 0)[0]
+        t0 = time.perf_counter()
+        for i in range(N):
+            station.broadcast(0, i)
+        while q.qsize() < N:
+            time.sleep(0.0001)
+        us = (time.perf_counter() - t0) / N * 1e6
+        print("  batch={!r:<22} {:8.2f}".format(batch, us))
+    loop2.call_soon_threadsafe(loop2.stop)
+    thread.join()
+    loop2.close()
+
+
+def bench_churn():
+    print("Node group membership churn with n clients (us per ungroup+group)")
+    for n_clients in (10, 100, 1000):
+        node = Node(loop=loop)
+        clients = [Node(loop=loop) for _ in range(n_clients)]
+        for client in clients:
+            node.connect(client, 1, 2)
+        client = clients[n_clients // 2]
+
+        def churn():
+            node.ungroup(1, client)
+            node.group(1, client)
+
+        us = timeit(churn, N // 10)
+        print("  clients={:<5} {:8.2f}".format(n_clients, us))
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    bench_relay()
+    bench_handle()
+    bench_broadcast_items()
+    bench_broadcast_routing()
+    bench_cross_thread()
+    bench_churn()
@@ -0,0 +1,87 @@
+"""Benchmarks of fons under each loop factory (not collected by pytest, run it directly)
+    python test/tst_bench_loops.py
+"""
+import asyncio
+import time
+import warnings
+
+from fons.aio import new_event_loop, set_loop_factory
+from fons.event import Station
+from fons.sched import AsyncTicker, AsyncTickManager
+from fons.threads import EliThread
+
+N = 20000
+FACTORIES = [None, "uvloop"]
+
+
+def _start_loop():
+    loop = new_event_loop()
+    thread = EliThread(target=loop.run_forever, loop=loop, daemon=True)
+    thread.start()
+    return loop, thread
+
+
+def _stop_loop(loop, thread):
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def bench_broadcast(n_loops=4, n_receptors=10):
+    """1000s of items per second received by the consumers"""
+    loops = [_start_loop() for _ in range(n_loops)]
+    station = Station([{"channel": 0}], loops=[loop for loop, _ in loops])
+    queues = []
+    for i in range(n_receptors):
+        queues += station.add_queue(0, i).values()
+
+    async def consume(queue, n):
+        for _ in range(n):
+            await queue.get()
+
+    futures = [
+        asyncio.run_coroutine_threadsafe(consume(q, N), q._loop) for q in queues
+    ]
+    t0 = time.perf_counter()
+    for i in range(N):
+        station.broadcast(0, i)
+    for f in futures:
+        f.result()
+    elapsed = time.perf_counter() - t0
+    for loop, thread in loops:
+        _stop_loop(loop, thread)
+    return N * len(queues) / elapsed / 1e3
+
+
+def bench_tickmanager(n_tickers=100, duration=1.0):
+    """1000s of ticks per second"""
+    loop = new_event_loop()
+    tickers = [
+        AsyncTicker(lambda: None, interval=0.001, loop=loop) for _ in range(n_tickers)
+    ]
+    tm = AsyncTickManager(tickers, loop=loop)
+
+    async def run():
+        fut = asyncio.ensure_future(tm.loop())
+        await asyncio.sleep(duration)
+        await tm.close()
+        await fut
+
+    loop.run_until_complete(run())
+    loop.close()
+    return sum(t.counter for t in tickers) / duration / 1e3
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    print("loop factory: Station broadcast (1000s of items/s), ticks (1000s/s)")
+    for factory in FACTORIES:
+        try:
+            set_loop_factory(factory)
+        except ImportError:
+            print("  {!r:<8} not installed".format(factory))
+            continue
+        broadcast = bench_broadcast()
+        ticks = bench_tickmanager()
+        print("  {!r:<8} {:10.1f} {:10.1f}".format(factory, broadcast, ticks))
+    set_loop_factory(None)
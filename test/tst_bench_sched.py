@@ -0,0 +1,62 @@
+"""Benchmarks of fons.sched (not collected by pytest, run it directly)
+    python test/tst_bench_sched.py
+"""
+import asyncio
+import copy
+import time
+import warnings
+
+from fons.sched import Ticker, AsyncTicker, ScheduleTicker, _copy_state
+
+N = 10000
+
+
+def _target():
+    pass
+
+
+def timeit(f, n=N):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        f()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def bench_state_copy():
+    print("state copy (us per ticker)")
+    states = (ScheduleTicker._inf, ScheduleTicker._ui, ScheduleTicker._hidden)
+    deep = timeit(lambda: [copy.deepcopy(x) for x in states])
+    shallow = timeit(lambda: [_copy_state(x) for x in states])
+    print("  deepcopy:    {:8.2f}".format(deep))
+    print("  _copy_state: {:8.2f}".format(shallow))
+
+
+def bench_ticker_construction():
+    print("Ticker construction (us per ticker)")
+    for backend in ("process", "thread"):
+        us = timeit(lambda: Ticker(_target, interval=1, backend=backend))
+        print("  backend={!r:<10} {:8.2f}".format(backend, us))
+
+
+def bench_async_ticker_construction():
+    print("AsyncTicker construction (us per ticker)")
+    loop = asyncio.new_event_loop()
+    us = timeit(lambda: AsyncTicker(_target, interval=1, loop=loop))
+    print("  backend='async'    {:8.2f}".format(us))
+    loop.close()
+
+
+def bench_tick():
+    print("Ticker.tick(force=True) (us per tick)")
+    for interval in ("1S", "1B"):
+        t = Ticker(_target, interval=interval, sync="1D")
+        us = timeit(lambda: t.tick(force=True), n=N // 10)
+        print("  interval={!r:<6} {:8.2f}".format(interval, us))
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    bench_state_copy()
+    bench_ticker_construction()
+    bench_async_ticker_construction()
+    bench_tick()